@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+# 애니메이션 메시지 편집 코얼레서.
+# 핸들러는 프레임을 push만 하고, 메시지마다 하나의 송신 태스크가 항상 "가장 최신" 프레임만 보낸다.
+# 채널별 편집 예산(최근 per초 동안 rate번, 슬라이딩 윈도)을 나눠 쓰며, 예산이 없을 때 쌓인 중간 프레임은 버려진다.
+# 예산을 한꺼번에 몰아 쓰지 않도록 편집 사이를 per / rate초씩 벌린다 (5번 연달아 보내고 몇 초 멈추는 대신 1초마다 한 번).
+# 같은 채널의 메시지들은 이 간격을 나눠 쓰므로 메시지가 많을수록 메시지당 간격이 늘어난다.
+# 429로 discord.py 내부에서 대기가 길어지면 해당 채널 예산을 비워 송신 속도를 스스로 낮춘다.
+# 쓰는 메시지가 없고 per초 동안 편집이 없던 채널의 예산은 새것과 같으므로 버린다 (채널 수만큼 쌓이지 않게).
+
+EDIT_RATE = 5           # 채널당 허용 편집 수
+EDIT_PER = 5.0          # ... / 초
+THROTTLE_SECONDS = 1.0  # 편집 한 번이 이보다 오래 걸리면 레이트 리밋에 걸린 것으로 본다
+
+
+class EditBudget:
+    __slots__ = ("rate", "per", "_clock", "_sent", "users")
+
+    def __init__(self, rate: int, per: float, clock: Callable[[], float]):
+        self.rate = rate
+        self.per = per
+        self._clock = clock
+        # 최근 편집 시각들 (최대 rate개)
+        self._sent: "deque[float]" = deque(maxlen=rate)
+        # 이 예산으로 송신 중인 메시지 수
+        self.users = 0
+
+    def wait_time(self) -> float:
+        if not self._sent:
+            return 0.0
+        now = self._clock()
+        # 마지막 편집 후 per / rate초
+        wait = self._sent[-1] + self.per / self.rate - now
+        if len(self._sent) == self.rate:
+            # 창이 가득 찼으면 (throttle 직후 등) 가장 오래된 편집이 창을 벗어날 때까지
+            wait = max(wait, self._sent[0] + self.per - now)
+        return max(0.0, wait)
+
+    def take(self):
+        self._sent.append(self._clock())
+
+    def throttle(self):
+        # 서버가 이미 우리를 막고 있으므로 지금부터 per초 동안 예산을 비운다
+        now = self._clock()
+        self._sent.extend([now] * self.rate)
+
+    def idle(self) -> bool:
+        return self.users == 0 and (not self._sent or self._sent[-1] + self.per <= self._clock())
+
+
+class _Slot:
+    __slots__ = ("message", "pending", "pushed_at", "task", "edits", "dropped", "max_stale")
+
+    def __init__(self, message: Any):
+        self.message = message
+        self.pending: Optional[Dict[str, Any]] = None
+        self.pushed_at = 0.0
+        self.task: Optional[asyncio.Task] = None
+        self.edits = 0
+        self.dropped = 0
+        self.max_stale = 0.0
+
+
+class AnimationRenderer:
+    def __init__(
+        self,
+        rate: int = EDIT_RATE,
+        per: float = EDIT_PER,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.per = per
+        self._clock = clock
+        self._sleep = sleep
+        self._budgets: Dict[int, EditBudget] = {}
+        self._slots: Dict[int, _Slot] = {}
+        self._swept = clock()
+
+    def _budget(self, message: Any) -> EditBudget:
+        key = message.channel.id
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = EditBudget(self.rate, self.per, self._clock)
+            self._budgets[key] = budget
+        return budget
+
+    def _sweep(self):
+        # per초에 한 번만 전체를 훑는다
+        now = self._clock()
+        if now - self._swept < self.per:
+            return
+        self._swept = now
+        for key in [key for key, budget in self._budgets.items() if budget.idle()]:
+            del self._budgets[key]
+
+    def push(self, message: Any, **fields: Any):
+        slot = self._slots.get(message.id)
+        if slot is None:
+            slot = _Slot(message)
+            self._slots[message.id] = slot
+        if slot.pending is not None:
+            slot.dropped += 1
+        slot.pending = fields
+        slot.pushed_at = self._clock()
+        if slot.task is None or slot.task.done():
+            slot.task = asyncio.create_task(self._drain(slot))
+
+    async def finish(self, message: Any, **fields: Any) -> Dict[str, float]:
+        # 마지막 프레임은 버려지지 않고 반드시 전송된다
+        self.push(message, **fields)
+        slot = self._slots[message.id]
+        while slot.task is not None and not slot.task.done():
+            await slot.task
+        del self._slots[message.id]
+        return {"edits": slot.edits, "dropped": slot.dropped, "max_stale": slot.max_stale}
+
+    async def _drain(self, slot: _Slot):
+        budget = self._budget(slot.message)
+        budget.users += 1
+        try:
+            await self._send(slot, budget)
+        finally:
+            budget.users -= 1
+            self._sweep()
+
+    async def _send(self, slot: _Slot, budget: EditBudget):
+        while slot.pending is not None:
+            wait = budget.wait_time()
+            if wait > 0:
+                await self._sleep(wait)
+                continue
+            budget.take()
+            fields, pushed_at = slot.pending, slot.pushed_at
+            slot.pending = None
+            started = self._clock()
+            try:
+                await slot.message.edit(**fields)
+            except Exception as e:
+                print("ANIMATION EDIT ERROR:", e)
+            done = self._clock()
+            slot.edits += 1
+            slot.max_stale = max(slot.max_stale, done - pushed_at)
+            if done - started > THROTTLE_SECONDS:
+                budget.throttle()
@@ -0,0 +1,95 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from balance import balance_teams, spread, team_sizes  # noqa: E402
+
+
+# 팀 밸런스 품질 / 속도.
+# 작은 경우는 전수 탐색한 최적 spread(최고 팀 합계 - 최저 팀 합계)와 비교하고,
+# 100명 / 10팀은 실행 시간(목표 10 ms 이내)과 팀 평균 합계 대비 spread를 잰다.
+# python benchmarks/bench_balance.py
+
+TRIALS = 100
+
+
+def optimal_spread(ratings, team_count):
+    # 팀 인원 제한을 지키는 모든 분할 중 최소 spread (같은 크기의 빈 팀은 하나만 시도)
+    n = len(ratings)
+    order = sorted(range(n), key=lambda i: -ratings[i])
+    capacity = team_sizes(n, team_count)
+    totals = [0] * team_count
+    counts = [0] * team_count
+    best = [float("inf")]
+
+    def go(k):
+        if k == n:
+            best[0] = min(best[0], max(totals) - min(totals))
+            return
+        r = ratings[order[k]]
+        tried = set()
+        for t in range(team_count):
+            if counts[t] >= capacity[t]:
+                continue
+            state = (totals[t], counts[t], capacity[t])
+            if state in tried:
+                continue
+            tried.add(state)
+            totals[t] += r
+            counts[t] += 1
+            go(k + 1)
+            totals[t] -= r
+            counts[t] -= 1
+
+    go(0)
+    return best[0]
+
+
+def quality(n, team_count, trials):
+    rng = random.Random(n * 31 + team_count)
+    gaps = []
+    exact = 0
+    for _ in range(trials):
+        ratings = [rng.randrange(0, 5000) for _ in range(n)]
+        got = spread(ratings, balance_teams(ratings, team_count, rng=random.Random(0)))
+        best = optimal_spread(ratings, team_count)
+        gaps.append(got - best)
+        exact += got == best
+    mean_total = 2500 * n / team_count
+    print(
+        f"{n:>3}명 / {team_count}팀  최적과 같음 {exact}/{trials}  "
+        f"평균 차이 {sum(gaps) / trials:6.1f}  최대 차이 {max(gaps):6.0f}  (팀 평균 합계 {mean_total:,.0f})"
+    )
+
+
+def speed(n, team_count, trials):
+    rng = random.Random(7)
+    times = []
+    spreads = []
+    for _ in range(trials):
+        ratings = [rng.randrange(0, 5000) for _ in range(n)]
+        started = time.perf_counter()
+        teams = balance_teams(ratings, team_count, rng=rng)
+        times.append(time.perf_counter() - started)
+        spreads.append(spread(ratings, teams))
+    times.sort()
+    mean_total = 2500 * n / team_count
+    print(
+        f"{n:>3}명 / {team_count}팀  p50 {times[len(times) // 2] * 1000:.2f} ms  max {times[-1] * 1000:.2f} ms  "
+        f"평균 spread {sum(spreads) / trials:.1f} (팀 평균 합계의 {sum(spreads) / trials / mean_total:.4%})"
+    )
+
+
+def main():
+    quality(12, 3, TRIALS)
+    quality(16, 2, TRIALS)
+    quality(15, 3, 30)
+    speed(100, 10, TRIALS)
+    speed(100, 2, TRIALS)
+
+
+if __name__ == "__main__":
+    main()
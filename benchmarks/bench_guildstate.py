@@ -0,0 +1,85 @@
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guildstate import GuildState  # noqa: E402
+
+
+# 길드 상태 메모리 / 로드 시간 (멤버 1M, 네 컬럼 모두 채움).
+# 비교: 예전 방식 — 컬럼마다 dict[member] (points / vc_time / vc_join / vc_paid)
+# python benchmarks/bench_guildstate.py
+
+MEMBERS = 1_000_000
+
+
+def _data():
+    rng = random.Random(1)
+    ids = [10**17 + rng.randrange(10**17) for _ in range(MEMBERS)]
+    return {
+        "points": {uid: rng.randrange(100000) for uid in ids},
+        "vc_time": {uid: rng.random() * 1e6 for uid in ids},
+        "vc_join": {uid: 1.7e9 + rng.random() for uid in ids},
+        "vc_paid": {uid: rng.randrange(1000) for uid in ids},
+    }
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+def dicts(data):
+    # 키 / 값 객체까지 새로 만들어야 공정하다 (DB에서 읽을 때와 같이)
+    return {name: {int(str(k)): type(v)(v) for k, v in column.items()} for name, column in data.items()}
+
+
+def slotted(data):
+    state = GuildState(1)
+    for name, column in data.items():
+        getattr(state, name).update({int(str(k)): v for k, v in column.items()})
+    return state
+
+
+def bulk(data):
+    state = GuildState(1)
+    for name, column in data.items():
+        getattr(state, name).update(column)
+    return state
+
+
+def slotted_per_member(data):
+    # 벌크 로드 이전 방식 (멤버마다 __setitem__)
+    state = GuildState(1)
+    for name, column in data.items():
+        target = getattr(state, name)
+        for k, v in column.items():
+            target[k] = v
+    return state
+
+
+def main():
+    data = _data()
+    for label, build in (("dict per column", dicts), ("GuildState arrays", slotted)):
+        value, size, _ = _measure(lambda: build(data))
+        print(f"{label:<18} {size / MEMBERS:7.1f} bytes/member  ({size / 2**20:.0f} MiB)")
+        del value
+    for label, build in (("per-member load", slotted_per_member), ("bulk load", bulk)):
+        gc.collect()
+        started = time.perf_counter()
+        build(data)
+        print(f"{label:<18} {time.perf_counter() - started:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
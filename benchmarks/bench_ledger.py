@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guildstate import GuildState  # noqa: E402
+from ledger import PointsLedger  # noqa: E402
+from storage import LazyGuildMap, Storage  # noqa: E402
+
+
+# 포인트 원장 처리량 (프로세스 내, 목표 100k 지급/초).
+# 디스크 기록은 flush에서 따로 일어나므로 여기서는 apply 경로(합계 갱신 + 큐 적재)만 잰다.
+# python benchmarks/bench_ledger.py
+
+USERS = 100_000
+
+
+def run(batch: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(os.path.join(tmp, "bench.db"))
+        ledger = PointsLedger(storage, LazyGuildMap(GuildState))
+        grants = [(10**17 + i, 1) for i in range(USERS)]
+        started = time.perf_counter()
+        for i in range(0, USERS, batch):
+            ledger.apply(1, grants[i:i + batch], "bench")
+        elapsed = time.perf_counter() - started
+        storage._conn.close()
+        storage._reader.close()
+        return USERS / elapsed
+
+
+def main():
+    for batch in (1, 100, USERS):
+        print(f"batch={batch:>6}: {run(batch):>12,.0f} grants/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rankindex import RankIndex  # noqa: E402
+
+
+# 포인트 순위 인덱스 vs 요청마다 정렬.
+# 멤버 수별로: 만들기 / 점수 갱신 1회 / 내 순위 + TOP 10 조회 1회 비용,
+# 그리고 100만 명 인덱스를 스레드에서 만들 때 이벤트 루프가 가장 오래 멈춘 시간
+# (sorted() 한 번 vs from_chunks 조각 정렬 + 병합).
+# python benchmarks/bench_rankindex.py
+
+SIZES = (1_000, 100_000, 1_000_000)
+OPS = 2000
+
+
+def _scores(n):
+    rng = random.Random(n)
+    return {10**17 + i: rng.randrange(100_000) for i in range(n)}
+
+
+def _per_op(fn, ops):
+    started = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter() - started) / ops * 1e6
+
+
+def sizes():
+    for n in SIZES:
+        scores = _scores(n)
+        uids = list(scores)
+        rng = random.Random(0)
+
+        started = time.perf_counter()
+        index = RankIndex.from_chunks(scores.items())
+        build = time.perf_counter() - started
+
+        def update(i):
+            index.update(uids[rng.randrange(n)], rng.randrange(100_000))
+
+        def query(i):
+            index.rank(uids[i % n])
+            index.top(10)
+
+        def sort_query(i):
+            order = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+            order[:10]
+
+        sort_ops = max(1, OPS // (n // 1000))
+        print(
+            f"n={n:>9,}  build {build * 1000:8.1f} ms  update {_per_op(update, OPS):6.1f} us  "
+            f"rank+top10 {_per_op(query, OPS):6.1f} us  sort per request {_per_op(sort_query, sort_ops) / 1000:9.2f} ms"
+        )
+
+
+async def _stall(build) -> float:
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            worst = max(worst, now - last)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    index = await asyncio.to_thread(build)
+    done = True
+    await tick
+    del index  # 해제 비용은 재지 않는다 (실제로는 길드 상태에 계속 남음)
+    return worst
+
+
+def stall():
+    scores = _scores(1_000_000)
+    for label, build in (
+        ("sorted", lambda: RankIndex(scores.items())),
+        ("from_chunks", lambda: RankIndex.from_chunks(scores.items())),
+    ):
+        print(f"1M build in thread, {label:<11} max loop stall {asyncio.run(_stall(build)) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    sizes()
+    stall()
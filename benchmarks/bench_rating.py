@@ -0,0 +1,66 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rating import RatingBook  # noqa: E402
+from storage import Storage  # noqa: E402
+
+
+# 레이팅 기록 100만 경기 재계산 / 복원 (목표: 수 초 이내).
+# 참가자 PLAYERS명이 MATCHES경기를 치른 기록(고정 시드)을 rating_log에 넣어 두고
+# - replay: 메모리의 컬럼형 기록으로 전체 재계산
+# - log_rows: rating_log에서 (승자, 패자) 행 읽기
+# - from_dict: 스냅샷 + 로그로 복원 (경기 수가 맞으면 재계산 없음)
+# - from_log: 스냅샷 없이 로그만으로 복원 (재계산 포함)
+# 을 잰다.
+# python benchmarks/bench_rating.py
+
+MATCHES = 1_000_000
+PLAYERS = 2000
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    rng = random.Random(1)
+    names = [f"player{i}" for i in range(PLAYERS)]
+    book = RatingBook()
+    for _ in range(MATCHES):
+        w, l = rng.sample(names, 2)
+        book.record(w, l)
+
+    _, replay = _timed(book.replay)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(os.path.join(tmp, "bench.db"), flush_threshold=10**9)
+        names = book.names
+        storage.append("rating_log", [(1, names[w], names[l], 0.0) for w, l in zip(book.winners, book.losers)])
+        storage.put("ratings", (1,), book)
+        asyncio.run(storage.flush())
+
+        log, read = _timed(lambda: storage.log_rows("rating_log", 1, ("winner", "loser")))
+        data = storage.load_json("ratings", 1)
+        snap, from_dict = _timed(lambda: RatingBook.from_dict(data, log))
+        full, from_log = _timed(lambda: RatingBook.from_log(log))
+        asyncio.run(storage.close())
+
+    assert len(snap) == len(full) == MATCHES
+    assert snap.top(10) == book.top(10)
+    assert [round(r, 6) for r in full.ratings] == [round(r, 6) for r in book.ratings]
+    print(f"{MATCHES:,} matches / {PLAYERS:,} players")
+    print(f"replay (in memory):       {replay:.2f} s")
+    print(f"log_rows (sqlite read):   {read:.2f} s")
+    print(f"from_dict (snapshot+log): {from_dict:.2f} s")
+    print(f"from_log (log + replay):  {from_log:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
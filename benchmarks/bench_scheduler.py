@@ -0,0 +1,91 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import EventScheduler  # noqa: E402
+
+
+# 예약 이벤트 10k개 기준 스케줄러 비용.
+# idle: 한 시간 뒤 이벤트 10k개를 걸어 두고 IDLE_SECONDS 동안 쓴 CPU 시간
+#       (비교: 예전 방식 — 이벤트마다 1초마다 깨어나 마감을 확인하는 태스크)
+# jitter: 10k개를 SPREAD초에 고르게 예약하고 실제 실행 시각 - 마감 시각 분포
+# python benchmarks/bench_scheduler.py
+
+EVENTS = 10_000
+IDLE_SECONDS = 5.0
+SPREAD = 5.0
+
+
+async def _noop(key):
+    return None
+
+
+async def idle_heap() -> float:
+    s = EventScheduler(_noop)
+    far = time.time() + 3600
+    for i in range(EVENTS):
+        s.add(i, far + i)
+    s.start()
+    cpu = time.process_time()
+    await asyncio.sleep(IDLE_SECONDS)
+    cpu = time.process_time() - cpu
+    await s.stop()
+    return cpu
+
+
+async def idle_polling() -> float:
+    far = time.time() + 3600
+
+    async def poll(when: float):
+        while time.time() < when:
+            await asyncio.sleep(1)
+
+    tasks = [asyncio.create_task(poll(far + i)) for i in range(EVENTS)]
+    cpu = time.process_time()
+    await asyncio.sleep(IDLE_SECONDS)
+    cpu = time.process_time() - cpu
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return cpu
+
+
+async def jitter() -> list:
+    late = []
+    deadlines = {}
+
+    async def on_fire(key):
+        late.append(time.time() - deadlines[key])
+        return None
+
+    s = EventScheduler(on_fire)
+    start = time.time() + 0.5
+    for i in range(EVENTS):
+        deadlines[i] = start + SPREAD * i / EVENTS
+        s.add(i, deadlines[i])
+    s.start()
+    while len(late) < EVENTS:
+        await asyncio.sleep(0.1)
+    await s.stop()
+    return sorted(late)
+
+
+def main():
+    print(f"events={EVENTS}")
+    heap_cpu = asyncio.run(idle_heap())
+    poll_cpu = asyncio.run(idle_polling())
+    print(f"idle cpu ({IDLE_SECONDS:.0f}s)  heap: {heap_cpu * 1000:8.1f} ms   per-event polling: {poll_cpu * 1000:8.1f} ms")
+    late = asyncio.run(jitter())
+    p = lambda q: late[min(len(late) - 1, int(q * len(late)))] * 1000  # noqa: E731
+    print(
+        f"firing jitter  mean {statistics.mean(late) * 1000:.2f} ms  p50 {p(0.5):.2f} ms  "
+        f"p99 {p(0.99):.2f} ms  max {late[-1] * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
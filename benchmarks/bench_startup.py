@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# 콜드 스타트 단계별 시간.
+# import: 새 프로세스에서 `import bot`만 (python -X importtime으로 무거운 모듈 상위 목록도 출력)
+# login / setup / ready: DISCORD_TOKEN(과 GUILD_ID)이 있으면 bot.py를 실제로 띄워
+#   on_ready에서 찍는 "⏱️ 시작 시간" 줄을 읽는다 (없으면 건너뜀)
+# python benchmarks/bench_startup.py
+
+RUNS = 5
+TOP = 10
+LIVE_TIMEOUT = 120.0
+
+
+def _env(db_dir: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DISCORD_TOKEN", "bench")
+    env.setdefault("GUILD_ID", "1")
+    env["DB_PATH"] = os.path.join(db_dir, "bench.db")
+    env["PYTHONPATH"] = ROOT
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def import_phase(db_dir: str):
+    times = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import bot"], env=_env(db_dir), cwd=db_dir,
+                       check=True, capture_output=True)
+        times.append(time.perf_counter() - started)
+    times.sort()
+    print(f"import bot (새 프로세스, 인터프리터 시작 포함)  median {times[len(times) // 2] * 1000:.0f} ms  "
+          f"min {times[0] * 1000:.0f} ms")
+
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import bot"], env=_env(db_dir),
+                         cwd=db_dir, check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in out.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if m and len(m.group(3)) <= 3:  # 최상위 몇 단계만
+            rows.append((int(m.group(2)), m.group(4)))
+    print(f"누적 import 시간 상위 {TOP} (최상위 모듈 기준):")
+    for us, name in sorted(rows, reverse=True)[:TOP]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+def live_phases(db_dir: str):
+    if os.getenv("DISCORD_TOKEN") in (None, "", "bench"):
+        print("login / setup / ready: DISCORD_TOKEN이 없어 건너뜀")
+        return
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "bot.py")], env=_env(db_dir), cwd=db_dir,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    deadline = time.time() + LIVE_TIMEOUT
+    try:
+        for line in proc.stdout:  # type: ignore
+            if "시작 시간" in line:
+                print(line.strip())
+                return
+            if time.time() > deadline:
+                break
+        print("ready 줄을 찾지 못함")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as db_dir:
+        import_phase(db_dir)
+        live_phases(db_dir)
+
+
+if __name__ == "__main__":
+    main()
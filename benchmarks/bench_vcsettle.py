@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guildstate import GuildState  # noqa: E402
+from ledger import PointsLedger  # noqa: E402
+from storage import LazyGuildMap, Storage  # noqa: E402
+from vcsettle import VcSettlement  # noqa: E402
+
+
+# VC 포인트 정산 틱 비용 (목표: 동시 접속 50k명에서 정상 상태 틱 ~7 ms).
+# 길드 GUILDS개에 USERS명이 최근 1시간 사이에 들어와 있는 상태(고정 시드)에서 재시작한 것처럼
+# 전원을 track하고 (복원), 재시작 동안 밀린 첫 틱 (따라잡기), 이후 HOURS시간 분량의
+# 정상 상태 틱을 가상 시계로 돌려 settle() 한 번의 시간을 잰다. 디스크 기록은 flush에서 따로 일어나므로 제외.
+# python benchmarks/bench_vcsettle.py
+
+USERS = 50_000
+GUILDS = 50
+UNIT = 600.0
+INTERVAL = 15.0
+DOWNTIME = 60.0
+HOURS = 1
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def main():
+    rng = random.Random(1)
+    now = [1_700_000_000.0]
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(os.path.join(tmp, "bench.db"))
+        states = LazyGuildMap(GuildState)
+        ledger = PointsLedger(storage, states, clock=lambda: now[0])
+        settle = VcSettlement(storage, ledger, states, UNIT, INTERVAL, clock=lambda: now[0])
+        users = []
+        for i in range(USERS):
+            gid, uid = i % GUILDS, 10**17 + i
+            state = states[gid]
+            start = now[0] - rng.uniform(0, 3600)
+            base = rng.choice((0.0, rng.uniform(0, 36000)))
+            state.vc_join[uid] = start
+            state.vc_time[uid] = base
+            # 재시작 DOWNTIME초 전까지는 지급이 끝나 있었다
+            state.vc_paid[uid] = int((base + max(0.0, now[0] - DOWNTIME - start)) // UNIT)
+            users.append((gid, uid))
+
+        started = time.perf_counter()
+        for gid, uid in users:
+            settle.track(gid, uid)
+        restore = time.perf_counter() - started
+
+        started = time.perf_counter()
+        first = settle.settle()
+        catch_up = time.perf_counter() - started
+
+        ticks = []
+        granted = 0
+        for _ in range(int(HOURS * 3600 / INTERVAL)):
+            now[0] += INTERVAL
+            started = time.perf_counter()
+            granted += settle.settle()
+            ticks.append(time.perf_counter() - started)
+            storage._take_batch()  # flush가 가져간 것처럼 비운다
+        storage._conn.close()
+        storage._reader.close()
+
+    print(f"{USERS:,} users / {GUILDS} guilds, unit {UNIT:.0f}s, interval {INTERVAL:.0f}s")
+    print(f"restore (track x{USERS:,}): {restore * 1000:.1f} ms")
+    print(f"first tick after {DOWNTIME:.0f}s downtime: {catch_up * 1000:.1f} ms ({first:,} grants)")
+    print(f"steady ticks x{len(ticks)}: p50 {_pct(ticks, 0.5):.2f} ms  p99 {_pct(ticks, 0.99):.2f} ms  "
+          f"max {max(ticks) * 1000:.2f} ms  ({granted / len(ticks):,.0f} grants/tick)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedcache import EmbedCache  # noqa: E402
+from guildstate import GuildState  # noqa: E402
+from storage import Storage  # noqa: E402
+from vcrank import VcRanking  # noqa: E402
+from vcstats import VcStats  # noqa: E402
+from voicequeue import VoiceEventQueue  # noqa: E402
+
+
+# 음성 이벤트 버스트 재생: 직접 적용(예전 on_voice_state_update) vs VoiceEventQueue.
+# 버스트 기록(고정 시드로 생성한 타임라인): 레이드 종료 600명 퇴장(0.8초), 방송 시작 400명 입장(0.5초),
+# 200명이 1초 안에 3~5번 들락날락.
+# direct: discord.py의 Client.dispatch처럼 이벤트마다 핸들러 태스크를 띄우고 그 안에서 적용
+# queued: GamerToolBot.dispatch처럼 디스패치에서 바로 큐에 넣고 드레인 태스크가 묶어서 적용
+# - 핸들러 지연: 디스패치 ~ 핸들러가 이벤트를 받아 처리 완료 (queued는 큐에 넣기까지)
+# - 적용 지연: 디스패치 ~ 길드 상태에 반영 (queued는 max_delay만큼 모으므로 길다)
+# - 다른 핸들러 지연: 다른 스레드에서 2 ms마다 소켓 데이터가 도착한 것처럼 루프를 깨워(call_soon_threadsafe)
+#   핸들러 태스크를 띄우고, 도착 ~ 핸들러 시작까지 (인터랙션 처리에 미치는 영향)
+#   (asyncio.sleep으로 깨어나는 프로브는 epoll 대기 시간이 ms 단위로 올림되는 오차가 더 커서 쓰지 않는다)
+# 의 p50 / p99를 잰다.
+# python benchmarks/bench_voicequeue.py
+
+GUILD = 1
+RUNS = 5
+
+
+def timeline(seed: int):
+    rng = random.Random(seed)
+    events = []  # (시각, 유저, 이전, 이후)
+    t0 = 0.0
+    for uid in range(600):
+        events.append((t0 + rng.random() * 0.8, uid, 100 + uid % 5, None))
+    t0 = 1.5
+    for uid in range(1000, 1400):
+        events.append((t0 + rng.random() * 0.5, uid, None, 200 + uid % 3))
+    t0 = 2.5
+    for uid in range(2000, 2200):
+        channel = None
+        times = sorted(rng.random() for _ in range(rng.randint(3, 5)))
+        for t in times:
+            after = None if channel is not None else 300 + uid % 4
+            events.append((t0 + t, uid, channel, after))
+            channel = after
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+class VcBook:
+    # bot._open_vc / _close_vc와 같은 일을 하는 길드 하나짜리 상태
+    def __init__(self, storage: Storage):
+        self.storage = storage
+        self.state = GuildState(GUILD)
+        self.stats = VcStats(time.time())
+        self.cache = EmbedCache()
+        now = time.time()
+        for uid in range(600):
+            self.state.vc_join[uid] = now - 3600
+            self.stats.join(uid, 100 + uid % 5, now - 3600)
+        for uid in range(2000, 2200, 2):
+            self.state.vc_join[uid] = now - 60
+            self.stats.join(uid, 300 + uid % 4, now - 60)
+        self.ranking = VcRanking(self.state.vc_time, self.state.vc_join)
+        self.applied_lat = []
+
+    def open(self, uid, channel, started):
+        self.stats.join(uid, channel, started)
+        self.state.vc_join[uid] = started
+        self.cache.invalidate(GUILD, "vc")
+        self.storage.put("vc_join", (GUILD, uid), started)
+        self.ranking.join(uid, self.state.vc_time.get(uid, 0), started)
+
+    def close(self, uid, ended):
+        self.stats.leave(uid, ended)
+        start = self.state.vc_join.pop(uid, None)
+        if start is None:
+            return
+        total = self.state.vc_time.get(uid, 0) + max(0.0, ended - start)
+        self.state.vc_time[uid] = total
+        self.cache.invalidate(GUILD, "vc")
+        self.storage.delete("vc_join", (GUILD, uid))
+        self.storage.put("vc_time", (GUILD, uid), total)
+        self.ranking.leave(uid, total)
+
+    def apply(self, member, before, after, now):
+        if before is None:
+            self.open(member.id, after, now)
+        elif after is None:
+            self.close(member.id, now)
+        else:
+            self.stats.move(member.id, after, now)
+
+    def apply_batch(self, transitions):
+        applied = time.time()
+        for member, before, after, at in transitions:
+            self.apply(member, before, after, at)
+            self.applied_lat.append(applied - at)
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+async def replay(events, queued: bool, storage: Storage):
+    book = VcBook(storage)
+    queue = VoiceEventQueue(book.apply_batch)
+    guild = types.SimpleNamespace(id=GUILD)
+    members = {}
+    handler_lat = []
+    probe_lat = []
+    loop = asyncio.get_running_loop()
+    done = threading.Event()
+
+    async def handler(member, before, after, dispatched, at):
+        book.apply(member, before, after, time.time())
+        book.applied_lat.append(time.time() - at)
+        handler_lat.append(time.perf_counter() - dispatched)
+
+    async def run_event(coro):
+        # discord.py Client._run_event과 같은 감싸기
+        try:
+            await coro
+        except asyncio.CancelledError:
+            pass
+
+    async def other_handler(arrived):
+        probe_lat.append(time.perf_counter() - arrived)
+
+    def arrive(arrived):
+        loop.create_task(other_handler(arrived))
+
+    def feeder():
+        while not done.is_set():
+            time.sleep(0.002)
+            loop.call_soon_threadsafe(arrive, time.perf_counter())
+
+    if queued:
+        queue.start()
+    probing = threading.Thread(target=feeder)
+    probing.start()
+    tasks = []
+    start = time.perf_counter()
+    for at, uid, before, after in events:
+        delay = start + at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        member = members.get(uid)
+        if member is None:
+            member = members[uid] = types.SimpleNamespace(id=uid, guild=guild)
+        dispatched = time.perf_counter()
+        if queued:
+            queue.push(member, before, after)
+            handler_lat.append(time.perf_counter() - dispatched)
+        else:
+            coro = handler(member, before, after, dispatched, time.time())
+            tasks.append(asyncio.create_task(run_event(coro)))
+    await asyncio.gather(*tasks)
+    # 마지막 배치가 드레인 태스크에서 적용될 때까지 기다린다
+    while len(queue):
+        await asyncio.sleep(0.01)
+    await queue.stop()
+    done.set()
+    probing.join()
+    await asyncio.sleep(0.01)
+    return handler_lat, book.applied_lat, probe_lat, queue
+
+
+def main():
+    events = timeline(1)
+    print(f"events={len(events)}  runs={RUNS}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for queued in (False, True):
+            handler_lat, applied_lat, probe_lat = [], [], []
+            for run in range(RUNS):
+                storage = Storage(os.path.join(tmp, f"bench{int(queued)}{run}.db"))
+                h, a, p, queue = asyncio.run(replay(events, queued, storage))
+                handler_lat += h
+                applied_lat += a
+                probe_lat += p
+                storage._conn.close()
+                storage._reader.close()
+            label = "queued" if queued else "direct"
+            extra = f"  applied {queue.applied}/{queue.received} in {queue.batches} batches" if queued else ""
+            print(
+                f"{label:<7} handler p50 {_pct(handler_lat, 0.5):6.3f} ms  p99 {_pct(handler_lat, 0.99):6.3f} ms  |  "
+                f"applied p50 {_pct(applied_lat, 0.5):6.3f} ms  p99 {_pct(applied_lat, 0.99):6.3f} ms  |  "
+                f"other handlers p50 {_pct(probe_lat, 0.5):6.3f} ms  p99 {_pct(probe_lat, 0.99):6.3f} ms{extra}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,663 @@
 
+import time
+BOOT_STARTED = time.perf_counter()
+
 import os
 import discord
 from discord import app_commands
 import asyncio
-import random
-import time
+import hashlib
+import io
+import json
 import logging
-from typing import Dict, List
-from keepalive import keep_alive
+import math
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from scheduler import EventScheduler
+from guildstate import GuildState
+from storage import LazyGuildMap, Storage
+from rankindex import RankIndex
+from vcrank import VcRanking
+from animator import AnimationRenderer
+from paging import chunk_lines
+from bracket import DOUBLE, MAX_ENTRANTS, SINGLE, SWISS, Bracket, BracketError
+from bracketview import BracketView
+from pinball import PinballRun
+from bulk import BulkExecutor
+from balance import balance_teams
+from rating import RatingBook
+from deferral import DeferWatchdog
+from embedcache import EmbedCache
+from ledger import PointsLedger
+from namecache import NameCache
+from vcsettle import VcSettlement
+from vcstats import VcStats
+from voicequeue import VoiceEventQueue
+from rng import RngService
+from shards import LatencyStats, parse_shard_ids, shard_of
+from metrics import LoopLagMonitor, Registry
+from instrumentation import Instrumentation, SamplingProfiler
+
+# 헬스 서버(aiohttp.web, import 약 20 ms)는 HTTP를 여는 프로세스에서만 불러온다.
+# 나머지 모듈은 합쳐도 수 ms라 바로 불러온다 (import 시간의 대부분은 discord / aiohttp)
+if TYPE_CHECKING:
+    from keepalive import HealthServer
 
 
 logging.basicConfig(level=logging.INFO)
 
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN", "")
 GUILD_ID_RAW = os.getenv("GUILD_ID", "")
+# 재시작 후에도 남아 있어야 하므로 배포 환경에서는 영구 디스크 위의 경로를 지정 (render.yaml 참고)
+DB_PATH = os.getenv("DB_PATH", "gamerbot.db")
+# VC 접속 시간 VC_POINT_SECONDS초마다 1포인트 (0이면 끔), VC_SETTLE_INTERVAL초마다 정산
+VC_POINT_SECONDS_RAW = os.getenv("VC_POINT_SECONDS", "600")
+VC_SETTLE_INTERVAL_RAW = os.getenv("VC_SETTLE_INTERVAL", "15")
+# 1이면 members 인텐트(특권, 개발자 포털에서도 켜야 함) 사용 - 역할 전체 대상 지급에 필요
+MEMBERS_INTENT = os.getenv("MEMBERS_INTENT", "") == "1"
+# 1이면 커맨드 트리가 바뀌지 않았어도 sync
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "") == "1"
+# extras={"defer": ...}가 붙은 커맨드가 이 시간(초) 안에 응답하지 않으면 자동으로 defer (디스코드 기한은 3초)
+DEFER_BUDGET_RAW = os.getenv("DEFER_BUDGET", "2.0")
+# 랜덤 추첨 루트 시드 (비우면 실행마다 새로 생성)
+RNG_SEED_RAW = os.getenv("RNG_SEED", "")
+# SHARD_COUNT가 있으면 AutoShardedClient + 글로벌 커맨드 모드 ("auto"면 디스코드 권장값)
+SHARD_COUNT_RAW = os.getenv("SHARD_COUNT", "")
+SHARD_IDS_RAW = os.getenv("SHARD_IDS", "")
+SHARDED = bool(SHARD_COUNT_RAW)
 
 if not DISCORD_TOKEN:
     print("❌ DISCORD_TOKEN 환경 변수가 설정되지 않았습니다.")
     raise SystemExit(1)
 
-if not GUILD_ID_RAW:
+if not GUILD_ID_RAW and not SHARDED:
     print("❌ GUILD_ID 환경 변수가 설정되지 않았습니다.")
     raise SystemExit(1)
 
 try:
-    GUILD_ID = int(GUILD_ID_RAW)
+    GUILD_ID = int(GUILD_ID_RAW) if GUILD_ID_RAW else 0
 except ValueError:
     print(f"❌ GUILD_ID 환경 변수 값이 잘못되었습니다: {GUILD_ID_RAW}")
     raise SystemExit(1)
 
-TEST_GUILD = discord.Object(id=GUILD_ID)
+try:
+    SHARD_COUNT = int(SHARD_COUNT_RAW) if SHARD_COUNT_RAW not in ("", "auto") else None
+    SHARD_IDS = parse_shard_ids(SHARD_IDS_RAW)
+except ValueError:
+    print(f"❌ SHARD_COUNT / SHARD_IDS 환경 변수 값이 잘못되었습니다: {SHARD_COUNT_RAW} / {SHARD_IDS_RAW}")
+    raise SystemExit(1)
+
+try:
+    RNG_SEED = int(RNG_SEED_RAW) if RNG_SEED_RAW else None
+except ValueError:
+    print(f"❌ RNG_SEED 환경 변수 값이 잘못되었습니다: {RNG_SEED_RAW}")
+    raise SystemExit(1)
+
+try:
+    DEFER_BUDGET = float(DEFER_BUDGET_RAW or 2.0)
+except ValueError:
+    print(f"❌ DEFER_BUDGET 환경 변수 값이 잘못되었습니다: {DEFER_BUDGET_RAW}")
+    raise SystemExit(1)
+
+try:
+    VC_POINT_SECONDS = float(VC_POINT_SECONDS_RAW or 0)
+    VC_SETTLE_INTERVAL = float(VC_SETTLE_INTERVAL_RAW or 15)
+except ValueError:
+    print(f"❌ VC_POINT_SECONDS / VC_SETTLE_INTERVAL 환경 변수 값이 잘못되었습니다: {VC_POINT_SECONDS_RAW} / {VC_SETTLE_INTERVAL_RAW}")
+    raise SystemExit(1)
+
+if SHARD_IDS is not None and SHARD_COUNT is None:
+    print("❌ SHARD_IDS를 쓰려면 SHARD_COUNT를 숫자로 지정해야 합니다.")
+    raise SystemExit(1)
+
+TEST_GUILD = discord.Object(id=GUILD_ID) if GUILD_ID else None
+# 멀티 프로세스 샤딩에서는 0번 샤드 프로세스만 HTTP 포트를 연다
+PRIMARY_PROCESS = SHARD_IDS is None or 0 in SHARD_IDS
+# 열린 음성 세션이 유효했던 시각을 이 주기로 저장 (비정상 종료 시 최대 이만큼만 손실)
+VC_CHECKPOINT_INTERVAL = 60.0
+# 랭킹 임베드 캐시 유지 시간 (데이터가 바뀌면 그 전에 무효화)
+EMBED_CACHE_TTL = 30.0
 
 intents = discord.Intents.default()
 intents.voice_states = True  # 필요한 최소 인텐트
+intents.members = MEMBERS_INTENT
+
+class GamerCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        self.client.instrument.begin(interaction)
+        self.client.deferral.watch(interaction)
+        if interaction.guild_id is not None:
+            await self.client.ensure_guild(interaction.guild_id)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.client.observe_command(interaction, "error")
+        await super().on_error(interaction, error)
 
-class GamerToolBot(discord.Client):
-    def __init__(self):
-        super().__init__(intents=intents)
-        self.tree = app_commands.CommandTree(self)
 
-        self.points: Dict[int, Dict[int, int]] = {}
-        self.vc_time: Dict[int, Dict[int, float]] = {}
-        self.vc_join: Dict[int, Dict[int, float]] = {}
-        self.tournaments: Dict[int, Dict] = {}
-        self.scheduled_events: Dict[int, Dict[int, Dict]] = {}
-        self.event_tasks: Dict[int, Dict[int, asyncio.Task]] = {}
-        self.next_event_id = 1
+_ClientBase = discord.AutoShardedClient if SHARDED else discord.Client
+
+class GamerToolBot(_ClientBase):
+    def __init__(self):
+        # HTTP 트레이스로 핸들러별 API 호출을 세야 하므로 클라이언트보다 먼저 만든다
+        self.instrument = Instrumentation()
+        if SHARDED:
+            super().__init__(
+                intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS,
+                http_trace=self.instrument.trace_config
+            )
+        else:
+            super().__init__(intents=intents, http_trace=self.instrument.trace_config)
+        self.profiler = SamplingProfiler()
+        self.tree = GamerCommandTree(self)
+        self.deferral = DeferWatchdog(DEFER_BUDGET, on_defer=self._on_auto_defer)
+        self.gateway_latency: Dict[int, LatencyStats] = {}
+
+        # 길드별 상태는 처음 접근할 때 DB에서 읽고, 변경은 storage 큐를 거쳐 기록된다
+        self.storage = Storage(DB_PATH)
+        # 멤버별 숫자 상태(포인트 / VC 시간 / 입장 시각 / VC 지급분)와 이벤트는 길드 단위 GuildState에 모은다
+        self.guild_states: Dict[int, GuildState] = LazyGuildMap(self._load_guild_state)
+        self.ledger = PointsLedger(self.storage, self.guild_states, on_totals=self._on_points_totals)
+        self.vc_stats: Dict[int, VcStats] = LazyGuildMap(self._load_vc_stats)
+        self.vc_settle: Optional[VcSettlement] = None
+        self.booted_at = time.time()
+        self.vc_checkpoints: Dict[int, float] = {}
+        self._vc_checkpoint_task: Optional[asyncio.Task] = None
+        self.voice_queue = VoiceEventQueue(self.apply_voice_batch, prepare=self._prepare_voice_guilds)
+        self.rng = RngService(RNG_SEED, storage=self.storage)
+        if VC_POINT_SECONDS > 0:
+            self.vc_settle = VcSettlement(
+                self.storage, self.ledger, self.guild_states, VC_POINT_SECONDS, VC_SETTLE_INTERVAL
+            )
+        self.vc_ranks: Dict[int, VcRanking] = {}
+        self.tournaments: Dict[int, Dict] = LazyGuildMap(self._load_tournament)
+        self.tournament_views: Dict[int, BracketView] = {}
+        self.ratings: Dict[int, RatingBook] = LazyGuildMap(self._load_ratings)
+        self.scheduler = EventScheduler(self.run_scheduled_event)
+        self.animator = AnimationRenderer()
+        self.bulk = BulkExecutor()
+        self.embed_cache = EmbedCache(EMBED_CACHE_TTL)
+        self.names = NameCache(self.storage)
+        self.next_event_id = self.storage.max_key("scheduled_events", "event_id") + 1
+
+        self.metrics = Registry()
+        self.command_latency = self.metrics.histogram(
+            "gamerbot_command_duration_seconds", "슬래시 커맨드 처리 시간", ("command", "status")
+        )
+        self.command_deferred = self.metrics.counter(
+            "gamerbot_command_deferred_total", "응답 기한 전에 자동으로 defer한 커맨드 수", ("command",)
+        )
+        self.instrument.register(self.metrics)
+        self.metrics.gauge(
+            "gamerbot_gateway_latency_seconds", "게이트웨이 하트비트 지연", ("shard",),
+            fn=self._gateway_latency_samples
+        )
+        self.metrics.gauge(
+            "gamerbot_gateway_to_handler_seconds", "인터랙션 생성부터 핸들러 진입까지", ("shard", "stat"),
+            fn=self._gateway_to_handler_samples
+        )
+        self.metrics.gauge(
+            "gamerbot_state_entries", "메모리 상태 크기", ("map",),
+            fn=self._state_size_samples
+        )
+        self.loop_lag = LoopLagMonitor(
+            self.metrics.gauge("gamerbot_event_loop_lag_seconds", "최근 이벤트 루프 지연"),
+            self.metrics.histogram(
+                "gamerbot_event_loop_lag_histogram_seconds", "이벤트 루프 지연 분포",
+                buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+            )
+        )
+        self.metrics.gauge(
+            "gamerbot_voice_queue_depth", "처리 대기 중인 음성 이벤트 수", ("stat",),
+            fn=lambda: {("current",): len(self.voice_queue), ("max",): self.voice_queue.max_depth}
+        )
+        self.metrics.gauge(
+            "gamerbot_voice_events", "음성 이벤트 누적 수 (받은 수 / 합친 뒤 적용 수 / 배치 수)", ("stage",),
+            fn=lambda: {
+                ("received",): self.voice_queue.received,
+                ("applied",): self.voice_queue.applied,
+                ("batches",): self.voice_queue.batches,
+            }
+        )
+        self.metrics.gauge(
+            "gamerbot_embed_cache", "임베드 캐시 (적중 / 생성 / 합쳐진 동시 요청 / 항목 수)", ("stat",),
+            fn=lambda: {
+                ("hits",): self.embed_cache.hits,
+                ("misses",): self.embed_cache.misses,
+                ("coalesced",): self.embed_cache.coalesced,
+                ("entries",): len(self.embed_cache),
+            }
+        )
+        self.metrics.gauge(
+            "gamerbot_name_cache", "멤버 이름 캐시 (적중 / 조회 요청 / 조회한 유저 / 항목 수)", ("stat",),
+            fn=lambda: {
+                ("hits",): self.names.hits,
+                ("queries",): self.names.queries,
+                ("queried",): self.names.queried,
+                ("entries",): len(self.names),
+            }
+        )
+        self.metrics.gauge(
+            "gamerbot_startup_seconds", "시작 단계별 소요 시간", ("phase",),
+            fn=lambda: {(phase,): sec for phase, sec in self.startup.items()}
+        )
+        self.health: Optional["HealthServer"] = None
+        # 시작 단계별 소요 시간 (import / login / setup / ready)
+        self.startup: Dict[str, float] = {}
+        self._phase_mark = BOOT_STARTED
+
+    def mark_startup(self, phase: str):
+        now = time.perf_counter()
+        self.startup[phase] = now - self._phase_mark
+        self._phase_mark = now
+
+    async def start_health(self):
+        # 로그인 전에 포트를 연다 (Render는 포트가 열릴 때까지 배포를 기다리고, 로그인은 수 초 걸릴 수 있다)
+        # 준비되기 전에는 /healthz가 503, "/"는 200
+        from keepalive import HealthServer
+        self.health = HealthServer(self.health_status, self.metrics.render_async)
+        await self.health.start()
 
     async def setup_hook(self):
-        # 글로벌 커맨드를 테스트 길드에 복사 후 sync
-        self.tree.copy_global_to(guild=TEST_GUILD)
-        await self.tree.sync(guild=TEST_GUILD)
-        print(f"✅ 슬래시 커맨드 동기화 완료 (Guild ID: {GUILD_ID})")
+        self.mark_startup("login")
+        self.loop_lag.start()
+        self.voice_queue.start()
+
+        if SHARDED:
+            # 글로벌 sync는 0번 샤드를 가진 프로세스 하나만 수행
+            if SHARD_IDS is None or 0 in SHARD_IDS:
+                await self.sync_commands(None, "global")
+        else:
+            # 글로벌 커맨드를 테스트 길드에 복사 후 sync
+            self.tree.copy_global_to(guild=TEST_GUILD)
+            await self.sync_commands(TEST_GUILD, f"guild:{GUILD_ID}")
+        self.storage.start()
+
+        # 재시작 전에 활성화돼 있던 이벤트 중 이 프로세스 샤드 소속만 다시 예약
+        for gid in self.storage.guilds_with("scheduled_events"):
+            if not self.owns_guild(gid):
+                continue
+            await self.ensure_guild(gid)
+            for eid, data in self.guild_states[gid].scheduled_events.items():
+                if data.get("active"):
+                    self.schedule_event(gid, eid)
+        self.scheduler.start()
+
+        if self.vc_settle is not None:
+            for gid in self.storage.guilds_with("vc_join"):
+                if not self.owns_guild(gid):
+                    continue
+                await self.ensure_guild(gid)
+                for uid in self.guild_states[gid].vc_join.keys():
+                    self.vc_settle.track(gid, uid)
+            self.vc_settle.start()
+        self._vc_checkpoint_task = asyncio.create_task(self._vc_checkpoint_loop())
+        self.mark_startup("setup")
+
+    def command_tree_hash(self, guild: Optional[discord.abc.Snowflake]) -> str:
+        payload = [cmd.to_dict(self.tree) for cmd in self.tree.get_commands(guild=guild)]
+        payload.sort(key=lambda c: (c.get("type", 1), c["name"]))
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def sync_commands(self, guild: Optional[discord.abc.Snowflake], scope: str):
+        # 마지막으로 sync한 커맨드 트리와 같으면 네트워크 왕복을 생략한다
+        digest = self.command_tree_hash(guild)
+        key = f"command_hash:{self.application_id}:{scope}"
+        if not FORCE_COMMAND_SYNC and self.storage.load_value("meta", key) == digest:
+            print(f"✅ 슬래시 커맨드 변경 없음, 동기화 생략 ({scope})")
+            return
+        await self.tree.sync(guild=guild)
+        self.storage.put("meta", (key,), digest)
+        print(f"✅ 슬래시 커맨드 동기화 완료 ({scope})")
+
+    async def close(self):
+        await self.scheduler.stop()
+        await self.voice_queue.stop()
+        if self.vc_settle is not None:
+            self.vc_settle.stop()
+        if self._vc_checkpoint_task is not None:
+            self._vc_checkpoint_task.cancel()
+            # 정상 종료면 지금까지 열린 세션을 인정한다
+            self.checkpoint_vc()
+        self.loop_lag.stop()
+        if self.health is not None:
+            await self.health.stop()
+        await super().close()
+        await self.storage.close()
+
+    # 헬스 체크 / 메트릭
+    def health_status(self) -> dict:
+        latency = self.latency
+        return {
+            "ok": self.is_ready() and not self.is_closed(),
+            "latency": None if math.isnan(latency) or math.isinf(latency) else round(latency, 4),
+            "guilds": len(self.guilds),
+        }
+
+    def observe_command(self, interaction: discord.Interaction, status: str):
+        self.deferral.done(interaction)
+        if interaction.command is None:
+            return
+        name = interaction.command.qualified_name
+        duration = self.instrument.finish(interaction, name)
+        if duration is not None:
+            self.command_latency.observe(duration, (name, status))
+
+    def _on_auto_defer(self, interaction: discord.Interaction):
+        name = interaction.command.qualified_name if interaction.command else "unknown"
+        self.command_deferred.inc((name,))
+
+    def _gateway_latency_samples(self) -> Dict[tuple, float]:
+        if SHARDED:
+            pairs = self.latencies
+        else:
+            pairs = [(0, self.latency)]
+        return {(str(sid), ): lat for sid, lat in pairs if not math.isnan(lat) and not math.isinf(lat)}
+
+    def _gateway_to_handler_samples(self) -> Dict[tuple, float]:
+        samples = {}
+        for sid, stats in self.gateway_latency.items():
+            for stat, value in stats.as_dict().items():
+                samples[(str(sid), stat)] = value
+        return samples
+
+    def _state_size_samples(self) -> Dict[tuple, float]:
+        states = list(dict.values(self.guild_states))
+        return {
+            ("points",): sum(len(v.points) for v in states),
+            ("vc_time",): sum(len(v.vc_time) for v in states),
+            ("vc_join",): sum(len(v.vc_join) for v in states),
+            ("tournaments",): sum(1 for v in self.tournaments.values() if v),
+            ("rating_matches",): sum(len(v) for v in self.ratings.values()),
+            ("scheduled_events",): sum(len(v.scheduled_events) for v in states),
+            ("scheduler_queue",): len(self.scheduler),
+            ("storage_pending",): self.storage.pending,
+        }
+
+    # 샤드 헬퍼
+    def owns_guild(self, guild_id: int) -> bool:
+        if not SHARDED or SHARD_IDS is None:
+            return True
+        return shard_of(guild_id, SHARD_COUNT) in SHARD_IDS
+
+    def record_gateway_latency(self, interaction: discord.Interaction):
+        # 디스코드가 인터랙션을 만든 시각(스노우플레이크)부터 핸들러 진입까지
+        shard_id = shard_of(interaction.guild_id, self.shard_count or 1) if interaction.guild_id else 0
+        stats = self.gateway_latency.get(shard_id)
+        if stats is None:
+            stats = LatencyStats()
+            self.gateway_latency[shard_id] = stats
+        stats.observe(time.time() - interaction.created_at.timestamp())
+
+    # 저장 헬퍼
+    def _load_tournament(self, guild_id: int):
+        t = self.storage.load_json("tournaments", guild_id)
+        if t is None:
+            return None
+        t["bracket"] = Bracket.from_dict(t["bracket"])
+        return t
+
+    def guild_loaded(self, guild_id: int) -> bool:
+        return all(m.loaded(guild_id) for m in (self.guild_states, self.vc_stats, self.tournaments, self.ratings))
+
+    async def ensure_guild(self, guild_id: int):
+        # 길드 상태를 처음 쓰기 전에 스레드에서 읽어 둔다 (수백만 행이어도 루프를 막지 않음)
+        if self.guild_loaded(guild_id):
+            return
+        await asyncio.gather(
+            self.guild_states.preload(guild_id),
+            self.vc_stats.preload(guild_id),
+            self.tournaments.preload(guild_id),
+            self.ratings.preload(guild_id),
+        )
 
-    async def run_scheduled_event(self, guild_id: int, event_id: int):
-        while True:
-            await asyncio.sleep(1)
-            guild_events = self.scheduled_events.get(guild_id, {})
-            data = guild_events.get(event_id)
-            if not data or not data.get("active"):
-                break
-            now = time.time()
-            if now >= data["next_run"]:
-                channel = self.get_channel(data["channel_id"])
-                if channel:
-                    choice = random.choice(data["options"])
-                    opts_str = " / ".join(f"`{o}`" for o in data["options"])
-                    embed = discord.Embed(
-                        title=f"🎲 정기 이벤트 룰렛 - {data['name']}",
-                        description=f"{opts_str}\n\n👉 **{choice}**",
-                        color=discord.Color.blurple()
-                    )
-                    await channel.send(embed=embed)
-                data["next_run"] = now + data["interval"]
-
-    def start_event_task(self, guild_id: int, event_id: int):
-        if guild_id not in self.event_tasks:
-            self.event_tasks[guild_id] = {}
-        task = asyncio.create_task(self.run_scheduled_event(guild_id, event_id))
-        self.event_tasks[guild_id][event_id] = task
+    def save_tournament(self, guild_id: int):
+        self.storage.put("tournaments", (guild_id,), self.tournaments[guild_id])
+
+    def _load_ratings(self, guild_id: int) -> RatingBook:
+        data = self.storage.load_json("ratings", guild_id)
+        log = self.storage.log_rows("rating_log", guild_id, ("winner", "loser"))
+        if data is None:
+            return RatingBook.from_log(log) if log else RatingBook()
+        return RatingBook.from_dict(data, log)
+
+    def _load_guild_state(self, guild_id: int) -> GuildState:
+        state = GuildState(guild_id)
+        for column in ("points", "vc_time", "vc_join", "vc_paid"):
+            getattr(state, column).update(self.storage.load_members(column, guild_id))
+        state.scheduled_events = self.storage.load_json("scheduled_events", guild_id)
+        # 순위 인덱스도 여기서(preload 스레드) 만들어 첫 /leaderboard가 루프에서 정렬하지 않게 한다
+        state.ranks = RankIndex.from_chunks(state.points.items())
+        return state
+
+    def _load_vc_stats(self, guild_id: int) -> VcStats:
+        data = self.storage.load_json("vc_stats", guild_id)
+        return VcStats.from_dict(data) if data is not None else VcStats(time.time())
+
+    def record_rating(self, guild_id: int, winner: str, loser: str):
+        # 경기 결과는 로그에 한 행 추가, 현재 레이팅은 스냅샷으로 (같은 flush 트랜잭션)
+        book = self.ratings[guild_id]
+        book.record(winner, loser)
+        self.storage.append("rating_log", [(guild_id, winner, loser, time.time())])
+        self.storage.put("ratings", (guild_id,), book)
+
+    def tournament_view_of(self, guild_id: int) -> BracketView:
+        # 토너먼트가 새로 만들어졌으면 캐시도 새로 만든다
+        bracket = self.tournaments[guild_id]["bracket"]
+        view = self.tournament_views.get(guild_id)
+        if view is None or view.bracket is not bracket:
+            view = BracketView(bracket)
+            self.tournament_views[guild_id] = view
+        return view
+
+    def save_event(self, guild_id: int, event_id: int):
+        self.storage.put("scheduled_events", (guild_id, event_id), self.guild_states[guild_id].scheduled_events[event_id])
+
+    def add_points(
+        self, guild_id: int, user_id: int, amount: int, reason: str = "", key: Optional[str] = None
+    ) -> int:
+        return self.ledger.grant(guild_id, user_id, amount, reason, key)
+
+    def _on_points_totals(self, guild_id: int, applied: List[tuple]):
+        self.embed_cache.invalidate(guild_id, "points")
+        state = self.guild_states.get(guild_id)
+        ranks = state.ranks if state is not None else None
+        if ranks is None:
+            return
+        # 대량 지급이면 하나씩 갱신하는 것보다 다시 정렬하는 편이 빠르다
+        if len(applied) > 64 and len(applied) * 4 > len(ranks):
+            ranks.rebuild(self.guild_states[guild_id].points.items())
+            return
+        for user_id, total in applied:
+            ranks.update(user_id, total)
+
+    def points_rank(self, guild_id: int) -> RankIndex:
+        # 길드 상태를 읽을 때 한 번 만들고, 이후에는 add_points가 증분 갱신한다
+        state = self.guild_states[guild_id]
+        if state.ranks is None:
+            state.ranks = RankIndex(state.points.items())
+        return state.ranks
+
+    async def run_scheduled_event(self, key):
+        # 스케줄러가 마감 시각에 호출, 다음 실행 시각을 돌려주면 다시 예약된다
+        guild_id, event_id = key
+        data = self.guild_states[guild_id].scheduled_events.get(event_id)
+        if not data or not data.get("active"):
+            return None
+        channel = self.get_channel(data["channel_id"])
+        if channel:
+            draw = self.rng.draw(guild_id, "event_roulette")
+            choice = draw.choice(data["options"])
+            draw.done(choice)
+            opts_str = " / ".join(f"`{o}`" for o in data["options"])
+            embed = discord.Embed(
+                title=f"🎲 정기 이벤트 룰렛 - {data['name']}",
+                description=f"{opts_str}\n\n👉 **{choice}**",
+                color=discord.Color.blurple()
+            )
+            await channel.send(embed=embed)
+        data["next_run"] = time.time() + data["interval"]
+        self.save_event(guild_id, event_id)
+        return data["next_run"]
+
+    def schedule_event(self, guild_id: int, event_id: int):
+        data = self.guild_states[guild_id].scheduled_events[event_id]
+        self.scheduler.add((guild_id, event_id), data["next_run"])
+
+    def cancel_event(self, guild_id: int, event_id: int):
+        self.scheduler.cancel((guild_id, event_id))
 
     # VC 기록 헬퍼
-    def _ensure_vc_maps(self, guild_id: int):
-        if guild_id not in self.vc_time:
-            self.vc_time[guild_id] = {}
-        if guild_id not in self.vc_join:
-            self.vc_join[guild_id] = {}
-
-    def record_vc_join(self, member: discord.Member):
-        gid = member.guild.id
-        self._ensure_vc_maps(gid)
-        self.vc_join[gid][member.id] = time.time()
-
-    def record_vc_leave(self, member: discord.Member):
-        gid = member.guild.id
-        self._ensure_vc_maps(gid)
-        start = self.vc_join[gid].pop(member.id, None)
-        if start is not None:
-            duration = time.time() - start
-            self.vc_time[gid][member.id] = self.vc_time[gid].get(member.id, 0) + duration
+    def _open_vc(self, guild_id: int, user_id: int, started: float, channel_id: int):
+        self.vc_stats[guild_id].join(user_id, channel_id, started)
+        state = self.guild_states[guild_id]
+        state.vc_join[user_id] = started
+        self.embed_cache.invalidate(guild_id, "vc")
+        self.storage.put("vc_join", (guild_id, user_id), started)
+        if self.vc_settle is not None:
+            self.vc_settle.track(guild_id, user_id)
+        ranking = self.vc_ranks.get(guild_id)
+        if ranking is not None:
+            ranking.join(user_id, state.vc_time.get(user_id, 0), started)
+
+    def _close_vc(self, guild_id: int, user_id: int, ended: float):
+        self.vc_stats[guild_id].leave(user_id, ended)
+        state = self.guild_states[guild_id]
+        start = state.vc_join.pop(user_id, None)
+        if start is None:
+            return
+        total = state.vc_time.get(user_id, 0) + max(0.0, ended - start)
+        state.vc_time[user_id] = total
+        self.embed_cache.invalidate(guild_id, "vc")
+        self.storage.delete("vc_join", (guild_id, user_id))
+        self.storage.put("vc_time", (guild_id, user_id), total)
+        if self.vc_settle is not None:
+            self.vc_settle.untrack(guild_id, user_id)
+        ranking = self.vc_ranks.get(guild_id)
+        if ranking is not None:
+            ranking.leave(user_id, total)
+
+    def record_vc_join(self, member: discord.Member, channel, at: Optional[float] = None):
+        self._open_vc(member.guild.id, member.id, time.time() if at is None else at, channel.id)
+
+    def record_vc_move(self, member: discord.Member, channel, at: Optional[float] = None):
+        # 세션은 그대로 두고 채널별 통계만 나눈다
+        self.vc_stats[member.guild.id].move(member.id, channel.id, time.time() if at is None else at)
+
+    def record_vc_leave(self, member: discord.Member, at: Optional[float] = None):
+        self._close_vc(member.guild.id, member.id, time.time() if at is None else at)
+
+    def dispatch(self, event: str, /, *args, **kwargs):
+        # 음성 상태 이벤트는 핸들러 태스크 없이 바로 큐에 넣는다 (버스트 때 이벤트마다 태스크를 만드는 비용이 가장 크다)
+        if event == "voice_state_update":
+            member, before, after = args
+            if not member.bot and before.channel != after.channel:
+                self.voice_queue.push(member, before.channel, after.channel)
+        super().dispatch(event, *args, **kwargs)
+
+    async def _prepare_voice_guilds(self, guild_ids):
+        # 큐는 동기로 적용되므로 처음 보는 길드는 적용 전에 스레드에서 불러 둔다
+        await asyncio.gather(*(self.ensure_guild(gid) for gid in guild_ids if not self.guild_loaded(gid)))
+
+    def apply_voice_batch(self, transitions):
+        # VoiceEventQueue가 유저별로 합친 상태 변화 (시각은 이벤트가 들어온 시각)
+        for member, before, after, at in transitions:
+            if before is None:
+                self.record_vc_join(member, after, at)
+            elif after is None:
+                self.record_vc_leave(member, at)
+            else:
+                self.record_vc_move(member, after, at)
+
+    def voice_members(self, guild: discord.Guild) -> Dict[int, int]:
+        # 게이트웨이 캐시에서 지금 음성에 있는 (봇이 아닌) 유저 -> 채널
+        present: Dict[int, int] = {}
+        for channel in guild.voice_channels + guild.stage_channels:
+            for uid in channel.voice_states:
+                member = guild.get_member(uid)
+                if member is None or not member.bot:
+                    present[uid] = channel.id
+        return present
+
+    async def reconcile_all_voice(self) -> Tuple[int, int]:
+        # 길드 상태를 모두 불러오지 않고 vc_join 행만 한 번에 읽어서
+        # 저장된 세션이나 지금 음성에 있는 유저가 있는 길드만 불러와 맞춘다.
+        # 이미 불러온 길드는 아직 기록되지 않은 변경이 있을 수 있으므로 메모리의 세션을 본다.
+        stored = await asyncio.to_thread(self.storage.load_grouped, "vc_join")
+        opened = closed = 0
+        for guild in self.guilds:
+            gid = guild.id
+            present = self.voice_members(guild)
+            if self.guild_states.loaded(gid):
+                joins = self.guild_states[gid].vc_join
+            else:
+                joins = stored.get(gid)
+            if not present and not joins:
+                continue
+            await self.ensure_guild(gid)
+            o, c = self.reconcile_voice(guild, present)
+            opened += o
+            closed += c
+        return opened, closed
+
+    def reconcile_voice(self, guild: discord.Guild, present: Optional[Dict[int, int]] = None) -> Tuple[int, int]:
+        # 게이트웨이 캐시의 음성 상태와 저장된 세션을 한 번에 맞춘다.
+        # - 지금 음성에 없는 세션: 마지막 체크포인트 시각에 종료
+        # - 재시작 전에 열린 세션: 체크포인트까지 인정하고 지금부터 새로 시작
+        # - 세션 없이 음성에 있는 유저: 지금부터 시작
+        gid = guild.id
+        now = time.time()
+        if present is None:
+            present = self.voice_members(guild)
+
+        checkpoint = self.vc_checkpoints.get(gid)
+        if checkpoint is None:
+            checkpoint = self.storage.load_value("vc_checkpoint", gid)
+        # 대량 변경이므로 순위 인덱스는 버리고 다음 조회 때 다시 만든다
+        self.vc_ranks.pop(gid, None)
+        joins = self.guild_states[gid].vc_join
+        opened = closed = 0
+        stats = self.vc_stats[gid]
+        for uid, start in list(joins.items()):
+            if uid in present and start >= self.booted_at:
+                if stats.channel_of(uid) != present[uid]:
+                    stats.move(uid, present[uid], now)
+                continue
+            ended = min(now, max(start, checkpoint)) if checkpoint is not None else start
+            self._close_vc(gid, uid, ended)
+            closed += 1
+        for uid, channel_id in present.items():
+            if uid not in joins:
+                self._open_vc(gid, uid, now, channel_id)
+                opened += 1
+        self.checkpoint_vc(gid, now)
+        return opened, closed
+
+    def checkpoint_vc(self, guild_id: Optional[int] = None, at: Optional[float] = None):
+        at = time.time() if at is None else at
+        guild_ids = [guild_id] if guild_id is not None else [g.id for g in self.guilds]
+        for gid in guild_ids:
+            self.vc_checkpoints[gid] = at
+            self.storage.put("vc_checkpoint", (gid,), at)
+            # 불러온 길드의 통계만 열린 구간을 잘라 저장
+            stats = dict.get(self.vc_stats, gid)
+            if stats is not None:
+                stats.roll(at)
+                self.storage.put("vc_stats", (gid,), stats)
+
+    async def _vc_checkpoint_loop(self):
+        while True:
+            await asyncio.sleep(VC_CHECKPOINT_INTERVAL)
+            self.checkpoint_vc()
+
+    def vc_ranking(self, guild_id: int) -> VcRanking:
+        ranking = self.vc_ranks.get(guild_id)
+        if ranking is None:
+            state = self.guild_states[guild_id]
+            ranking = VcRanking(state.vc_time, state.vc_join)
+            self.vc_ranks[guild_id] = ranking
+        return ranking
 
 bot = GamerToolBot()
 
@@ -114,15 +673,33 @@ def is_admin_or_mod(member: discord.Member) -> bool:
 @bot.event
 async def on_ready():
     print(f"✅ 로그인 완료: {bot.user} (ID: {bot.user.id})")
+    if SHARDED:
+        print(f"🧩 샤드 {SHARD_IDS_RAW or '전체'} / {bot.shard_count}")
+
+    # 봇이 꺼져 있던 동안의 입장 / 퇴장 반영 (재연결 시에도 다시 실행)
+    started = time.perf_counter()
+    opened, closed = await bot.reconcile_all_voice()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"🎧 음성 세션 복원: 시작 {opened} / 종료 {closed} ({elapsed:.1f}ms)")
+
+    if "ready" not in bot.startup:
+        bot.mark_startup("ready")
+        phases = " / ".join(f"{phase} {sec:.2f}s" for phase, sec in bot.startup.items())
+        print(f"⏱️ 시작 시간: {phases} (합계 {sum(bot.startup.values()):.2f}s)")
 
 @bot.event
-async def on_voice_state_update(member, before, after):
-    if member.bot:
-        return
-    if before.channel is None and after.channel is not None:
-        bot.record_vc_join(member)
-    elif before.channel is not None and after.channel is None:
-        bot.record_vc_leave(member)
+async def on_interaction(interaction: discord.Interaction):
+    bot.record_gateway_latency(interaction)
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    bot.observe_command(interaction, "ok")
+
+# 음성 상태 이벤트는 GamerToolBot.dispatch에서 voice_queue로 바로 받는다 (on_voice_state_update 핸들러 없음)
+
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    await bot.ensure_guild(guild.id)
 
 # ---- /ping ----
 @bot.tree.command(name="ping", description="봇 상태를 확인합니다.")
@@ -145,7 +722,9 @@ async def roulette(interaction: discord.Interaction, options: str):
         await interaction.response.send_message("❗ 최소 2개 이상 입력해주세요.", ephemeral=True)
         return
 
-    choice = random.choice(items)
+    draw = bot.rng.draw(interaction.guild.id, "roulette")  # type: ignore
+    choice = draw.choice(items)
+    draw.done(choice)
     options_list = "\n".join(
         f"{'👉 ' if o == choice else ''}`{o}`"
         for o in items
@@ -163,7 +742,7 @@ async def roulette(interaction: discord.Interaction, options: str):
 
 # 1-2. /roulette_anim
 
-@bot.tree.command(name="roulette_anim", description="애니메이션 연출로 룰렛을 굴립니다.")
+@bot.tree.command(name="roulette_anim", description="애니메이션 연출로 룰렛을 굴립니다.", extras={"defer": "public"})
 @app_commands.describe(options="쉼표(,)로 구분")
 async def roulette_anim(interaction: discord.Interaction, options: str):
     items = [o.strip() for o in options.split(",") if o.strip()]
@@ -180,7 +759,8 @@ async def roulette_anim(interaction: discord.Interaction, options: str):
     msg = await interaction.original_response()
 
     pointer_index = 0
-    rounds = len(items) * 2 + random.randint(3, 6)
+    draw = bot.rng.draw(interaction.guild.id, "roulette_anim")  # type: ignore
+    rounds = len(items) * 2 + draw.randint(3, 6)
 
     for i in range(rounds):
         pointer_index = (pointer_index + 1) % len(items)
@@ -195,10 +775,11 @@ async def roulette_anim(interaction: discord.Interaction, options: str):
             description="\n".join(lines),
             color=COLOR_ALT
         )
-        await msg.edit(embed=frame)
+        bot.animator.push(msg, embed=frame)
         await asyncio.sleep(0.12 + (i * 0.01))
 
     choice = items[pointer_index]
+    draw.done(choice)
     lines = []
     for idx, name in enumerate(items):
         if idx == pointer_index:
@@ -211,36 +792,47 @@ async def roulette_anim(interaction: discord.Interaction, options: str):
         description="\n".join(lines),
         color=COLOR_SUCCESS
     )
-    await msg.edit(embed=result)
+    await bot.animator.finish(msg, embed=result)
 
 
 # 1-3. /pinball (동시 낙하, 순위)
 
+PINBALL_MAX_BALLS = 120
+PINBALL_LIVE_PAGES = 3  # 진행 중 화면에 표시할 보드 페이지 수
+PINBALL_PREVIEW = 20    # 진행 중 도착 순서 미리보기 개수
+
 @bot.tree.command(
     name="pinball",
-    description="여러 후보(공)를 동시에 떨어뜨려 도착 순서대로 순위를 정합니다."
+    description="여러 후보(공)를 동시에 떨어뜨려 도착 순서대로 순위를 정합니다.",
+    extras={"defer": "public"}
 )
-@app_commands.describe(options="쉼표(,)로 구분")
-async def pinball(interaction: discord.Interaction, options: str):
+@app_commands.describe(options="쉼표(,)로 구분", seed="같은 결과를 다시 보려면 이전 시드 입력")
+async def pinball(interaction: discord.Interaction, options: str, seed: Optional[int] = None):
     items = [o.strip() for o in options.split(",") if o.strip()]
     n = len(items)
 
     if n < 2:
         await interaction.response.send_message("❗ 최소 2개 이상 입력해주세요.", ephemeral=True)
         return
+    if n > PINBALL_MAX_BALLS:
+        await interaction.response.send_message(
+            f"❗ 공은 최대 {PINBALL_MAX_BALLS}개까지 가능합니다.", ephemeral=True
+        )
+        return
 
-    circled_nums = [
-        "①","②","③","④","⑤","⑥","⑦","⑧","⑨","⑩",
-        "⑪","⑫","⑬","⑭","⑮","⑯","⑰","⑱","⑲","⑳"
-    ]
-    balls = [circled_nums[i] if i < len(circled_nums) else str(i + 1) for i in range(n)]
-
-    max_height = max(6, min(12, n + 3))
-    heights = [max_height] * n
-    finished_order: List[int] = []
-    max_frames = 50
+    draw = bot.rng.draw(interaction.guild.id, "pinball", seed)  # type: ignore
+    seed = draw.record.seed
+    run = PinballRun(n, seed)
+    draw.done(" > ".join(items[i] for i in run.finish_order[:10]))
+    balls = run.symbols
+    live_pages = min(run.pages, PINBALL_LIVE_PAGES)
 
-    mapping_text = "\n".join(f"{balls[i]} : `{items[i]}`" for i in range(n))
+    # 한 필드에 다 못 넣으면 "외 N개"를 붙일 자리를 남겨 둔다
+    mapping_chunks = chunk_lines((f"{balls[i]} : `{items[i]}`" for i in range(n)), 1000)
+    mapping_text = mapping_chunks[0]
+    if len(mapping_chunks) > 1:
+        shown = mapping_text.count("\n") + 1
+        mapping_text += f"\n… 외 {n - shown}개"
 
     intro = discord.Embed(
         title="🕹 핀볼 시작!",
@@ -248,45 +840,24 @@ async def pinball(interaction: discord.Interaction, options: str):
         color=COLOR_ALT
     )
     intro.add_field(name="공 매핑", value=mapping_text, inline=False)
+    intro.set_footer(text=f"시드: {seed}")
     await interaction.response.send_message(embed=intro)
     msg = await interaction.original_response()
 
-    frame = 0
-    last_board_str = ""
+    def board_text() -> str:
+        return "\n\n".join(run.render(p) for p in range(live_pages))
 
-    while len(finished_order) < n and frame < max_frames:
-        frame += 1
-
-        for i in range(n):
-            if i in finished_order:
-                continue
-            if heights[i] > 0:
-                step = random.choice([0, 1])
-                heights[i] = max(0, heights[i] - step)
-                if heights[i] == 0:
-                    finished_order.append(i)
-
-        lines = []
-        for h in range(max_height, 0, -1):
-            row_cells = []
-            for i in range(n):
-                if heights[i] == h and i not in finished_order:
-                    sym = balls[i]
-                else:
-                    sym = "·"
-                row_cells.append(f"{sym} ")
-            lines.append("".join(row_cells))
-        slot_row = "🟦 " * n
-        lines.append(slot_row)
-
-        board_str = "\n".join(lines)
-        last_board_str = board_str
-
-        if finished_order:
-            preview = " → ".join(balls[i] for i in finished_order)
+    for _ in run.frames():
+        board_str = board_text()
+        if run.arrived:
+            preview = " → ".join(balls[i] for i in run.arrived[:PINBALL_PREVIEW])
+            if len(run.arrived) > PINBALL_PREVIEW:
+                preview += " → …"
             desc = f"```{board_str}```\n도착 순서(진행 중): {preview}"
         else:
             desc = f"```{board_str}```\n도착 대기 중..."
+        if run.pages > live_pages:
+            desc += f"\n(보드 {live_pages}/{run.pages} 페이지 표시 중)"
 
         embed = discord.Embed(
             title="🕹 핀볼 진행 중...",
@@ -294,26 +865,25 @@ async def pinball(interaction: discord.Interaction, options: str):
             color=COLOR_ALT
         )
         embed.add_field(name="공 매핑", value=mapping_text, inline=False)
-        await msg.edit(embed=embed)
+        embed.set_footer(text=f"시드: {seed}")
+        bot.animator.push(msg, embed=embed)
         await asyncio.sleep(0.18)
 
-    if len(finished_order) < n:
-        remaining = [i for i in range(n) if i not in finished_order]
-        finished_order.extend(remaining)
-
-    ranking_lines = []
-    for rank, idx in enumerate(finished_order, start=1):
-        ranking_lines.append(f"{rank}위 : {balls[idx]} → `{items[idx]}`")
+    ranking_chunks = chunk_lines(
+        f"{rank}위 : {balls[idx]} → `{items[idx]}`"
+        for rank, idx in enumerate(run.finish_order, start=1)
+    )
 
     result = discord.Embed(
         title="🏁 핀볼 최종 결과",
         color=COLOR_SUCCESS
     )
-    result.add_field(
-        name="최종 보드",
-        value=f"```{last_board_str}```",
-        inline=False
-    )
+    for p in range(live_pages):
+        result.add_field(
+            name="최종 보드" if live_pages == 1 else f"최종 보드 ({p + 1}/{run.pages})",
+            value=f"```{run.render(p)}```",
+            inline=False
+        )
     result.add_field(
         name="공 매핑",
         value=mapping_text,
@@ -321,10 +891,18 @@ async def pinball(interaction: discord.Interaction, options: str):
     )
     result.add_field(
         name="도착 순서 (순위)",
-        value="\n".join(ranking_lines),
+        value=ranking_chunks[0],
         inline=False
     )
-    await msg.edit(embed=result)
+    result.set_footer(text=f"시드: {seed}")
+    await bot.animator.finish(msg, embed=result)
+
+    # 순위가 한 필드에 다 들어가지 않으면 나머지를 이어서 보낸다
+    for start in range(1, len(ranking_chunks), 4):
+        extra = discord.Embed(title="🏁 핀볼 최종 결과 (계속)", color=COLOR_SUCCESS)
+        for chunk in ranking_chunks[start:start + 4]:
+            extra.add_field(name="도착 순서 (순위)", value=chunk, inline=False)
+        await interaction.followup.send(embed=extra)
 
 
 # 1-4. /ladder
@@ -352,7 +930,9 @@ async def ladder(interaction: discord.Interaction, players: str, results: str):
         return
 
     shuffled = rs[:]
-    random.shuffle(shuffled)
+    draw = bot.rng.draw(interaction.guild.id, "ladder")  # type: ignore
+    draw.shuffle(shuffled)
+    draw.done(", ".join(shuffled))
 
     lines = [f"**{p}** 👉 `{r}`" for p, r in zip(ps, shuffled)]
 
@@ -368,7 +948,7 @@ async def ladder(interaction: discord.Interaction, players: str, results: str):
 
 @bot.tree.command(
     name="team_split",
-    description="현재 음성채널 인원을 랜덤으로 팀에 나눕니다."
+    description="현재 음성채널 인원을 포인트 기준으로 균형 있게 팀에 나눕니다."
 )
 @app_commands.describe(team_count="팀 개수 (기본 2)")
 async def team_split(interaction: discord.Interaction, team_count: int = 2):
@@ -389,19 +969,22 @@ async def team_split(interaction: discord.Interaction, team_count: int = 2):
         )
         return
 
-    random.shuffle(members)
-    teams = [[] for _ in range(team_count)]
-    for i, m in enumerate(members):
-        teams[i % team_count].append(m)
+    # 포인트가 모두 같으면 랜덤 분배와 같다
+    guild_points = bot.guild_states[interaction.guild.id].points  # type: ignore
+    ratings = [guild_points.get(m.id, 0) for m in members]
+    draw = bot.rng.draw(interaction.guild.id, "team_split")  # type: ignore
+    teams = balance_teams(ratings, team_count, rng=draw)
+    draw.done(" | ".join(",".join(members[j].display_name for j in team) for team in teams))
 
     embed = discord.Embed(
-        title=f"🎲 팀 랜덤 분배 - {vs.channel.name}",
-        description=f"총 {len(members)}명 / {team_count}팀",
+        title=f"⚖️ 팀 밸런스 분배 - {vs.channel.name}",
+        description=f"총 {len(members)}명 / {team_count}팀 (포인트 합계 기준)",
         color=COLOR_MAIN
     )
     for i, team in enumerate(teams, start=1):
-        val = "\n".join(m.mention for m in team) if team else "인원 없음"
-        embed.add_field(name=f"팀 {i}", value=val, inline=True)
+        val = "\n".join(members[j].mention for j in team) if team else "인원 없음"
+        total = sum(ratings[j] for j in team)
+        embed.add_field(name=f"팀 {i} ({total}점)", value=val, inline=True)
 
     await interaction.response.send_message(embed=embed)
 
@@ -431,26 +1014,21 @@ async def captain_draft(interaction: discord.Interaction, team_count: int = 2):
         )
         return
 
-    random.shuffle(members)
+    draw = bot.rng.draw(interaction.guild.id, "captain_draft")  # type: ignore
+    draw.shuffle(members)
     captains = members[:team_count]
-    pool = members[team_count:]
-
-    teams = [[c] for c in captains]
-    direction = 1
-    idx = 0
-    for p in pool:
-        teams[idx].append(p)
-        idx += direction
-        if idx >= team_count:
-            idx = team_count - 1
-            direction = -1
-        elif idx < 0:
-            idx = 0
-            direction = 1
+
+    # 캡틴은 각 팀에 고정하고 나머지를 포인트 합계가 비슷하도록 배치
+    guild_points = bot.guild_states[interaction.guild.id].points  # type: ignore
+    ratings = [guild_points.get(m.id, 0) for m in members]
+    fixed = [i if i < team_count else None for i in range(len(members))]
+    teams = [[members[j] for j in team] for team in balance_teams(ratings, team_count, fixed, draw)]
+    draw.done(" | ".join(",".join(m.display_name for m in team) for team in teams))
+    totals = [sum(guild_points.get(m.id, 0) for m in team) for team in teams]
 
     embed = discord.Embed(
         title=f"🏅 주장 드래프트 결과 - {vs.channel.name}",
-        description="스네이크 드래프트 방식으로 팀을 구성했습니다.",
+        description="캡틴을 뽑고 포인트 합계가 비슷하도록 팀원을 배치했습니다.",
         color=COLOR_SUCCESS
     )
     embed.add_field(
@@ -462,7 +1040,7 @@ async def captain_draft(interaction: discord.Interaction, team_count: int = 2):
         captain = team[0]
         mem_txt = "\n".join(m.mention for m in team[1:]) if len(team) > 1 else "팀원 없음"
         embed.add_field(
-            name=f"팀 {i} (캡틴: {captain.display_name})",
+            name=f"팀 {i} (캡틴: {captain.display_name}, {totals[i - 1]}점)",
             value=mem_txt,
             inline=True
         )
@@ -510,32 +1088,65 @@ async def auto_teams(interaction: discord.Interaction, team_size: int):
         )
         return
 
+    await interaction.response.defer(thinking=True)
+
+    # 같은 카테고리에 이미 있는 "팀 N" 채널은 다시 쓰고, 모자란 것만 새로 만든다
     category = vs.channel.category
-    new_channels = []
-    for i in range(1, team_count + 1):
-        ch = await guild.create_voice_channel(
-            name=f"팀 {i}",
-            category=category
-        )
-        new_channels.append(ch)
+    siblings = category.voice_channels if category else [
+        ch for ch in guild.voice_channels if ch.category is None
+    ]
+    existing = {ch.name: ch for ch in siblings}
+    team_channels: List[Optional[discord.VoiceChannel]] = [
+        existing.get(f"팀 {i}") for i in range(1, team_count + 1)
+    ]
 
-    random.shuffle(members)
-    for idx, m in enumerate(members):
-        target_ch = new_channels[idx % team_count]
-        try:
-            await m.move_to(target_ch)
-        except Exception as e:
-            print("MOVE ERROR:", m, e)
+    missing = [i for i, ch in enumerate(team_channels) if ch is None]
+    if missing:
+        created = await bot.bulk.run([
+            (("create_channel", guild.id),
+             lambda i=i: guild.create_voice_channel(name=f"팀 {i + 1}", category=category))
+            for i in missing
+        ])
+        for i, res in zip(missing, created.results):
+            if isinstance(res, BaseException):
+                print("CREATE ERROR:", i + 1, res)
+            else:
+                team_channels[i] = res
+    channels = [ch for ch in team_channels if ch is not None]
+    if not channels:
+        await interaction.edit_original_response(content="❗ 팀 채널을 만들지 못했습니다.")
+        return
+
+    draw = bot.rng.draw(guild.id, "auto_teams")
+    draw.shuffle(members)
+    draw.done(", ".join(m.display_name for m in members))
+    total = len(members)
+
+    async def report(done: int, total: int):
+        await interaction.edit_original_response(content=f"⏳ 멤버 이동 중... ({done}/{total})")
+
+    moved = await bot.bulk.run(
+        [
+            (("move_member", guild.id),
+             lambda m=m, ch=channels[idx % len(channels)]: m.move_to(ch))
+            for idx, m in enumerate(members)
+        ],
+        progress=report
+    )
+    for err in moved.failed:
+        print("MOVE ERROR:", err)
 
     embed = discord.Embed(
         title="🧩 자동 팀 채널 분배 완료",
-        description=f"{len(members)}명을 {team_count}개 팀 채널로 분배했습니다.",
+        description=f"{total - len(moved.failed)}명을 {len(channels)}개 팀 채널로 분배했습니다.",
         color=COLOR_MAIN
     )
-    for i, ch in enumerate(new_channels, start=1):
-        embed.add_field(name=f"팀 {i}", value=ch.mention, inline=True)
+    if moved.failed:
+        embed.description += f"\n⚠️ 이동 실패: {len(moved.failed)}명"
+    for ch in channels:
+        embed.add_field(name=ch.name, value=ch.mention, inline=True)
 
-    await interaction.response.send_message(embed=embed)
+    await interaction.edit_original_response(content=None, embed=embed)
 
 
 # =========================
@@ -557,48 +1168,158 @@ async def points_add(interaction: discord.Interaction, user: discord.Member, amo
         return
 
     gid = interaction.guild.id  # type: ignore
-    bot.add_points(gid, user.id, amount)
-    total = bot.points[gid][user.id]
+    total = bot.add_points(gid, user.id, amount, "points_add", str(interaction.id))
     await interaction.response.send_message(
         f"✅ {user.mention} 님에게 `{amount}` 포인트 부여 (총 {total}점)",
         ephemeral=True
     )
 
 
+# 유저 멘션만 (<@id> / <@!id>) - 역할 / 채널 멘션, 메시지 링크, 숫자는 무시
+MENTION_ID = re.compile(r"<@!?(\d{15,20})>")
+
+
+async def resolve_members(guild: discord.Guild, user_ids: List[int]) -> List[discord.Member]:
+    # 캐시에 없는 멤버는 query_members로 100명씩 조회, 서버에 없는 ID는 빠진다
+    found = {}
+    missing = []
+    for uid in user_ids:
+        member = guild.get_member(uid)
+        if member is not None:
+            found[uid] = member
+        else:
+            missing.append(uid)
+    for i in range(0, len(missing), 100):
+        chunk = missing[i:i + 100]
+        for member in await guild.query_members(user_ids=chunk, limit=len(chunk), cache=False):
+            found[member.id] = member
+    return [found[uid] for uid in user_ids if uid in found]
+
+
+@bot.tree.command(
+    name="points_grant",
+    description="역할 / 음성채널 / 여러 유저에게 한 번에 포인트를 지급합니다. (관리자 전용)",
+    extras={"defer": "ephemeral"}
+)
+@app_commands.describe(
+    amount="지급할 포인트 (음수면 차감)",
+    role="대상 역할",
+    channel="대상 음성채널 (현재 접속 인원)",
+    users="대상 유저 멘션들 (공백 / 쉼표 구분)",
+    reason="사유"
+)
+async def points_grant(
+    interaction: discord.Interaction,
+    amount: int,
+    role: Optional[discord.Role] = None,
+    channel: Optional[discord.VoiceChannel] = None,
+    users: Optional[str] = None,
+    reason: Optional[str] = None
+):
+    if not is_admin_or_mod(interaction.user):
+        await interaction.response.send_message("❗ 관리자만 사용 가능합니다.", ephemeral=True)
+        return
+
+    if amount == 0:
+        await interaction.response.send_message("0은 의미가 없습니다.", ephemeral=True)
+        return
+
+    guild = interaction.guild
+    if role is not None and not bot.intents.members:
+        # 멤버 캐시가 일부뿐이라 일부에게만 지급되는 것을 막는다
+        await interaction.response.send_message(
+            "❗ 역할 대상 지급에는 members 인텐트가 필요합니다. (MEMBERS_INTENT=1)", ephemeral=True
+        )
+        return
+
+    targets: Dict[int, None] = {}  # 순서 유지 + 중복 제거
+    if role is not None:
+        if not guild.chunked:  # type: ignore
+            await guild.chunk()  # type: ignore
+        for m in role.members:
+            if not m.bot:
+                targets[m.id] = None
+    if channel is not None:
+        for m in channel.members:
+            if not m.bot:
+                targets[m.id] = None
+    if users:
+        mentioned = list(dict.fromkeys(int(raw) for raw in MENTION_ID.findall(users)))
+        try:
+            members = await resolve_members(guild, mentioned)  # type: ignore
+        except asyncio.TimeoutError:
+            await interaction.response.send_message("❗ 멤버 조회 시간이 초과됐습니다. 다시 시도해주세요.", ephemeral=True)
+            return
+        for m in members:
+            if not m.bot:
+                targets[m.id] = None
+
+    if not targets:
+        await interaction.response.send_message("❗ 지급 대상이 없습니다.", ephemeral=True)
+        return
+
+    applied = bot.ledger.apply(
+        guild.id,  # type: ignore
+        [(uid, amount) for uid in targets],
+        reason or "points_grant",
+        str(interaction.id)
+    )
+
+    embed = discord.Embed(
+        title="💰 포인트 일괄 지급",
+        description=f"{len(applied)}명에게 `{amount}` 포인트를 지급했습니다.",
+        color=COLOR_SUCCESS
+    )
+    preview = [f"<@{uid}> → {total}점" for uid, total in applied[:20]]
+    if len(applied) > 20:
+        preview.append(f"… 외 {len(applied) - 20}명")
+    embed.add_field(name="대상", value="\n".join(preview), inline=False)
+    if reason:
+        embed.set_footer(text=f"사유: {reason}")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
 @bot.tree.command(name="points_me", description="내 포인트를 확인합니다.")
 async def points_me(interaction: discord.Interaction):
     gid = interaction.guild.id  # type: ignore
-    point = bot.points.get(gid, {}).get(interaction.user.id, 0)
+    point = bot.guild_states[gid].points.get(interaction.user.id, 0)
+    ranks = bot.points_rank(gid)
+    rank = ranks.rank(interaction.user.id)
+    rank_text = f" ({rank}위 / {len(ranks)}명)" if rank is not None else ""
     await interaction.response.send_message(
-        f"🎯 현재 포인트: **{point}점**",
+        f"🎯 현재 포인트: **{point}점**{rank_text}",
         ephemeral=True
     )
 
 
 @bot.tree.command(
     name="leaderboard",
-    description="포인트 랭킹 TOP10을 표시합니다."
+    description="포인트 랭킹 TOP10을 표시합니다.",
+    extras={"defer": "public"}
 )
 async def leaderboard(interaction: discord.Interaction):
-    gid = interaction.guild.id  # type: ignore
-    data = bot.points.get(gid, {})
-    if not data:
-        await interaction.response.send_message("아직 포인트 데이터가 없습니다.", ephemeral=True)
-        return
-
-    sorted_users = sorted(data.items(), key=lambda x: x[1], reverse=True)[:10]
+    guild = interaction.guild
 
-    lines = []
-    for rank, (uid, pt) in enumerate(sorted_users, start=1):
-        member = interaction.guild.get_member(uid)  # type: ignore
-        name = member.display_name if member else f"User {uid}"
-        lines.append(f"{rank}위: **{name}** - `{pt}`점")
+    async def build() -> Optional[discord.Embed]:
+        ranks = bot.points_rank(guild.id)  # type: ignore
+        if not len(ranks):
+            return None
+        top = ranks.top(10)
+        names = await bot.names.resolve(guild, [uid for uid, _ in top])  # type: ignore
+        lines = [
+            f"{rank}위: **{names[uid]}** - `{pt}`점"
+            for rank, (uid, pt) in enumerate(top, start=1)
+        ]
+        return discord.Embed(
+            title="🏆 포인트 랭킹 TOP 10",
+            description="\n".join(lines),
+            color=COLOR_SUCCESS
+        )
 
-    embed = discord.Embed(
-        title="🏆 포인트 랭킹 TOP 10",
-        description="\n".join(lines),
-        color=COLOR_SUCCESS
-    )
+    embed = await bot.embed_cache.get(guild.id, "leaderboard", "points", build)  # type: ignore
+    if embed is None:
+        await interaction.response.send_message("아직 포인트 데이터가 없습니다.", ephemeral=True)
+        return
     await interaction.response.send_message(embed=embed)
 
 
@@ -608,93 +1329,138 @@ async def leaderboard(interaction: discord.Interaction):
 
 @bot.tree.command(
     name="vc_rank",
-    description="음성채널 활동 시간 랭킹 TOP10을 보여줍니다."
+    description="음성채널 활동 시간 랭킹 TOP10을 보여줍니다.",
+    extras={"defer": "public"}
 )
 async def vc_rank(interaction: discord.Interaction):
-    gid = interaction.guild.id  # type: ignore
-    data = dict(bot.vc_time.get(gid, {}))
+    guild = interaction.guild
 
-    now = time.time()
-    for uid, start in bot.vc_join.get(gid, {}).items():
-        data[uid] = data.get(uid, 0) + (now - start)
+    async def build() -> Optional[discord.Embed]:
+        ranking = bot.vc_ranking(guild.id)  # type: ignore
+        if not len(ranking):
+            return None
+        top = ranking.top(10, time.time())
+        names = await bot.names.resolve(guild, [uid for uid, _ in top])  # type: ignore
+        lines = [
+            f"{rank}위: **{names[uid]}** - `{sec / 3600:.1f}시간`"
+            for rank, (uid, sec) in enumerate(top, start=1)
+        ]
+        return discord.Embed(
+            title="📊 VC 활동 시간 랭킹 TOP 10",
+            description="\n".join(lines),
+            color=COLOR_MAIN
+        )
 
-    if not data:
+    # 접속 중인 유저의 시간은 계속 늘어나므로 최대 EMBED_CACHE_TTL초 전 값일 수 있다
+    embed = await bot.embed_cache.get(guild.id, "vc_rank", "vc", build)  # type: ignore
+    if embed is None:
         await interaction.response.send_message("아직 기록된 VC 활동 데이터가 없습니다.", ephemeral=True)
         return
+    await interaction.response.send_message(embed=embed)
 
-    sorted_users = sorted(data.items(), key=lambda x: x[1], reverse=True)[:10]
 
-    lines = []
-    for rank, (uid, sec) in enumerate(sorted_users, start=1):
-        member = interaction.guild.get_member(uid)  # type: ignore
-        name = member.display_name if member else f"User {uid}"
-        hours = sec / 3600
-        lines.append(f"{rank}위: **{name}** - `{hours:.1f}시간`")
+KST_OFFSET_HOURS = 9
 
-    embed = discord.Embed(
-        title="📊 VC 활동 시간 랭킹 TOP 10",
-        description="\n".join(lines),
-        color=COLOR_MAIN
-    )
+
+@bot.tree.command(
+    name="vc_stats",
+    description="최근 7일 음성채널 통계(유저 / 채널 / 시간대)를 보여줍니다.",
+    extras={"defer": "public"}
+)
+async def vc_stats(interaction: discord.Interaction):
+    guild = interaction.guild
+    stats = bot.vc_stats[guild.id]  # type: ignore
+    now = time.time()
+    users = stats.top_users(5, now)
+    if not users:
+        await interaction.response.send_message("최근 7일간 기록된 VC 활동이 없습니다.", ephemeral=True)
+        return
+
+    def channel_name(cid) -> str:
+        channel = guild.get_channel(cid) if cid is not None else None  # type: ignore
+        return channel.name if channel else f"채널 {cid}"
+
+    names = await bot.names.resolve(guild, [uid for uid, _ in users])  # type: ignore
+    user_lines = [
+        f"{rank}. **{names[uid]}** - `{sec / 3600:.1f}시간`"
+        for rank, (uid, sec) in enumerate(users, start=1)
+    ]
+
+    channel_lines = [
+        f"{rank}. {channel_name(cid)} - `{sec / 3600:.1f}시간`"
+        for rank, (cid, sec) in enumerate(stats.busiest_channels(5, now), start=1)
+    ]
+
+    hours = stats.by_hour_of_day(now, KST_OFFSET_HOURS)
+    peak = sorted(range(24), key=lambda h: hours[h][1], reverse=True)[:3]
+    hour_lines = [
+        f"{h:02d}시 - `{hours[h][1] / 3600:.1f}시간` (최다: {channel_name(hours[h][0])})"
+        for h in peak if hours[h][1] > 0
+    ]
+
+    embed = discord.Embed(title="📈 최근 7일 VC 통계", color=COLOR_MAIN)
+    embed.add_field(name="🎙️ 유저 TOP 5", value="\n".join(user_lines), inline=False)
+    embed.add_field(name="🔊 채널 TOP 5", value="\n".join(channel_lines) or "없음", inline=False)
+    embed.add_field(name="⏰ 붐비는 시간대 (KST)", value="\n".join(hour_lines) or "없음", inline=False)
     await interaction.response.send_message(embed=embed)
 
 
 # =========================
-# 5. 토너먼트 (싱글 엘리미네이션)
+# 5. 토너먼트 (싱글 / 더블 엘리미네이션, 스위스)
 # =========================
 
-def build_tournament_embed(guild: discord.Guild, t: Dict) -> discord.Embed:
+FORMAT_LABELS = {SINGLE: "싱글 엘리미네이션", DOUBLE: "더블 엘리미네이션", SWISS: "스위스"}
+
+
+def build_tournament_embed(guild: discord.Guild, t: Dict, page: int = 0) -> discord.Embed:
+    b: Bracket = t["bracket"]
+    view = bot.tournament_view_of(guild.id)
+    pages = view.pages()
+    page = max(0, min(page, len(pages) - 1))
     embed = discord.Embed(
         title=f"🏆 토너먼트: {t['name']}",
+        description=f"{FORMAT_LABELS[b.format]} / {len(b.names)}명",
         color=COLOR_MAIN
     )
-    rounds: Dict[int, List[str]] = {}
-    for mid, m in t["matches"].items():
-        r = m["round"]
-        if r not in rounds:
-            rounds[r] = []
-        status = "❔"
-        if m["winner"] is not None:
-            status = f"✅ ({m['winner']})"
-        rounds[r].append(f"#{mid}: {m['team1']} vs {m['team2']} {status}")
-
-    for r in sorted(rounds.keys()):
-        embed.add_field(
-            name=f"{r} 라운드",
-            value="\n".join(rounds[r]),
-            inline=False
-        )
-
-    if t.get("next_round_seed"):
-        embed.add_field(
-            name="다음 라운드 시드(부전승 포함)",
-            value=", ".join(t["next_round_seed"]),
-            inline=False
-        )
+    for name, value in pages[page]:
+        embed.add_field(name=name, value=value, inline=False)
 
     if t["active"]:
-        embed.set_footer(text="승자를 입력하려면 /tournament_result 사용")
+        footer = "승자를 입력하려면 /tournament_result 사용"
     else:
-        embed.set_footer(text="토너먼트 종료")
+        footer = "토너먼트 종료"
+    if len(pages) > 1:
+        footer += f" · 페이지 {page + 1}/{len(pages)} (/tournament_view page)"
+    embed.set_footer(text=footer)
     return embed
 
 
 @bot.tree.command(
     name="tournament_create",
-    description="싱글 엘리미네이션 토너먼트를 생성합니다."
+    description="토너먼트를 생성합니다. (싱글 / 더블 엘리미네이션, 스위스)",
+    extras={"defer": "public"}
 )
 @app_commands.describe(
     name="토너먼트 이름",
-    participants="참가 팀/유저 이름들 (쉼표, 2~16개)"
+    participants=f"참가 팀/유저 이름들 (쉼표, 2~{MAX_ENTRANTS}개)",
+    mode="진행 방식 (기본 싱글 엘리미네이션)"
 )
-async def tournament_create(interaction: discord.Interaction, name: str, participants: str):
+@app_commands.choices(mode=[
+    app_commands.Choice(name=label, value=key) for key, label in FORMAT_LABELS.items()
+])
+async def tournament_create(
+    interaction: discord.Interaction,
+    name: str,
+    participants: str,
+    mode: Optional[app_commands.Choice[str]] = None
+):
     if not is_admin_or_mod(interaction.user):
         await interaction.response.send_message("❗ 관리자만 사용 가능합니다.", ephemeral=True)
         return
 
     parts = [p.strip() for p in participants.split(",") if p.strip()]
-    if len(parts) < 2 or len(parts) > 16:
-        await interaction.response.send_message("❗ 참가자는 2~16개여야 합니다.", ephemeral=True)
+    if len(parts) < 2 or len(parts) > MAX_ENTRANTS:
+        await interaction.response.send_message(f"❗ 참가자는 2~{MAX_ENTRANTS}개여야 합니다.", ephemeral=True)
         return
 
     gid = interaction.guild.id  # type: ignore
@@ -705,30 +1471,21 @@ async def tournament_create(interaction: discord.Interaction, name: str, partici
         )
         return
 
-    random.shuffle(parts)
-
-    matches = {}
-    match_id = 1
-    current_round = 1
-    next_round_seed: List[str] = []
-
-    queue = parts[:]
-    while len(queue) > 1:
-        t1 = queue.pop(0)
-        t2 = queue.pop(0)
-        matches[match_id] = {"round": current_round, "team1": t1, "team2": t2, "winner": None}
-        match_id += 1
-    if queue:
-        next_round_seed.append(queue.pop(0))
+    draw = bot.rng.draw(gid, "tournament_create")
+    draw.shuffle(parts)
+    draw.done(", ".join(parts))
+    try:
+        bracket = Bracket(parts, mode.value if mode else SINGLE)
+    except BracketError as e:
+        await interaction.response.send_message(f"❗ {e}", ephemeral=True)
+        return
 
     bot.tournaments[gid] = {
         "name": name,
         "active": True,
-        "matches": matches,
-        "current_round": current_round,
-        "next_match_id": match_id,
-        "next_round_seed": next_round_seed
+        "bracket": bracket
     }
+    bot.save_tournament(gid)
 
     await interaction.response.send_message(
         embed=build_tournament_embed(interaction.guild, bot.tournaments[gid]),
@@ -738,7 +1495,8 @@ async def tournament_create(interaction: discord.Interaction, name: str, partici
 
 @bot.tree.command(
     name="tournament_result",
-    description="특정 경기의 승자를 기록하고 다음 라운드를 진행합니다."
+    description="특정 경기의 승자를 기록하고 다음 라운드를 진행합니다.",
+    extras={"defer": "public"}
 )
 @app_commands.describe(
     match_id="경기 번호 (# 제외 숫자)",
@@ -755,68 +1513,51 @@ async def tournament_result(interaction: discord.Interaction, match_id: int, win
         await interaction.response.send_message("진행 중인 토너먼트가 없습니다.", ephemeral=True)
         return
 
-    m = t["matches"].get(match_id)
-    if not m:
-        await interaction.response.send_message("해당 경기 ID를 찾을 수 없습니다.", ephemeral=True)
+    b: Bracket = t["bracket"]
+    view = bot.tournament_view_of(gid)
+    try:
+        touched = b.record(match_id, winner)
+    except BracketError as e:
+        await interaction.response.send_message(str(e), ephemeral=True)
         return
-    if m["winner"] is not None:
-        await interaction.response.send_message("이미 승자가 기록된 경기입니다.", ephemeral=True)
+    view.invalidate(touched)
+
+    # 레이팅 반영
+    m = match_id - 1
+    loser = b.team2[m] if b.winner[m] == b.team1[m] else b.team1[m]
+    bot.record_rating(gid, b.names[b.winner[m]], b.names[loser])
+    # 방금 기록한 경기가 있는 페이지를 보여준다
+    page = view.page_of_match(match_id - 1)
+
+    if b.champion is not None:
+        t["active"] = False
+        bot.save_tournament(gid)
+        embed = build_tournament_embed(interaction.guild, t, page)
+        embed.add_field(name="🏆 우승", value=f"**{b.names[b.champion]}**", inline=False)
+        await interaction.response.send_message(embed=embed)
         return
-    if winner not in (m["team1"], m["team2"]):
-        await interaction.response.send_message(
-            f"승자는 `{m['team1']}` 또는 `{m['team2']}` 이어야 합니다.",
-            ephemeral=True
-        )
-        return
-
-    m["winner"] = winner
-
-    current_round = t["current_round"]
-    round_matches = [mm for mm in t["matches"].values() if mm["round"] == current_round]
-    if all(mm["winner"] is not None for mm in round_matches):
-        winners = [mm["winner"] for mm in round_matches]
-        winners += t.get("next_round_seed", [])
-        t["next_round_seed"] = []
-
-        if len(winners) == 1:
-            t["active"] = False
-            champion = winners[0]
-            embed = build_tournament_embed(interaction.guild, t)
-            embed.add_field(name="🏆 우승", value=f"**{champion}**", inline=False)
-            await interaction.response.send_message(embed=embed)
-            return
-        else:
-            t["current_round"] += 1
-            nr = t["current_round"]
-            random.shuffle(winners)
-            queue = winners[:]
-            while len(queue) > 1:
-                t1 = queue.pop(0)
-                t2 = queue.pop(0)
-                mid = t["next_match_id"]
-                t["matches"][mid] = {"round": nr, "team1": t1, "team2": t2, "winner": None}
-                t["next_match_id"] += 1
-            if queue:
-                t["next_round_seed"].append(queue.pop(0))
+    bot.save_tournament(gid)
 
     await interaction.response.send_message(
-        embed=build_tournament_embed(interaction.guild, t),
+        embed=build_tournament_embed(interaction.guild, t, page),
         ephemeral=False
     )
 
 
 @bot.tree.command(
     name="tournament_view",
-    description="현재 토너먼트 상태를 보여줍니다."
+    description="현재 토너먼트 상태를 보여줍니다.",
+    extras={"defer": "public"}
 )
-async def tournament_view(interaction: discord.Interaction):
+@app_commands.describe(page="대진표 페이지 (대진이 길 때)")
+async def tournament_view(interaction: discord.Interaction, page: int = 1):
     gid = interaction.guild.id  # type: ignore
     t = bot.tournaments.get(gid)
     if not t:
         await interaction.response.send_message("현재 등록된 토너먼트가 없습니다.", ephemeral=True)
         return
     await interaction.response.send_message(
-        embed=build_tournament_embed(interaction.guild, t),
+        embed=build_tournament_embed(interaction.guild, t, page - 1),
         ephemeral=False
     )
 
@@ -835,9 +1576,34 @@ async def tournament_end(interaction: discord.Interaction):
         await interaction.response.send_message("진행 중인 토너먼트가 없습니다.", ephemeral=True)
         return
     t["active"] = False
+    bot.save_tournament(gid)
     await interaction.response.send_message("✅ 토너먼트를 종료했습니다.", ephemeral=True)
 
 
+@bot.tree.command(
+    name="rating_rank",
+    description="토너먼트 결과 기반 레이팅(Elo) TOP10을 표시합니다."
+)
+async def rating_rank(interaction: discord.Interaction):
+    gid = interaction.guild.id  # type: ignore
+    book = bot.ratings[gid]
+    if not len(book):
+        await interaction.response.send_message("아직 기록된 토너먼트 경기가 없습니다.", ephemeral=True)
+        return
+
+    lines = []
+    for rank, (name, rating, games) in enumerate(book.top(10), start=1):
+        lines.append(f"{rank}위: **{name}** - `{rating:.0f}` ({games}경기)")
+
+    embed = discord.Embed(
+        title="📈 레이팅 랭킹 TOP 10",
+        description="\n".join(lines),
+        color=COLOR_SUCCESS
+    )
+    embed.set_footer(text=f"총 {len(book)}경기 기록")
+    await interaction.response.send_message(embed=embed)
+
+
 # =========================
 # 6. 스케줄 이벤트 (자동 룰렛)
 # =========================
@@ -871,13 +1637,10 @@ async def event_create_roulette(
         return
 
     gid = interaction.guild.id  # type: ignore
-    if gid not in bot.scheduled_events:
-        bot.scheduled_events[gid] = {}
-
     event_id = bot.next_event_id
     bot.next_event_id += 1
 
-    bot.scheduled_events[gid][event_id] = {
+    bot.guild_states[gid].scheduled_events[event_id] = {
         "name": name,
         "type": "roulette",
         "channel_id": interaction.channel.id,
@@ -887,7 +1650,8 @@ async def event_create_roulette(
         "next_run": time.time() + interval_minutes * 60
     }
 
-    bot.start_event_task(gid, event_id)
+    bot.save_event(gid, event_id)
+    bot.schedule_event(gid, event_id)
 
     await interaction.response.send_message(
         f"✅ 이벤트 생성 완료! (ID: {event_id}, {interval_minutes}분마다 실행)",
@@ -901,7 +1665,7 @@ async def event_create_roulette(
 )
 async def event_list(interaction: discord.Interaction):
     gid = interaction.guild.id  # type: ignore
-    events = bot.scheduled_events.get(gid, {})
+    events = bot.guild_states[gid].scheduled_events
     if not events:
         await interaction.response.send_message("등록된 이벤트가 없습니다.", ephemeral=True)
         return
@@ -932,13 +1696,15 @@ async def event_cancel(interaction: discord.Interaction, event_id: int):
         return
 
     gid = interaction.guild.id  # type: ignore
-    events = bot.scheduled_events.get(gid, {})
+    events = bot.guild_states[gid].scheduled_events
     ev = events.get(event_id)
     if not ev:
         await interaction.response.send_message("해당 ID의 이벤트를 찾을 수 없습니다.", ephemeral=True)
         return
 
     ev["active"] = False
+    bot.save_event(gid, event_id)
+    bot.cancel_event(gid, event_id)
     await interaction.response.send_message("✅ 이벤트를 중지했습니다.", ephemeral=True)
 
 @bot.tree.command(name="help", description="봇의 기능과 명령어 목록을 확인합니다.")
@@ -964,7 +1730,8 @@ async def help_command(interaction: discord.Interaction):
         name="🏅 포인트 및 랭킹",
         value=(
             "/points_me - 내 포인트 확인\n"
-            "/leaderboard - 포인트 랭킹 보기"
+            "/leaderboard - 포인트 랭킹 보기\n"
+            "/rating_rank - 토너먼트 레이팅 랭킹"
         ),
         inline=False
     )
@@ -981,13 +1748,101 @@ async def help_command(interaction: discord.Interaction):
     await interaction.response.send_message(embed=embed)
 
 
+# =========================
+# 7. 운영 도구
+# =========================
+
+@bot.tree.command(
+    name="profiler",
+    description="샘플링 프로파일러를 켜고 끄거나 결과를 받습니다. (관리자)"
+)
+@app_commands.describe(action="start: 시작 / stop: 중지 후 결과 / status: 현재 상태")
+@app_commands.choices(action=[
+    app_commands.Choice(name="start", value="start"),
+    app_commands.Choice(name="stop", value="stop"),
+    app_commands.Choice(name="status", value="status"),
+])
+async def profiler(interaction: discord.Interaction, action: app_commands.Choice[str]):
+    if not is_admin_or_mod(interaction.user):
+        await interaction.response.send_message("❗ 관리자만 사용 가능합니다.", ephemeral=True)
+        return
+
+    prof = bot.profiler
+    if action.value == "start":
+        if prof.running:
+            await interaction.response.send_message("이미 실행 중입니다.", ephemeral=True)
+            return
+        prof.start()
+        await interaction.response.send_message("✅ 프로파일러를 시작했습니다.", ephemeral=True)
+        return
+
+    if action.value == "status":
+        state = "실행 중" if prof.running else "중지됨"
+        await interaction.response.send_message(
+            f"🩺 프로파일러 {state} / 샘플 {prof.samples}개", ephemeral=True
+        )
+        return
+
+    if not prof.running:
+        await interaction.response.send_message("실행 중인 프로파일러가 없습니다.", ephemeral=True)
+        return
+    prof.stop()
+    elapsed = time.time() - (prof.started_at or time.time())
+    lines = [
+        f"{count / max(prof.samples, 1) * 100:5.1f}% `{name}`"
+        for name, count in prof.top_functions(10)
+    ]
+    embed = discord.Embed(
+        title="🩺 프로파일 결과",
+        description=f"{elapsed:.1f}초 / 샘플 {prof.samples}개\n\n" + ("\n".join(lines) or "샘플 없음"),
+        color=COLOR_MAIN
+    )
+    report = discord.File(io.BytesIO(prof.collapsed().encode("utf-8")), filename="profile.collapsed.txt")
+    await interaction.response.send_message(embed=embed, file=report, ephemeral=True)
+
+
+@bot.tree.command(
+    name="rng_log",
+    description="최근 랜덤 추첨의 시드와 결과를 보여줍니다. (재현 / 검증용)"
+)
+async def rng_log(interaction: discord.Interaction):
+    records = bot.rng.history(interaction.guild.id, 10)  # type: ignore
+    if not records:
+        await interaction.response.send_message("아직 기록된 추첨이 없습니다.", ephemeral=True)
+        return
+
+    lines = []
+    for r in records:
+        result = r.result if len(r.result) <= 60 else r.result[:57] + "..."
+        lines.append(f"`#{r.id}` <t:{int(r.at)}:R> **/{r.command}** 시드 `{r.seed}` → {result or '-'}")
+    embed = discord.Embed(
+        title="🎲 최근 추첨 기록",
+        description="\n".join(lines),
+        color=COLOR_MAIN
+    )
+    embed.set_footer(text="같은 시드면 같은 결과가 나옵니다. (핀볼은 seed 옵션으로 재현)")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
 # =========================
 # 실행
 # =========================
 
+async def run_bot(token: str):
+    # 헬스 / 메트릭 포트를 먼저 열고 로그인한다
+    async with bot:
+        if PRIMARY_PROCESS:
+            await bot.start_health()
+        await bot.start(token)
+
+
 if __name__ == "__main__":
     if not DISCORD_TOKEN:
         print("❌ DISCORD_TOKEN 환경 변수가 설정되지 않았습니다.")
         exit(1)
-    keep_alive()
-    bot.run(DISCORD_TOKEN)
+    bot.mark_startup("import")
+
+    try:
+        asyncio.run(run_bot(DISCORD_TOKEN))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,367 @@
+from array import array
+from typing import Dict, List, Optional
+
+
+# 토너먼트 대진 엔진.
+# 참가자는 이름 목록의 인덱스로 다루고, 경기 정보는 전부 배열(열 단위)로 보관한다.
+# 경기마다 "이긴 쪽이 갈 자리(win_to)"와 "진 쪽이 갈 자리(lose_to)"를 생성 시점에 계산해 두므로
+# 결과 기록은 대진 크기와 상관없이 O(1)로 다음 경기에 반영된다. (자리 = 경기 번호 * 2 + 슬롯)
+# 싱글 엘리미네이션은 배열 기반 이진 트리, 더블 엘리미네이션은 승자조 트리 + 패자조,
+# 스위스는 라운드가 끝날 때마다 점수순으로 다음 라운드를 짝짓는다.
+# 더블 엘리미네이션 결승에서 패자조 우승자가 이기면 둘 다 1패이므로 결승 리셋 경기를 한 번 더 치른다.
+
+EMPTY = -1  # 아직 정해지지 않은 자리
+BYE = -2    # 부전승
+
+SINGLE = "single"
+DOUBLE = "double"
+SWISS = "swiss"
+FORMATS = (SINGLE, DOUBLE, SWISS)
+
+MAX_ENTRANTS = 1024
+
+
+class BracketError(Exception):
+    pass
+
+
+def _next_pow2(n: int) -> int:
+    p = 1
+    while p < n:
+        p <<= 1
+    return p
+
+
+class Bracket:
+    def __init__(self, names: List[str], fmt: str = SINGLE, swiss_rounds: int = 0):
+        if fmt not in FORMATS:
+            raise BracketError(f"알 수 없는 방식입니다: {fmt}")
+        if len(names) < 2:
+            raise BracketError("참가자는 최소 2명이어야 합니다.")
+        if len(names) > MAX_ENTRANTS:
+            raise BracketError(f"참가자는 최대 {MAX_ENTRANTS}명까지 가능합니다.")
+        if len(set(names)) != len(names):
+            raise BracketError("참가자 이름이 중복되었습니다.")
+
+        self.format = fmt
+        self.names = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        # 경기 열(column)들
+        self.team1 = array("i")
+        self.team2 = array("i")
+        self.winner = array("i")
+        self.win_to = array("i")
+        self.lose_to = array("i")
+        self.filled = array("b")
+        self.round_of = array("h")
+
+        # 라운드 이름과 각 라운드의 첫 경기 번호 (경기는 라운드 순서대로 번호가 붙는다)
+        self.round_labels: List[str] = []
+        self.round_starts: List[int] = []
+
+        self.champion: Optional[int] = None
+        self._touched: List[int] = []
+        # 더블 엘리미네이션의 결승 / 결승 리셋 경기 번호 (없으면 -1)
+        self.grand_final = -1
+        self.reset_match = -1
+
+        # 스위스 전용
+        self.swiss_rounds = swiss_rounds
+        self.scores = array("i")
+        self.opponents: List[List[int]] = []
+        self.had_bye = bytearray()
+        self.pending = 0
+
+        if fmt == SINGLE:
+            self._build_single()
+        elif fmt == DOUBLE:
+            self._build_double()
+        else:
+            self._start_swiss()
+
+    # ---- 공통 ----
+    @property
+    def match_count(self) -> int:
+        return len(self.team1)
+
+    def _add_round(self, label: str, size: int) -> int:
+        start = len(self.team1)
+        round_idx = len(self.round_labels)
+        self.round_labels.append(label)
+        self.round_starts.append(start)
+        for _ in range(size):
+            self.team1.append(EMPTY)
+            self.team2.append(EMPTY)
+            self.winner.append(EMPTY)
+            self.win_to.append(-1)
+            self.lose_to.append(-1)
+            self.filled.append(0)
+            self.round_of.append(round_idx)
+        return start
+
+    def round_matches(self, round_idx: int) -> range:
+        start = self.round_starts[round_idx]
+        end = self.round_starts[round_idx + 1] if round_idx + 1 < len(self.round_starts) else self.match_count
+        return range(start, end)
+
+    def name_of(self, team: int) -> Optional[str]:
+        if team >= 0:
+            return self.names[team]
+        return None
+
+    def _place(self, target: int, team: int):
+        m, slot = divmod(target, 2)
+        if slot == 0:
+            self.team1[m] = team
+        else:
+            self.team2[m] = team
+        self.filled[m] += 1
+        self._touched.append(m)
+        if self.filled[m] == 2:
+            self._auto_resolve(m)
+
+    def _auto_resolve(self, m: int):
+        a, b = self.team1[m], self.team2[m]
+        if a == BYE and b == BYE:
+            self._advance(m, BYE, BYE)
+        elif b == BYE:
+            self._advance(m, a, BYE)
+        elif a == BYE:
+            self._advance(m, b, BYE)
+
+    def _advance(self, m: int, win: int, lose: int):
+        self.winner[m] = win
+        self._touched.append(m)
+        if self.format == SWISS:
+            self._swiss_result(win)
+            return
+        if m == self.grand_final:
+            if win == self.team2[m] and lose >= 0:
+                # 패자조 쪽이 이겼으면 리셋 경기에서 다시 만난다 (자리는 결승과 같게)
+                self._place(self.reset_match * 2, lose)
+                self._place(self.reset_match * 2 + 1, win)
+            else:
+                self.champion = win
+                # 열리지 않는 리셋 경기도 화면에서 갱신되도록
+                self._touched.append(self.reset_match)
+            return
+        if self.win_to[m] >= 0:
+            self._place(self.win_to[m], win)
+        elif win >= 0:
+            self.champion = win
+        if self.lose_to[m] >= 0:
+            self._place(self.lose_to[m], lose)
+
+    def _seed_first_round(self, start: int, size: int):
+        # 모든 경기의 첫 자리를 먼저 채우고 남은 인원을 두 번째 자리에 배치한다.
+        # 부전승끼리 만나는 경기가 생기지 않는다.
+        n = len(self.names)
+        for i in range(size):
+            self._place((start + i) * 2, i)
+        for i in range(size):
+            j = size + i
+            self._place((start + i) * 2 + 1, j if j < n else BYE)
+
+    # ---- 싱글 엘리미네이션 ----
+    def _build_single(self):
+        size = _next_pow2(len(self.names))
+        rounds = size.bit_length() - 1
+        starts = []
+        for r in range(rounds):
+            starts.append(self._add_round(f"{r + 1} 라운드", size >> (r + 1)))
+        for r in range(rounds - 1):
+            for i in range(size >> (r + 1)):
+                self.win_to[starts[r] + i] = (starts[r + 1] + i // 2) * 2 + i % 2
+        self._seed_first_round(starts[0], size >> 1)
+        self._touched = []
+
+    # ---- 더블 엘리미네이션 ----
+    def _build_double(self):
+        size = _next_pow2(len(self.names))
+        k = size.bit_length() - 1
+
+        wb = [self._add_round(f"승자조 {r + 1} 라운드", size >> (r + 1)) for r in range(k)]
+        lb = []
+        for t in range(1, k):
+            lb.append(self._add_round(f"패자조 {2 * t - 1} 라운드", size >> (t + 1)))
+            lb.append(self._add_round(f"패자조 {2 * t} 라운드", size >> (t + 1)))
+        gf = self._add_round("결승", 1)
+        self.grand_final = gf
+        self.reset_match = self._add_round("결승 리셋", 1)
+
+        # 승자조 트리
+        for r in range(k - 1):
+            for i in range(size >> (r + 1)):
+                self.win_to[wb[r] + i] = (wb[r + 1] + i // 2) * 2 + i % 2
+        self.win_to[wb[k - 1]] = gf * 2
+
+        if not lb:
+            # 2명이면 패자조 없이 결승에서 다시 만난다
+            self.lose_to[wb[0]] = gf * 2 + 1
+        else:
+            # 승자조 1라운드 패자 -> 패자조 1라운드
+            for i in range(size >> 1):
+                self.lose_to[wb[0] + i] = (lb[0] + i // 2) * 2 + i % 2
+            for t in range(1, k):
+                odd, even = lb[2 * t - 2], lb[2 * t - 1]
+                count = size >> (t + 1)
+                for i in range(count):
+                    # 홀수 라운드 승자 -> 짝수 라운드 첫 자리
+                    self.win_to[odd + i] = (even + i) * 2
+                    # 승자조 t+1 라운드 패자 -> 짝수 라운드 두 번째 자리 (재대결을 줄이려고 역순)
+                    self.lose_to[wb[t] + i] = (even + count - 1 - i) * 2 + 1
+                    # 짝수 라운드 승자 -> 다음 홀수 라운드 또는 결승
+                    if t < k - 1:
+                        self.win_to[even + i] = (lb[2 * t] + i // 2) * 2 + i % 2
+                    else:
+                        self.win_to[even + i] = gf * 2 + 1
+
+        self._seed_first_round(wb[0], size >> 1)
+        self._touched = []
+
+    # ---- 스위스 ----
+    def _start_swiss(self):
+        n = len(self.names)
+        if not self.swiss_rounds:
+            self.swiss_rounds = max(1, (n - 1).bit_length())
+        self.scores = array("i", [0]) * n
+        self.opponents = [[] for _ in range(n)]
+        self.had_bye = bytearray(n)
+        self._pair_swiss()
+        self._touched = []
+
+    def _pair_swiss(self):
+        n = len(self.names)
+        round_no = len(self.round_labels) + 1
+        order = sorted(range(n), key=lambda i: (-self.scores[i], i))
+
+        bye_player = -1
+        if n % 2:
+            # 아직 부전승을 받지 않은 가장 낮은 순위에게 부전승
+            for i in reversed(order):
+                if not self.had_bye[i]:
+                    bye_player = i
+                    break
+            if bye_player < 0:
+                bye_player = order[-1]
+            order.remove(bye_player)
+
+        pairs = []
+        used = bytearray(n)
+        for idx, p in enumerate(order):
+            if used[p]:
+                continue
+            used[p] = 1
+            partner = -1
+            played = set(self.opponents[p])
+            for q in order[idx + 1:]:
+                if not used[q] and q not in played:
+                    partner = q
+                    break
+            if partner < 0:
+                for q in order[idx + 1:]:
+                    if not used[q]:
+                        partner = q
+                        break
+            used[partner] = 1
+            pairs.append((p, partner))
+        if bye_player >= 0:
+            pairs.append((bye_player, BYE))
+
+        start = self._add_round(f"스위스 {round_no} 라운드", len(pairs))
+        self.pending = len(pairs)
+        for i, (a, b) in enumerate(pairs):
+            m = start + i
+            self.team1[m] = a
+            self.team2[m] = b
+            self.filled[m] = 2
+            self._touched.append(m)
+            if b >= 0:
+                self.opponents[a].append(b)
+                self.opponents[b].append(a)
+        for i, (a, b) in enumerate(pairs):
+            if b == BYE:
+                self.had_bye[a] = 1
+                self._advance(start + i, a, BYE)
+
+    def _swiss_result(self, win: int):
+        if win >= 0:
+            self.scores[win] += 1
+        self.pending -= 1
+        if self.pending:
+            return
+        if len(self.round_labels) < self.swiss_rounds:
+            self._pair_swiss()
+            return
+        # 동점이면 상대 점수 합(부흐홀츠)으로 결정
+        best = max(
+            range(len(self.names)),
+            key=lambda i: (self.scores[i], sum(self.scores[o] for o in self.opponents[i]), -i)
+        )
+        self.champion = best
+
+    # ---- 결과 기록 ----
+    def record(self, match_id: int, winner_name: str) -> List[int]:
+        # match_id는 화면에 보이는 1부터 시작하는 번호. 이번 기록으로 바뀐 경기 번호(0부터)를 돌려준다.
+        m = match_id - 1
+        if m < 0 or m >= self.match_count:
+            raise BracketError("해당 경기 ID를 찾을 수 없습니다.")
+        if self.winner[m] != EMPTY:
+            raise BracketError("이미 승자가 기록된 경기입니다.")
+        if self.filled[m] < 2:
+            raise BracketError("아직 대진이 확정되지 않은 경기입니다.")
+        a, b = self.team1[m], self.team2[m]
+        win = self.index.get(winner_name, EMPTY)
+        if win not in (a, b) or win < 0:
+            raise BracketError(f"승자는 `{self.name_of(a)}` 또는 `{self.name_of(b)}` 이어야 합니다.")
+        lose = b if win == a else a
+        self._touched = []
+        self._advance(m, win, lose)
+        touched, self._touched = self._touched, []
+        return touched
+
+    # ---- 저장 ----
+    def to_dict(self) -> dict:
+        return {
+            "format": self.format,
+            "names": self.names,
+            "team1": self.team1.tolist(),
+            "team2": self.team2.tolist(),
+            "winner": self.winner.tolist(),
+            "win_to": self.win_to.tolist(),
+            "lose_to": self.lose_to.tolist(),
+            "filled": self.filled.tolist(),
+            "round_of": self.round_of.tolist(),
+            "round_labels": self.round_labels,
+            "round_starts": self.round_starts,
+            "champion": self.champion,
+            "grand_final": self.grand_final,
+            "reset_match": self.reset_match,
+            "swiss_rounds": self.swiss_rounds,
+            "scores": self.scores.tolist(),
+            "opponents": self.opponents,
+            "had_bye": list(self.had_bye),
+            "pending": self.pending,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Bracket":
+        self = cls.__new__(cls)
+        self.format = data["format"]
+        self.names = data["names"]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        for key, code in (("team1", "i"), ("team2", "i"), ("winner", "i"), ("win_to", "i"),
+                          ("lose_to", "i"), ("filled", "b"), ("round_of", "h"), ("scores", "i")):
+            setattr(self, key, array(code, data[key]))
+        self.round_labels = data["round_labels"]
+        self.round_starts = data["round_starts"]
+        self.champion = data["champion"]
+        self.grand_final = data["grand_final"]
+        self.reset_match = data["reset_match"]
+        self.swiss_rounds = data["swiss_rounds"]
+        self.opponents = data["opponents"]
+        self.had_bye = bytearray(data["had_bye"])
+        self.pending = data["pending"]
+        self._touched = []
+        return self
@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional, Tuple
+
+from bracket import BYE, Bracket
+from paging import EMBED_TOTAL_LIMIT, FIELDS_PER_EMBED, chunk_lines
+
+
+# 대진표 임베드 렌더 캐시.
+# 경기 한 줄 텍스트와 라운드별 필드 덩어리를 캐시해 두고,
+# 결과 기록으로 바뀐 경기(Bracket.record 반환값)의 줄과 그 라운드만 다시 만든다.
+# 라운드가 필드 제한(1024자)을 넘으면 여러 필드로, 임베드 제한을 넘으면 여러 페이지로 나눈다.
+# 덩어리마다 담긴 경기들을 기억해 두어 한 라운드가 여러 페이지에 걸쳐도 경기가 실린 페이지를 찾는다.
+
+PAGE_RESERVE = 500            # 제목 / 설명 / 푸터 / 우승 필드 자리
+PAGE_FIELDS = FIELDS_PER_EMBED - 2
+
+Field = Tuple[str, str]
+
+
+def _label(b: Bracket, team: int) -> str:
+    if team >= 0:
+        return b.names[team]
+    return "(부전승)" if team == BYE else "(대기)"
+
+
+def format_match_line(b: Bracket, m: int) -> str:
+    status = "❔"
+    if b.winner[m] >= 0:
+        status = f"✅ ({b.names[b.winner[m]]})"
+    return f"#{m + 1}: {_label(b, b.team1[m])} vs {_label(b, b.team2[m])} {status}"
+
+
+class BracketView:
+    def __init__(self, bracket: Bracket):
+        self.bracket = bracket
+        self._lines: Dict[int, str] = {}
+        self._chunks: Dict[int, List[str]] = {}
+        self._chunk_matches: Dict[int, List[List[int]]] = {}
+        self._pages: Optional[List[List[Field]]] = None
+        self._round_page: Dict[int, int] = {}
+        self._match_page: Dict[int, int] = {}
+
+    def invalidate(self, matches: List[int]):
+        round_of = self.bracket.round_of
+        for m in matches:
+            self._lines.pop(m, None)
+            self._chunks.pop(round_of[m], None)
+            self._chunk_matches.pop(round_of[m], None)
+        if matches:
+            self._pages = None
+
+    def _line(self, m: int) -> Optional[str]:
+        b = self.bracket
+        # 부전승끼리의 빈 경기와 열리지 않은 결승 리셋은 표시하지 않는다
+        if b.team1[m] == BYE and b.team2[m] == BYE:
+            return None
+        if m == b.reset_match and b.champion is not None and b.filled[m] < 2:
+            return None
+        line = self._lines.get(m)
+        if line is None:
+            line = format_match_line(b, m)
+            self._lines[m] = line
+        return line
+
+    def round_chunks(self, r: int) -> List[str]:
+        chunks = self._chunks.get(r)
+        if chunks is None:
+            shown = [m for m in self.bracket.round_matches(r) if self._line(m) is not None]
+            chunks = chunk_lines(self._lines[m] for m in shown)
+            # 경기 줄은 한 줄씩이고 덩어리는 줄을 나누지 않으므로 줄 수만큼 경기를 차례로 나눠 담는다
+            matches: List[List[int]] = []
+            start = 0
+            for chunk in chunks:
+                end = start + chunk.count("\n") + 1
+                matches.append(shown[start:end])
+                start = end
+            self._chunks[r] = chunks
+            self._chunk_matches[r] = matches
+        return chunks
+
+    def pages(self) -> List[List[Field]]:
+        if self._pages is not None:
+            return self._pages
+        pages: List[List[Field]] = [[]]
+        used = 0
+        self._round_page = {}
+        self._match_page = {}
+        for r, label in enumerate(self.bracket.round_labels):
+            chunks = self.round_chunks(r)
+            matches = self._chunk_matches[r]
+            for i, chunk in enumerate(chunks):
+                name = label if len(chunks) == 1 else f"{label} ({i + 1}/{len(chunks)})"
+                size = len(name) + len(chunk)
+                page = pages[-1]
+                if page and (len(page) >= PAGE_FIELDS or used + size > EMBED_TOTAL_LIMIT - PAGE_RESERVE):
+                    pages.append([])
+                    used = 0
+                self._round_page.setdefault(r, len(pages) - 1)
+                for m in matches[i]:
+                    self._match_page[m] = len(pages) - 1
+                pages[-1].append((name, chunk))
+                used += size
+        self._pages = pages
+        return pages
+
+    def page_of_match(self, m: int) -> int:
+        # 표시되지 않는 경기(부전승끼리 / 열리지 않은 리셋)는 그 라운드의 첫 페이지
+        self.pages()
+        page = self._match_page.get(m)
+        if page is None:
+            page = self._round_page.get(self.bracket.round_of[m], 0)
+        return page
@@ -0,0 +1,101 @@
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import aiohttp
+import discord
+
+
+# 여러 REST 호출(채널 생성, 멤버 이동 등)을 동시에 실행하는 실행기.
+# 전체 동시 실행 수와 라우트별 동시 실행 수를 함께 제한하고,
+# 일시적인 실패(5xx, 429, 네트워크 오류)는 지수 백오프로 재시도한다.
+# 실제 429 대기는 discord.py가 버킷 단위로 처리하므로 여기서는 같은 버킷에 몰리지 않게만 한다.
+
+Call = Tuple[Hashable, Callable[[], Awaitable[Any]]]
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, discord.HTTPException):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError))
+
+
+class BulkResult:
+    def __init__(self, results: List[Any]):
+        self.results = results
+
+    @property
+    def ok(self) -> List[Any]:
+        return [r for r in self.results if not isinstance(r, BaseException)]
+
+    @property
+    def failed(self) -> List[BaseException]:
+        return [r for r in self.results if isinstance(r, BaseException)]
+
+
+class BulkExecutor:
+    def __init__(
+        self,
+        concurrency: int = 8,
+        per_route: int = 3,
+        retries: int = 3,
+        base_delay: float = 0.5,
+    ):
+        self.concurrency = concurrency
+        self.per_route = per_route
+        self.retries = retries
+        self.base_delay = base_delay
+
+    async def _call(
+        self,
+        route: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        limit: asyncio.Semaphore,
+        routes: Dict[Hashable, asyncio.Semaphore],
+    ) -> Any:
+        route_limit = routes.setdefault(route, asyncio.Semaphore(self.per_route))
+        attempt = 0
+        while True:
+            # 라우트 자리를 먼저 잡는다 (같은 라우트에서 기다리는 호출이 전체 자리를 차지하지 않게)
+            async with route_limit, limit:
+                try:
+                    return await factory()
+                except Exception as e:
+                    if attempt >= self.retries or not is_transient(e):
+                        return e
+            attempt += 1
+            await asyncio.sleep(self.base_delay * (2 ** (attempt - 1)) * (1 + random.random()))
+
+    async def run(
+        self,
+        calls: List[Call],
+        progress: Optional[ProgressCallback] = None,
+        progress_interval: float = 1.5,
+    ) -> BulkResult:
+        limit = asyncio.Semaphore(self.concurrency)
+        routes: Dict[Hashable, asyncio.Semaphore] = {}
+        done = 0
+        total = len(calls)
+
+        async def tracked(route, factory):
+            nonlocal done
+            result = await self._call(route, factory, limit, routes)
+            done += 1
+            return result
+
+        async def reporter():
+            while True:
+                await asyncio.sleep(progress_interval)
+                try:
+                    await progress(done, total)
+                except Exception as e:
+                    print("BULK PROGRESS ERROR:", e)
+
+        report_task = asyncio.create_task(reporter()) if progress is not None else None
+        try:
+            results = await asyncio.gather(*(tracked(route, factory) for route, factory in calls))
+        finally:
+            if report_task is not None:
+                report_task.cancel()
+        return BulkResult(list(results))
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+import discord
+
+
+# 느린 커맨드의 3초 응답 기한 보호.
+# 커맨드 extras의 "defer" 값으로 결과 공개 여부("public" / "ephemeral")를 미리 밝힌 커맨드만 감시한다.
+# 커맨드가 시작되면 인터랙션의 response를 DeferringResponse로 바꾸고 감시 태스크를 띄운다.
+# budget초(인터랙션 생성 시각 기준) 안에 첫 응답이 없으면 감시 태스크가 그 공개 여부로 defer(thinking)하고,
+# 이후 핸들러의 response.send_message는 followup으로 보내진다. (핸들러 코드는 그대로)
+# 디스코드는 defer 뒤 첫 followup에 defer의 공개 여부를 쓰므로, 핸들러가 다른 공개 여부로 답하면
+# "생각 중" 메시지를 짧은 안내로 바꾼 다음 원래 공개 여부로 followup을 보낸다. (비공개 답이 공개되지 않음)
+# 감시 태스크와 핸들러의 첫 응답은 인터랙션별 락으로 순서를 정하므로 두 번 응답하지 않는다.
+# 모달(send_modal)은 defer 뒤에 보낼 수 없으므로 모달을 여는 커맨드에는 "defer"를 붙이지 않는다.
+
+PUBLIC = "public"
+EPHEMERAL = "ephemeral"
+
+log = logging.getLogger("gamerbot.deferral")
+
+
+class DeferringResponse(discord.InteractionResponse):
+    __slots__ = ("_lock", "deferred", "deferred_ephemeral", "_replaced")
+
+    def __init__(self, parent: discord.Interaction):
+        super().__init__(parent)
+        self._lock = asyncio.Lock()
+        self.deferred = False
+        self.deferred_ephemeral = False
+        self._replaced = False
+
+    async def defer_late(self, ephemeral: bool) -> bool:
+        # 아직 응답하지 않았으면 defer하고 True
+        async with self._lock:
+            if self.is_done():
+                return False
+            await super().defer(ephemeral=ephemeral, thinking=True)
+            self.deferred = True
+            self.deferred_ephemeral = ephemeral
+            return True
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        async with self._lock:
+            if self.deferred:
+                return  # 이미 감시 태스크가 defer함
+            await super().defer(ephemeral=ephemeral, thinking=thinking)
+
+    async def send_message(self, content: Optional[Any] = None, **kwargs: Any) -> None:
+        async with self._lock:
+            if not self.deferred:
+                return await super().send_message(content, **kwargs)
+        await self._followup(content, kwargs)
+
+    async def _followup(self, content: Optional[Any], kwargs: Dict[str, Any]):
+        parent = self._parent
+        delete_after = kwargs.pop("delete_after", None)
+        if not self._replaced and bool(kwargs.get("ephemeral")) != self.deferred_ephemeral:
+            # 첫 followup이 "생각 중" 메시지를 대신하면 defer의 공개 여부를 따르게 되므로
+            # 그 메시지를 먼저 안내로 바꿔 두고 답은 새 followup으로 보낸다
+            self._replaced = True
+            await parent.edit_original_response(content="✅ 처리 완료")
+        if content is not None:
+            kwargs["content"] = content
+        message = await parent.followup.send(wait=True, **kwargs)
+        self._replaced = True
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+
+
+def defer_mode(interaction: discord.Interaction) -> Optional[str]:
+    command = interaction.command
+    if command is None:
+        return None
+    mode = command.extras.get("defer")
+    return mode if mode in (PUBLIC, EPHEMERAL) else None
+
+
+class DeferWatchdog:
+    def __init__(
+        self,
+        budget: float = 2.0,
+        on_defer: Optional[Callable[[discord.Interaction], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.budget = budget
+        self.on_defer = on_defer
+        self.clock = clock
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self.deferred = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def watch(self, interaction: discord.Interaction) -> Optional[DeferringResponse]:
+        mode = defer_mode(interaction)
+        if mode is None:
+            return None  # 결과 공개 여부를 모르는 커맨드는 자동으로 defer하지 않는다
+        response = DeferringResponse(interaction)
+        interaction._cs_response = response  # type: ignore
+        # 게이트웨이 지연만큼 이미 지난 시간은 빼고 기다린다
+        age = self.clock() - interaction.created_at.timestamp()
+        delay = max(0.0, min(self.budget, self.budget - age))
+        self._tasks[interaction.id] = asyncio.create_task(
+            self._run(interaction, response, delay, mode == EPHEMERAL)
+        )
+        return response
+
+    def done(self, interaction: discord.Interaction):
+        task = self._tasks.pop(interaction.id, None)
+        if task is not None:
+            task.cancel()
+
+    async def _run(
+        self, interaction: discord.Interaction, response: DeferringResponse, delay: float, ephemeral: bool
+    ):
+        try:
+            await asyncio.sleep(delay)
+            if await response.defer_late(ephemeral):
+                self.deferred += 1
+                if self.on_defer is not None:
+                    self.on_defer(interaction)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("auto defer failed interaction=%d: %r", interaction.id, e)
+        finally:
+            self._tasks.pop(interaction.id, None)
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+# 조회 커맨드(랭킹 등)가 만든 임베드 캐시.
+# 항목은 (길드, 커맨드)마다 하나이고, 만들 때의 데이터 버전을 같이 저장한다.
+# 포인트 / VC 기록이 바뀌면 해당 주제(topic)의 버전만 올리므로 다음 조회에서 다시 만든다.
+# 버전이 그대로여도 ttl초가 지나면 다시 만든다 (멤버 이름 변경, 접속 중 시간 증가 반영).
+# 같은 키로 동시에 들어온 요청은 처음 요청이 만드는 결과를 함께 기다린다.
+# 전체 항목 수는 max_entries로 제한하고 가장 오래 안 쓴 항목부터 버린다.
+
+Key = Tuple[int, str]
+
+
+class EmbedCache:
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._versions: Dict[Tuple[int, Hashable], int] = {}
+        # (길드, 커맨드) -> (버전, 만료 시각, 값)
+        self._entries: "OrderedDict[Key, Tuple[int, float, Any]]" = OrderedDict()
+        self._pending: Dict[Tuple[int, str, int], asyncio.Future] = {}
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, guild_id: int, topic: Hashable) -> int:
+        return self._versions.get((guild_id, topic), 0)
+
+    def invalidate(self, guild_id: int, topic: Hashable):
+        key = (guild_id, topic)
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    async def get(
+        self,
+        guild_id: int,
+        command: str,
+        topic: Hashable,
+        build: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        version = self.version(guild_id, topic)
+        key = (guild_id, command)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version and entry[1] > self.clock():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+        pending_key = (guild_id, command, version)
+        future = self._pending.get(pending_key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[pending_key] = future
+        try:
+            value = await build()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # 기다리는 쪽이 없어도 경고가 남지 않게
+            raise
+        finally:
+            del self._pending[pending_key]
+
+        future.set_result(value)
+        # 만드는 동안 데이터가 바뀌었으면 저장하지 않는다 (결과는 이번 요청들에만 사용)
+        if self.version(guild_id, topic) == version:
+            self._entries[key] = (version, self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
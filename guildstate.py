@@ -0,0 +1,145 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from rankindex import RankIndex
+
+
+# 길드 단위 상태.
+# 멤버별 숫자 데이터(포인트 / VC 누적 시간 / 입장 시각 / VC 지급 포인트)를
+# 멤버 ID -> 행 번호 맵 하나와 컬럼별 array로 저장한다.
+# 예전의 dict[guild][member] 여러 개와 달리 멤버당 해시 조회는 한 번이고 값은 박싱되지 않는다.
+# 각 컬럼은 dict처럼(get / [] / pop / items ...) 쓸 수 있고, 값이 "없음"인 행은 present 플래그로 구분한다.
+# 저장소에서 처음 읽을 때(update)는 새 멤버의 행을 한꺼번에 늘리고 값을 array로 통째로 붙인다.
+# 포인트 순위 인덱스(ranks)도 길드 상태와 함께 (읽는 스레드에서) 만들어 둔다.
+
+
+class Column:
+    __slots__ = ("_owner", "_rows", "_values", "_present", "_default", "_count")
+
+    def __init__(self, owner: "GuildState", typecode: str):
+        self._owner = owner
+        self._rows = owner.rows
+        self._values = array(typecode)
+        self._present = bytearray()
+        self._default = 0.0 if typecode in "fd" else 0
+        self._count = 0
+
+    def _grow(self):
+        self._values.append(self._default)
+        self._present.append(0)
+
+    def _extend(self, count: int):
+        self._values.extend(array(self._values.typecode, [self._default]) * count)
+        self._present.extend(bytes(count))
+
+    def get(self, member_id: int, default: Any = None) -> Any:
+        row = self._rows.get(member_id)
+        if row is None or not self._present[row]:
+            return default
+        return self._values[row]
+
+    def __getitem__(self, member_id: int) -> Any:
+        row = self._rows.get(member_id)
+        if row is None or not self._present[row]:
+            raise KeyError(member_id)
+        return self._values[row]
+
+    def __setitem__(self, member_id: int, value: Any):
+        row = self._rows.get(member_id)
+        if row is None:
+            row = self._owner.row(member_id)
+        self._values[row] = value
+        if not self._present[row]:
+            self._present[row] = 1
+            self._count += 1
+
+    def pop(self, member_id: int, default: Any = None) -> Any:
+        row = self._rows.get(member_id)
+        if row is None or not self._present[row]:
+            return default
+        self._present[row] = 0
+        self._count -= 1
+        value = self._values[row]
+        self._values[row] = self._default
+        return value
+
+    def update(self, values: Dict[int, Any]):
+        rows = self._rows
+        new = [member_id for member_id in values if member_id not in rows]
+        if new and len(new) == len(values):
+            # 전부 새 멤버 (첫 로드): 멤버별 대입 없이 한 번에 붙인다
+            start = self._owner.extend(new)
+            self._values[start:] = array(self._values.typecode, values.values())
+            self._present[start:] = b"\x01" * len(new)
+            self._count += len(new)
+            return
+        if new:
+            self._owner.extend(new)
+        array_ = self._values
+        present = self._present
+        added = 0
+        for member_id, value in values.items():
+            row = rows[member_id]
+            array_[row] = value
+            if not present[row]:
+                present[row] = 1
+                added += 1
+        self._count += added
+
+    def __contains__(self, member_id: object) -> bool:
+        row = self._rows.get(member_id)  # type: ignore
+        return row is not None and bool(self._present[row])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def items(self) -> Iterator[Tuple[int, Any]]:
+        present = self._present
+        values = self._values
+        for member_id, row in self._rows.items():
+            if present[row]:
+                yield member_id, values[row]
+
+    def keys(self) -> List[int]:
+        present = self._present
+        return [member_id for member_id, row in self._rows.items() if present[row]]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.keys())
+
+
+class GuildState:
+    __slots__ = (
+        "guild_id", "rows", "points", "vc_time", "vc_join", "vc_paid", "scheduled_events", "ranks", "_columns"
+    )
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.rows: Dict[int, int] = {}
+        self.points = Column(self, "q")
+        self.vc_time = Column(self, "d")
+        self.vc_join = Column(self, "d")
+        self.vc_paid = Column(self, "q")
+        self.scheduled_events: Dict[int, Dict] = {}
+        self.ranks: Optional[RankIndex] = None
+        self._columns = (self.points, self.vc_time, self.vc_join, self.vc_paid)
+
+    def row(self, member_id: int) -> int:
+        row = self.rows.get(member_id)
+        if row is None:
+            row = len(self.rows)
+            self.rows[member_id] = row
+            for column in self._columns:
+                column._grow()
+        return row
+
+    def extend(self, member_ids: List[int]) -> int:
+        # 아직 행이 없는 멤버들의 행을 한꺼번에 추가하고 첫 행 번호를 돌려준다
+        start = len(self.rows)
+        self.rows.update(zip(member_ids, range(start, start + len(member_ids))))
+        for column in self._columns:
+            column._extend(len(self.rows) - start)
+        return start
+
+    def __len__(self) -> int:
+        return len(self.rows)
@@ -0,0 +1,242 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from metrics import Metric, Registry, _fmt_labels, _fmt_value
+
+
+# 슬래시 커맨드 계측.
+# - 첫 응답까지 걸린 시간과 핸들러 하나가 부른 디스코드 API 횟수를
+#   커맨드별 HDR 방식(로그-선형 버킷) 히스토그램에 기록한다.
+# - 전체 처리 시간은 따로 두지 않고 finish()가 돌려주는 값을
+#   봇의 gamerbot_command_duration_seconds 히스토그램에 기록한다.
+# - API 호출은 discord.py HTTP 세션의 aiohttp TraceConfig로 세며,
+#   어떤 핸들러의 호출인지는 contextvar로 구분한다.
+# - 샘플링 프로파일러는 재시작 없이 켜고 끌 수 있다.
+
+
+class HdrHistogram:
+    # 값을 정수(마이크로초 등)로 받아 옥타브당 2^(SUB_BITS-1)개 버킷으로 나눈다.
+    # SUB_BITS=6이면 상대 오차는 약 3% 이내.
+    SUB_BITS = 6
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        m = 1 << cls.SUB_BITS
+        if value < m:
+            return value
+        e = value.bit_length() - cls.SUB_BITS
+        half = m >> 1
+        return m + (e - 1) * half + ((value >> e) - half)
+
+    @classmethod
+    def _value_at(cls, index: int) -> int:
+        m = 1 << cls.SUB_BITS
+        if index < m:
+            return index
+        half = m >> 1
+        k = index - m
+        e = k // half + 1
+        mantissa = k % half + half
+        low = mantissa << e
+        return low + ((1 << e) >> 1)
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        idx = self._index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> int:
+        return self.percentiles((p,))[0]
+
+    def percentiles(self, ps: Iterable[float]) -> List[int]:
+        # 오름차순 ps를 버킷 한 번 훑어서 구한다 (스크레이프마다 분위수별로 정렬하지 않도록)
+        if not self.count:
+            return [0 for _ in ps]
+        counts = self.counts
+        keys = iter(sorted(counts))
+        result: List[int] = []
+        seen = 0
+        idx = -1
+        for p in ps:
+            target = max(1, int(round(self.count * p / 100.0)))
+            while seen < target:
+                idx = next(keys, None)
+                if idx is None:
+                    break
+                seen += counts[idx]
+            if idx is None or seen < target:
+                result.append(self.max)
+            else:
+                result.append(min(self._value_at(idx), self.max))
+        return result
+
+
+class HandlerStats:
+    __slots__ = ("first_response", "api_calls")
+
+    def __init__(self):
+        self.first_response = HdrHistogram()  # 마이크로초
+        self.api_calls = HdrHistogram()       # 호출 수
+
+
+class _Call:
+    __slots__ = ("started", "first_response", "api_calls")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_response: Optional[float] = None
+        self.api_calls = 0
+
+
+_current: contextvars.ContextVar[Optional[_Call]] = contextvars.ContextVar("gamerbot_call", default=None)
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class HdrSummary(Metric):
+    kind = "summary"
+
+    def __init__(self, name: str, help: str, stats: Dict[str, HandlerStats], field: str, scale: float):
+        super().__init__(name, help, ("command",))
+        self.stats = stats
+        self.field = field
+        self.scale = scale
+
+    def samples(self) -> Iterable[str]:
+        for command, stats in list(self.stats.items()):
+            hist: HdrHistogram = getattr(stats, self.field)
+            if not hist.count:
+                continue
+            labels = (command,)
+            values = hist.percentiles([q * 100 for q in QUANTILES])
+            for q, value in zip(QUANTILES, values):
+                extra = f'quantile="{q}"'
+                yield f"{self.name}{_fmt_labels(self.labelnames, labels, extra)} {_fmt_value(value * self.scale)}"
+            yield f"{self.name}_sum{_fmt_labels(self.labelnames, labels)} {_fmt_value(hist.total * self.scale)}"
+            yield f"{self.name}_count{_fmt_labels(self.labelnames, labels)} {hist.count}"
+
+
+class Instrumentation:
+    def __init__(self):
+        self.commands: Dict[str, HandlerStats] = {}
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_request_end.append(self._on_request_end)
+
+    def register(self, registry: Registry):
+        registry.register(HdrSummary(
+            "gamerbot_command_first_response_seconds", "첫 응답(인터랙션 콜백)까지 걸린 시간",
+            self.commands, "first_response", 1e-6
+        ))
+        registry.register(HdrSummary(
+            "gamerbot_command_api_calls", "핸들러당 디스코드 API 호출 수",
+            self.commands, "api_calls", 1
+        ))
+
+    def begin(self, interaction) -> None:
+        call = _Call()
+        interaction.extras["instr"] = call
+        _current.set(call)
+
+    def finish(self, interaction, command: str) -> Optional[float]:
+        # 핸들러 전체 처리 시간(초)을 돌려준다
+        call: Optional[_Call] = interaction.extras.pop("instr", None)
+        if call is None:
+            return None
+        now = time.perf_counter()
+        stats = self.commands.get(command)
+        if stats is None:
+            stats = HandlerStats()
+            self.commands[command] = stats
+        if call.first_response is not None:
+            stats.first_response.record(int((call.first_response - call.started) * 1e6))
+        stats.api_calls.record(call.api_calls)
+        return now - call.started
+
+    async def _on_request_start(self, session, trace_ctx, params):
+        call = _current.get()
+        if call is not None:
+            call.api_calls += 1
+
+    async def _on_request_end(self, session, trace_ctx, params):
+        call = _current.get()
+        if call is not None and call.first_response is None and params.url.path.endswith("/callback"):
+            call.first_response = time.perf_counter()
+
+
+class SamplingProfiler:
+    # 별도 스레드에서 대상 스레드(이벤트 루프)의 스택을 주기적으로 찍어
+    # "루트;...;리프" 형태의 collapsed stack 개수로 모은다 (flamegraph.pl 입력 형식).
+    def __init__(self, interval: float = 0.005, max_depth: int = 48):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, thread_id: Optional[int] = None):
+        if self.running:
+            return
+        self._target = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks = {}
+        self.samples = 0
+        self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gamerbot-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            parts: List[str] = []
+            while frame is not None and len(parts) < self.max_depth:
+                code = frame.f_code
+                parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            key = ";".join(reversed(parts))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        items = sorted(list(self.stacks.items()), key=lambda x: x[1], reverse=True)
+        return "\n".join(f"{stack} {count}" for stack, count in items)
+
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, int]]:
+        # 리프(실제로 실행 중이던) 함수 기준 집계
+        leaves: Dict[str, int] = {}
+        for stack, count in list(self.stacks.items()):
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        return sorted(leaves.items(), key=lambda x: x[1], reverse=True)[:limit]
@@ -1,18 +1,50 @@
+import json
 import os
-from flask import Flask
-from threading import Thread
+from typing import Awaitable, Callable, Optional
 
-app = Flask(__name__)
+from aiohttp import web
 
-@app.route("/")
-def home():
-    return "GamerToolBot is alive!"
 
-def run():
-    port = int(os.environ.get("PORT", 10000))
-    app.run(host="0.0.0.0", port=port)
+# 봇 이벤트 루프 위에서 도는 헬스 체크 / 메트릭 서버.
+# Render가 포트로 생존 여부를 확인하므로 "/" 응답은 그대로 유지한다.
+# /metrics 본문은 루프를 나눠 쓰는 비동기 렌더러(Registry.render_async)로 만든다.
 
-def keep_alive():
-    t = Thread(target=run)
-    t.daemon = True
-    t.start()
+
+class HealthServer:
+    def __init__(
+        self,
+        is_healthy: Callable[[], dict],
+        render_metrics: Callable[[], Awaitable[str]],
+        port: Optional[int] = None,
+    ):
+        self.is_healthy = is_healthy
+        self.render_metrics = render_metrics
+        self.port = port if port is not None else int(os.environ.get("PORT", 10000))
+        self._runner: Optional[web.AppRunner] = None
+
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="GamerToolBot is alive!")
+
+    async def healthz(self, request: web.Request) -> web.Response:
+        status = self.is_healthy()
+        code = 200 if status.get("ok") else 503
+        return web.Response(text=json.dumps(status), status=code, content_type="application/json")
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=await self.render_metrics(), content_type="text/plain")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/", self.home)
+        app.router.add_get("/healthz", self.healthz)
+        app.router.add_get("/metrics", self.metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "0.0.0.0", self.port)
+        await site.start()
+        print(f"✅ 헬스 체크 서버 시작 (port {self.port})")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+from shards import split_ranges
+
+
+# 멀티 프로세스 샤드 런처.
+# SHARD_COUNT 개의 샤드를 SHARD_PROCESSES 개 프로세스에 연속 구간으로 나눠
+# 각 프로세스에서 bot.py를 SHARD_IDS 환경 변수와 함께 실행한다.
+# 비정상 종료된 프로세스는 잠시 후 같은 샤드 구간으로 다시 띄운다.
+# (재시작은 프로세스마다 마감 시각을 두고 감시 루프에서 처리 — 기다리는 동안에도 다른 프로세스를 계속 감시)
+# 모든 프로세스는 같은 DB_PATH(WAL) 파일을 쓴다. 샤드 구성(SHARD_COUNT / SHARD_PROCESSES)이 바뀌어도
+# 데이터 위치는 그대로이고, 각 프로세스는 자기 샤드의 길드 행만 읽고 쓴다.
+# (기록은 프로세스마다 flush 주기당 한 트랜잭션이라 짧고, 겹치면 busy_timeout 동안 기다린다)
+
+DISCORD_TOKEN = os.getenv("DISCORD_TOKEN", "")
+SHARD_COUNT_RAW = os.getenv("SHARD_COUNT", "auto")
+SHARD_PROCESSES = int(os.getenv("SHARD_PROCESSES", str(os.cpu_count() or 1)))
+RESTART_DELAY = 5.0
+BOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+
+
+async def recommended_shards(token: str) -> int:
+    headers = {"Authorization": f"Bot {token}"}
+    async with aiohttp.ClientSession() as session:
+        async with session.get("https://discord.com/api/v10/gateway/bot", headers=headers) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return int(data["shards"])
+
+
+def spawn(shard_ids, shard_count: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["SHARD_COUNT"] = str(shard_count)
+    env["SHARD_IDS"] = f"{shard_ids[0]}-{shard_ids[-1]}"
+    print(f"🚀 샤드 {env['SHARD_IDS']} / {shard_count} 프로세스 시작")
+    return subprocess.Popen([sys.executable, BOT_PATH], env=env)
+
+
+class Supervisor:
+    def __init__(
+        self,
+        ranges: List[List[int]],
+        start: Callable[[List[int]], subprocess.Popen],
+        delay: float = RESTART_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ranges = ranges
+        self.start = start
+        self.delay = delay
+        self.clock = clock
+        self.procs: List[Optional[subprocess.Popen]] = [start(r) for r in ranges]
+        # 프로세스 번호 -> 재시작 시각
+        self.restart_at: Dict[int, float] = {}
+
+    def tick(self):
+        now = self.clock()
+        for i, proc in enumerate(self.procs):
+            if proc is None:
+                if self.restart_at[i] <= now:
+                    del self.restart_at[i]
+                    self.procs[i] = self.start(self.ranges[i])
+                continue
+            code = proc.poll()
+            if code is None:
+                continue
+            r = self.ranges[i]
+            print(f"⚠️ 샤드 {r[0]}-{r[-1]} 프로세스 종료 (code={code}), {self.delay:.0f}초 뒤 재시작")
+            self.procs[i] = None
+            self.restart_at[i] = now + self.delay
+
+    def stop(self):
+        running = [proc for proc in self.procs if proc is not None]
+        for proc in running:
+            proc.terminate()
+        for proc in running:
+            proc.wait()
+
+
+def main():
+    if not DISCORD_TOKEN:
+        print("❌ DISCORD_TOKEN 환경 변수가 설정되지 않았습니다.")
+        raise SystemExit(1)
+
+    if SHARD_COUNT_RAW == "auto":
+        shard_count = asyncio.run(recommended_shards(DISCORD_TOKEN))
+    else:
+        shard_count = int(SHARD_COUNT_RAW)
+
+    ranges = split_ranges(shard_count, SHARD_PROCESSES)
+    supervisor = Supervisor(ranges, lambda r: spawn(r, shard_count))
+
+    try:
+        while True:
+            time.sleep(1)
+            supervisor.tick()
+    except KeyboardInterrupt:
+        supervisor.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from guildstate import GuildState
+from storage import Storage
+
+
+# 포인트 원장.
+# 모든 포인트 변동은 (길드, 유저, 증감, 사유, 멱등 키, 시각) 한 줄로 추가 전용 로그에 남고,
+# 유저별 합계는 메모리에서 바로 갱신한다. 여러 명에게 주는 지급도 한 번의 apply로 처리되어
+# 저장소의 다음 flush 트랜잭션 하나로 기록된다.
+# 같은 멱등 키(인터랙션 ID 등)로 다시 들어온 요청은 처음 결과를 그대로 돌려준다.
+# 최근 키는 메모리에서, 재시작 전에 기록된 키는 로그의 idem_key 인덱스로 확인한다.
+
+IDEMPOTENCY_KEEP = 10000
+
+Grant = Tuple[int, int]          # (user_id, amount)
+Applied = List[Tuple[int, int]]  # (user_id, 새 합계)
+
+
+class PointsLedger:
+    def __init__(
+        self,
+        storage: Storage,
+        states: Dict[int, GuildState],
+        on_totals: Optional[Callable[[int, Applied], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.storage = storage
+        self.states = states
+        self.on_totals = on_totals
+        self.clock = clock
+        self._seen: "OrderedDict[str, Applied]" = OrderedDict()
+
+    def apply(
+        self,
+        guild_id: int,
+        grants: Iterable[Grant],
+        reason: str = "",
+        key: Optional[str] = None,
+    ) -> Applied:
+        if key is not None:
+            done = self._seen.get(key)
+            if done is None:
+                done = self._logged(guild_id, key)
+            if done is not None:
+                return done
+
+        guild_totals = self.states[guild_id].points
+        now = self.clock()
+        applied: Applied = []
+        rows = []
+        for user_id, amount in grants:
+            total = guild_totals.get(user_id, 0) + amount
+            guild_totals[user_id] = total
+            applied.append((user_id, total))
+            rows.append((guild_id, user_id, amount, reason, key, now))
+        # 합계 / 로그 모두 다음 flush의 한 트랜잭션으로 기록된다
+        self.storage.put_many("points", (((guild_id, uid), total) for uid, total in applied))
+        self.storage.append("points_log", rows)
+        if self.on_totals is not None:
+            self.on_totals(guild_id, applied)
+
+        if key is not None:
+            self._remember(key, applied)
+        return applied
+
+    def _logged(self, guild_id: int, key: str) -> Optional[Applied]:
+        rows = self.storage.log_members("points_log", key)
+        if not rows:
+            return None
+        # 당시 합계는 남아 있지 않으므로 현재 합계를 돌려준다
+        totals = self.states[guild_id].points
+        done = [(user_id, totals.get(user_id, 0)) for gid, user_id in rows if gid == guild_id]
+        self._remember(key, done)
+        return done
+
+    def _remember(self, key: str, applied: Applied):
+        self._seen[key] = applied
+        if len(self._seen) > IDEMPOTENCY_KEEP:
+            self._seen.popitem(last=False)
+
+    def grant(self, guild_id: int, user_id: int, amount: int, reason: str = "", key: Optional[str] = None) -> int:
+        return self.apply(guild_id, ((user_id, amount),), reason, key)[0][1]
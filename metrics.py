@@ -0,0 +1,202 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Prometheus 텍스트 포맷 메트릭.
+# 외부 라이브러리 없이 카운터 / 게이지 / 히스토그램만 최소한으로 구현한다.
+# 모든 갱신은 이벤트 루프 스레드에서만 일어나므로 락이 없다.
+# /metrics는 render_async()로 RENDER_SLICE초마다 루프를 양보하며 만든다 (큰 레지스트리도 한 번에 오래 막지 않음).
+# 양보하는 사이에 값이 바뀔 수 있으므로 시리즈는 복사본으로 출력한다 (시리즈 하나 안에서는 일관됨).
+
+Labels = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RENDER_SLICE = 0.00025
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[str]:
+        return ()
+
+    def lines(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+    def render(self) -> List[str]:
+        return list(self.lines())
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self.values.items()):
+            yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_value(value)}"
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        fn: Optional[Callable[[], Dict[Labels, float]]] = None,
+    ):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[Labels, float] = {}
+        self.fn = fn
+
+    def set(self, value: float, labels: Labels = ()):
+        self.values[labels] = value
+
+    def samples(self) -> Iterable[str]:
+        # fn이 있으면 스크레이프 시점에 값을 계산한다
+        values = self.fn() if self.fn is not None else self.values
+        for labels, value in list(values.items()):
+            yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_value(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self.series: Dict[Labels, List[float]] = {}
+        self._le = [f'le="{_fmt_value(bound)}"' for bound in self.buckets] + ['le="+Inf"']
+
+    def observe(self, value: float, labels: Labels = ()):
+        # [버킷별 개수..., 합계, 전체 개수]
+        series = self.series.get(labels)
+        if series is None:
+            series = [0.0] * (len(self.buckets) + 2)
+            self.series[labels] = series
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self) -> Iterable[str]:
+        name = self.name
+        for labels, series in list(self.series.items()):
+            series = list(series)
+            # 라벨 문자열은 시리즈마다 한 번만 만든다
+            plain = _fmt_labels(self.labelnames, labels)
+            prefix = plain[:-1] + "," if plain else "{"
+            lines = []
+            cumulative = 0
+            for le, count in zip(self._le, series[:len(self.buckets)]):
+                cumulative += int(count)
+                lines.append(f"{name}_bucket{prefix}{le}}} {cumulative}")
+            lines.append(f"{name}_bucket{prefix}{self._le[-1]}}} {int(series[-1])}")
+            lines.append(f"{name}_sum{plain} {_fmt_value(series[-2])}")
+            lines.append(f"{name}_count{plain} {int(series[-1])}")
+            # 시리즈 하나를 한 덩어리로 (render_async는 덩어리 사이에서만 양보)
+            yield "\n".join(lines)
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))  # type: ignore
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (), fn=None) -> Gauge:
+        return self.register(Gauge(name, help, labelnames, fn))  # type: ignore
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))  # type: ignore
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+    async def render_async(self, slice_seconds: float = RENDER_SLICE) -> str:
+        lines: List[str] = []
+        clock = time.perf_counter
+        deadline = clock() + slice_seconds
+        for metric in list(self.metrics.values()):
+            for line in metric.lines():
+                lines.append(line)
+                if clock() >= deadline:
+                    await asyncio.sleep(0)
+                    deadline = clock() + slice_seconds
+        return "\n".join(lines) + "\n"
+
+
+class LoopLagMonitor:
+    # 일정 간격으로 잠들었다가 예정보다 얼마나 늦게 깨어났는지로 루프 지연을 잰다
+    def __init__(self, gauge: Gauge, histogram: Histogram, interval: float = 0.5):
+        self.gauge = gauge
+        self.histogram = histogram
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.gauge.set(lag)
+            self.histogram.observe(lag)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import discord
+
+from storage import Storage
+
+
+# 랭킹 출력용 멤버 표시 이름 캐시.
+# Intents.default()에서는 멤버 캐시가 비어 있는 경우가 많아 guild.get_member가 자주 실패한다.
+# 게이트웨이 캐시에 없는 유저는 모아서 query_members(user_ids=...) 한 번(최대 100명)으로 조회하고,
+# 결과는 (길드, 유저) 단위 LRU에 만료 시각과 함께 넣어 member_names 테이블에도 저장한다.
+# 같은 유저를 동시에 찾는 요청은 진행 중인 조회를 함께 기다린다.
+# 조회되지 않은 유저(서버를 나감 등)는 짧게 메모리에만 기억해 매번 다시 묻지 않는다.
+
+QUERY_CHUNK = 100
+
+log = logging.getLogger("gamerbot.names")
+
+Key = Tuple[int, int]
+
+
+class NameCache:
+    def __init__(
+        self,
+        storage: Storage,
+        ttl: float = 86400.0,
+        miss_ttl: float = 600.0,
+        max_entries: int = 20000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.storage = storage
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        # (길드, 유저) -> (이름 또는 None, 만료 시각)
+        self._entries: "OrderedDict[Key, Tuple[Optional[str], float]]" = OrderedDict()
+        self._loaded: Set[int] = set()
+        self._inflight: Dict[Key, asyncio.Future] = {}
+        # 메트릭
+        self.hits = 0
+        self.queried = 0
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, guild_id: int):
+        # 길드별로 처음 찾을 때 저장된 이름을 읽는다
+        self._loaded.add(guild_id)
+        now = self.clock()
+        for user_id, (name, expires) in self.storage.load_json("member_names", guild_id).items():
+            key = (guild_id, user_id)
+            if expires <= now:
+                self.storage.delete("member_names", key)
+            elif key not in self._entries:
+                self._entries[key] = (name, expires)
+                self._entries.move_to_end(key, last=False)
+        self._trim()
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            key, (name, _) = self._entries.popitem(last=False)
+            if name is not None:
+                self.storage.delete("member_names", key)
+
+    def remember(self, guild_id: int, user_id: int, name: Optional[str]):
+        key = (guild_id, user_id)
+        entry = self._entries.get(key)
+        if name is not None and entry is not None and entry[0] == name and entry[1] - self.clock() > self.ttl / 2:
+            self._entries.move_to_end(key)
+            return  # 같은 이름이고 만료까지 충분히 남았으면 다시 저장하지 않는다
+        expires = self.clock() + (self.ttl if name is not None else self.miss_ttl)
+        self._entries[key] = (name, expires)
+        self._entries.move_to_end(key)
+        if name is not None:
+            self.storage.put("member_names", key, [name, expires])
+        self._trim()
+
+    def cached(self, guild_id: int, user_id: int) -> Tuple[bool, Optional[str]]:
+        key = (guild_id, user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[1] <= self.clock():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[0]
+
+    async def resolve(self, guild: discord.Guild, user_ids: List[int]) -> Dict[int, str]:
+        if guild.id not in self._loaded:
+            self._load(guild.id)
+        names: Dict[int, str] = {}
+        waiting: Dict[int, asyncio.Future] = {}
+        missing: List[int] = []
+        for uid in user_ids:
+            member = guild.get_member(uid)
+            if member is not None:
+                names[uid] = member.display_name
+                self.remember(guild.id, uid, member.display_name)
+                continue
+            found, name = self.cached(guild.id, uid)
+            if found:
+                self.hits += 1
+                if name is not None:
+                    names[uid] = name
+                continue
+            future = self._inflight.get((guild.id, uid))
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[(guild.id, uid)] = future
+                missing.append(uid)
+            waiting[uid] = future
+
+        try:
+            for i in range(0, len(missing), QUERY_CHUNK):
+                await self._query(guild, missing[i:i + QUERY_CHUNK])
+        finally:
+            # 취소된 경우에도 같이 기다리던 요청이 멈추지 않게 한다
+            for uid in missing:
+                future = self._inflight.pop((guild.id, uid), None)
+                if future is not None and not future.done():
+                    future.set_result(None)
+
+        for uid, future in waiting.items():
+            name = await asyncio.shield(future)
+            if name is not None:
+                names[uid] = name
+        return {uid: names.get(uid, f"User {uid}") for uid in user_ids}
+
+    async def _query(self, guild: discord.Guild, user_ids: List[int]):
+        found: Dict[int, str] = {}
+        failed = False
+        self.queries += 1
+        self.queried += len(user_ids)
+        try:
+            members = await guild.query_members(user_ids=user_ids, limit=len(user_ids), cache=False)
+            found = {m.id: m.display_name for m in members}
+        except Exception as e:
+            failed = True
+            log.warning("query_members failed guild=%d count=%d: %r", guild.id, len(user_ids), e)
+        for uid in user_ids:
+            name = found.get(uid)
+            if not failed:
+                self.remember(guild.id, uid, name)
+            future = self._inflight.pop((guild.id, uid), None)
+            if future is not None and not future.done():
+                future.set_result(name)
@@ -0,0 +1,28 @@
+from typing import Iterable, List
+
+
+# 디스코드 임베드 길이 제한
+FIELD_LIMIT = 1024
+DESCRIPTION_LIMIT = 4096
+EMBED_TOTAL_LIMIT = 6000
+FIELDS_PER_EMBED = 25
+
+
+def chunk_lines(lines: Iterable[str], limit: int = FIELD_LIMIT) -> List[str]:
+    # 줄 단위로 끊어서 각 덩어리가 limit 글자를 넘지 않게 나눈다
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        if len(line) > limit:
+            line = line[:limit - 1] + "…"
+        extra = len(line) + (1 if current else 0)
+        if current and size + extra > limit:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+            extra = len(line)
+        current.append(line)
+        size += extra
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
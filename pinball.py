@@ -0,0 +1,107 @@
+import random
+from array import array
+from typing import Dict, Iterator, List, Set, Tuple
+
+
+# 핀볼 시뮬레이션 / 렌더링 분리.
+# 전체 궤적은 시드로부터 미리 계산해 프레임별 "이동한 공" 배열로만 보관하고,
+# 재생할 때는 바뀐 칸만 고친 뒤 바뀐 줄만 다시 이어 붙인다.
+# 같은 시드면 항상 같은 결과가 나온다.
+
+CIRCLED_NUMS = [
+    "①", "②", "③", "④", "⑤", "⑥", "⑦", "⑧", "⑨", "⑩",
+    "⑪", "⑫", "⑬", "⑭", "⑮", "⑯", "⑰", "⑱", "⑲", "⑳"
+]
+PAGE_SIZE = 20  # 보드 한 페이지에 표시할 공(열) 수
+MAX_FRAMES = 50
+EMPTY_CELL = "· "
+
+
+def ball_symbols(n: int) -> List[str]:
+    return [CIRCLED_NUMS[i] if i < len(CIRCLED_NUMS) else str(i + 1) for i in range(n)]
+
+
+class PinballRun:
+    def __init__(self, n: int, seed: int, max_height: int = 0, max_frames: int = MAX_FRAMES):
+        self.n = n
+        self.seed = seed
+        self.max_height = max_height or max(6, min(12, n + 3))
+        self.max_frames = max_frames
+        self.symbols = ball_symbols(n)
+
+        self.moves: List[array] = []
+        self.finish_order: List[int] = []
+        self._simulate()
+
+        # 재생 상태
+        self.heights = array("b", [self.max_height]) * n
+        self.arrived: List[int] = []
+        self._cells: List[List[str]] = [[EMPTY_CELL] * n for _ in range(self.max_height)]
+        for i in range(n):
+            self._cells[0][i] = f"{self.symbols[i]} "
+        self._row_cache: Dict[Tuple[int, int], str] = {}
+        self._dirty: Set[Tuple[int, int]] = set()
+
+    @property
+    def pages(self) -> int:
+        return (self.n + PAGE_SIZE - 1) // PAGE_SIZE
+
+    def _simulate(self):
+        rng = random.Random(self.seed)
+        heights = array("b", [self.max_height]) * self.n
+        active = list(range(self.n))
+        order: List[int] = []
+        for _ in range(self.max_frames):
+            if not active:
+                break
+            # 남은 공 전부의 낙하 여부를 비트 하나씩 한 번에 뽑는다
+            bits = rng.getrandbits(len(active))
+            moved = array("H")
+            still = []
+            for k, i in enumerate(active):
+                if (bits >> k) & 1:
+                    heights[i] -= 1
+                    moved.append(i)
+                    if heights[i] == 0:
+                        order.append(i)
+                        continue
+                still.append(i)
+            active = still
+            self.moves.append(moved)
+        # 프레임 안에 도착하지 못한 공은 번호 순으로 뒤에 붙인다
+        self.finish_order = order + active
+
+    def _row_of(self, height: int) -> int:
+        return self.max_height - height
+
+    def _set(self, row: int, col: int, cell: str):
+        self._cells[row][col] = cell
+        self._dirty.add((row, col // PAGE_SIZE))
+
+    def frames(self) -> Iterator[int]:
+        for frame_no, moved in enumerate(self.moves, start=1):
+            for i in moved:
+                h = self.heights[i]
+                self._set(self._row_of(h), i, EMPTY_CELL)
+                h -= 1
+                self.heights[i] = h
+                if h == 0:
+                    self.arrived.append(i)
+                else:
+                    self._set(self._row_of(h), i, f"{self.symbols[i]} ")
+            yield frame_no
+
+    def render(self, page: int = 0) -> str:
+        start = page * PAGE_SIZE
+        end = min(self.n, start + PAGE_SIZE)
+        lines = []
+        for row in range(self.max_height):
+            key = (row, page)
+            text = self._row_cache.get(key)
+            if text is None or key in self._dirty:
+                text = "".join(self._cells[row][start:end])
+                self._row_cache[key] = text
+                self._dirty.discard(key)
+            lines.append(text)
+        lines.append("🟦 " * (end - start))
+        return "\n".join(lines)
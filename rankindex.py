@@ -0,0 +1,156 @@
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# 점수 내림차순 순위 인덱스.
+# sortedcontainers 방식의 버킷 정렬 리스트에 버킷 크기 펜윅 트리를 붙여
+# 갱신 / 순위 조회는 O(log n), TOP N 조회는 O(N)으로 처리한다.
+# 동점이면 ID 오름차순.
+# 큰 길드는 from_chunks로 조각별 정렬 + 병합해 만든다. 한 번의 sorted()가 GIL을 오래 잡지 않으므로
+# 길드를 읽는 스레드에서 만들어도 이벤트 루프가 멈추지 않는다.
+
+Key = Tuple[float, Hashable]
+
+
+class RankIndex:
+    def __init__(self, items: Iterable[Tuple[Hashable, float]] = (), load: int = 512):
+        self._load = load
+        self._scores: Dict[Hashable, float] = {}
+        self._buckets: List[List[Key]] = []
+        self._maxes: List[Key] = []
+        self._tree: List[int] = [0]
+        self.rebuild(items)
+
+    def rebuild(self, items: Iterable[Tuple[Hashable, float]]):
+        self._scores = dict(items)
+        keys = sorted((-score, uid) for uid, score in self._scores.items())
+        load = self._load
+        self._buckets = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._maxes = [b[-1] for b in self._buckets]
+        self._rebuild_tree()
+
+    @classmethod
+    def from_chunks(cls, items: Iterable[Tuple[Hashable, float]], chunk: int = 5000, load: int = 512) -> "RankIndex":
+        index = cls(load=load)
+        scores = index._scores
+        runs = []
+        items = iter(items)
+        while True:
+            part = list(islice(items, chunk))
+            if not part:
+                break
+            scores.update(part)
+            runs.append(sorted([(-score, uid) for uid, score in part]))
+        keys = heapq.merge(*runs)
+        buckets = index._buckets
+        while True:
+            bucket = list(islice(keys, load))
+            if not bucket:
+                break
+            buckets.append(bucket)
+        index._maxes = [b[-1] for b in buckets]
+        index._rebuild_tree()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, uid: Hashable) -> bool:
+        return uid in self._scores
+
+    def score(self, uid: Hashable) -> Optional[float]:
+        return self._scores.get(uid)
+
+    # ---- 버킷 크기 펜윅 트리 ----
+    def _rebuild_tree(self):
+        n = len(self._buckets)
+        tree = [0] * (n + 1)
+        for i, b in enumerate(self._buckets, start=1):
+            tree[i] += len(b)
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, i: int, delta: int):
+        tree = self._tree
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _tree_prefix(self, i: int) -> int:
+        # 0..i-1 번째 버킷 원소 수 합
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    # ---- 갱신 ----
+    def _insert(self, key: Key):
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._rebuild_tree()
+            return
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self._load:
+            half = len(bucket) >> 1
+            self._buckets[i:i + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[i:i + 1] = [bucket[half - 1], bucket[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def _delete(self, key: Key):
+        i = bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._rebuild_tree()
+
+    def update(self, uid: Hashable, score: float):
+        old = self._scores.get(uid)
+        if old is not None:
+            if old == score:
+                return
+            self._delete((-old, uid))
+        self._scores[uid] = score
+        self._insert((-score, uid))
+
+    def remove(self, uid: Hashable):
+        old = self._scores.pop(uid, None)
+        if old is not None:
+            self._delete((-old, uid))
+
+    # ---- 조회 ----
+    def rank(self, uid: Hashable) -> Optional[int]:
+        score = self._scores.get(uid)
+        if score is None:
+            return None
+        key = (-score, uid)
+        i = bisect_left(self._maxes, key)
+        return self._tree_prefix(i) + bisect_left(self._buckets[i], key) + 1
+
+    def top(self, n: int) -> List[Tuple[Hashable, float]]:
+        result: List[Tuple[Hashable, float]] = []
+        for bucket in self._buckets:
+            for neg, uid in bucket:
+                if len(result) >= n:
+                    return result
+                result.append((uid, -neg))
+        return result
@@ -0,0 +1,146 @@
+import base64
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rankindex import RankIndex
+
+
+# 토너먼트 결과 기반 Elo 레이팅.
+# 참가자 이름은 길드별로 번호를 붙여(interning) 경기 기록을 정수 컬럼(승자 / 패자)으로만 남긴다.
+# 결과가 들어올 때마다 두 사람만 증분 갱신하고, 전체 재계산은 기록을 처음부터 다시 돌린다.
+# 저장은 두 갈래: 경기 결과는 rating_log에 한 행씩 추가하고 (points_log와 같은 방식),
+# 현재 레이팅 / 경기 수는 스냅샷(to_dict)으로 따로 둔다. 결과 한 건마다 기록 전체를 다시 쓰지 않는다.
+# 불러올 때는 스냅샷을 그대로 쓰고, 로그의 경기 수가 스냅샷과 다를 때만 로그로 재계산한다.
+# (Elo는 순서에 의존하므로 경기 단위 벡터화는 불가능 — 대신 지역 변수만 쓰는 한 번의 루프로 처리,
+#  100만 경기 기준 1초 안팎)
+
+BASE_RATING = 1500.0
+K_FACTOR = 32.0
+
+
+def expected(ra: float, rb: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0))
+
+
+def _pack(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _unpack(typecode: str, data: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(data))
+    return values
+
+
+class RatingBook:
+    def __init__(self, k: float = K_FACTOR, base: float = BASE_RATING):
+        self.k = k
+        self.base = base
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        # 경기 기록 (컬럼형)
+        self.winners = array("i")
+        self.losers = array("i")
+        # 참가자별 현재 값
+        self.ratings = array("d")
+        self.games = array("i")
+        self.ranks = RankIndex()
+
+    def __len__(self) -> int:
+        return len(self.winners)
+
+    def intern(self, name: str) -> int:
+        pid = self.ids.get(name)
+        if pid is None:
+            pid = len(self.names)
+            self.names.append(name)
+            self.ids[name] = pid
+            self.ratings.append(self.base)
+            self.games.append(0)
+        return pid
+
+    def record(self, winner: str, loser: str) -> Tuple[float, float, float]:
+        # 반환값: (승자 새 레이팅, 패자 새 레이팅, 변동폭)
+        w = self.intern(winner)
+        l = self.intern(loser)
+        self.winners.append(w)
+        self.losers.append(l)
+        rw = self.ratings[w]
+        rl = self.ratings[l]
+        delta = self.k * (1.0 - expected(rw, rl))
+        self.ratings[w] = rw + delta
+        self.ratings[l] = rl - delta
+        self.games[w] += 1
+        self.games[l] += 1
+        self.ranks.update(w, self.ratings[w])
+        self.ranks.update(l, self.ratings[l])
+        return self.ratings[w], self.ratings[l], delta
+
+    def rating(self, name: str) -> Optional[float]:
+        pid = self.ids.get(name)
+        return None if pid is None else self.ratings[pid]
+
+    def top(self, n: int) -> List[Tuple[str, float, int]]:
+        return [(self.names[pid], score, self.games[pid]) for pid, score in self.ranks.top(n)]
+
+    def replay(self):
+        # 전체 기록 재계산 (K값 변경 / 복원 시)
+        k = self.k
+        ratings = [self.base] * len(self.names)
+        games = [0] * len(self.names)
+        for w, l in zip(self.winners, self.losers):
+            rw = ratings[w]
+            rl = ratings[l]
+            d = k - k / (1.0 + 10.0 ** ((rl - rw) / 400.0))
+            ratings[w] = rw + d
+            ratings[l] = rl - d
+            games[w] += 1
+            games[l] += 1
+        self.ratings = array("d", ratings)
+        self.games = array("i", games)
+        self.ranks.rebuild((pid, ratings[pid]) for pid in range(len(ratings)) if games[pid])
+
+    # ---- 저장 ----
+    def to_dict(self) -> Dict:
+        # 스냅샷: 참가자별 현재 값만 (경기 기록은 rating_log)
+        return {
+            "k": self.k,
+            "base": self.base,
+            "names": self.names,
+            "ratings": _pack(self.ratings),
+            "games": _pack(self.games),
+            "matches": len(self.winners),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, log: Iterable[Tuple[str, str]] = ()) -> "RatingBook":
+        # log: rating_log의 (승자, 패자) 행들 (순서대로)
+        book = cls(data.get("k", K_FACTOR), data.get("base", BASE_RATING))
+        book.names = list(data["names"])
+        book.ids = {name: i for i, name in enumerate(book.names)}
+        book.ratings = _unpack("d", data["ratings"])
+        book.games = _unpack("i", data["games"])
+        sized = len(book.ratings) == len(book.games) == len(book.names)
+        book._load_log(log)
+        if not sized or len(book.winners) != data.get("matches"):
+            book.replay()  # 스냅샷과 로그가 어긋남 (스냅샷이 로그보다 늦게 기록된 경우 등)
+        else:
+            book.ranks.rebuild((pid, score) for pid, score in enumerate(book.ratings) if book.games[pid])
+        return book
+
+    @classmethod
+    def from_log(cls, log: Iterable[Tuple[str, str]]) -> "RatingBook":
+        # 스냅샷 없이 로그만 있을 때
+        book = cls()
+        book._load_log(log)
+        book.replay()
+        return book
+
+    def _load_log(self, log: Iterable[Tuple[str, str]]):
+        # 스냅샷에 없는 이름이 로그에 있으면 그 자리에서 번호를 붙인다 (재계산으로 값이 채워짐)
+        intern = self.intern
+        winners = self.winners
+        losers = self.losers
+        for winner, loser in log:
+            winners.append(intern(winner))
+            losers.append(intern(loser))
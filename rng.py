@@ -0,0 +1,89 @@
+import logging
+import random
+import secrets
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from storage import Storage
+
+
+# 랜덤 커맨드 공용 RNG.
+# 추첨 한 번마다 (루트 시드, 길드 ID, 길드의 추첨 번호)로 32비트 시드를 정해 새 random.Random을 만든다.
+# 시드와 결과는 로그 / 길드별 감사 기록에 남으므로 같은 시드로 결과를 그대로 재현할 수 있다.
+# 추첨 번호는 저장소(rng_state)에 남겨 재시작 후 이어서 세므로, RNG_SEED를 고정해도
+# 재시작할 때마다 같은 시드 순서가 처음부터 다시 나오지 않는다.
+
+AUDIT_KEEP = 200
+
+log = logging.getLogger("gamerbot.rng")
+
+
+class DrawRecord:
+    __slots__ = ("id", "guild_id", "command", "seed", "at", "result")
+
+    def __init__(self, id: int, guild_id: int, command: str, seed: int, at: float):
+        self.id = id
+        self.guild_id = guild_id
+        self.command = command
+        self.seed = seed
+        self.at = at
+        self.result = ""
+
+
+class Draw(random.Random):
+    def __init__(self, record: DrawRecord):
+        super().__init__(record.seed)
+        self.record = record
+
+    def done(self, result: str) -> "Draw":
+        self.record.result = result[:200]
+        log.info(
+            "draw #%d guild=%d command=%s seed=%d result=%s",
+            self.record.id, self.record.guild_id, self.record.command, self.record.seed, self.record.result
+        )
+        return self
+
+
+class RngService:
+    def __init__(
+        self,
+        root_seed: Optional[int] = None,
+        keep: int = AUDIT_KEEP,
+        storage: Optional[Storage] = None,
+    ):
+        self.root_seed = root_seed if root_seed is not None else secrets.randbits(64)
+        self.keep = keep
+        self.storage = storage
+        self._counters: Dict[int, int] = {}
+        self._audit: Dict[int, Deque[DrawRecord]] = {}
+        self._next_id = 1
+
+    def _next_seed(self, guild_id: int) -> int:
+        count = self._counters.get(guild_id)
+        if count is None:
+            stored = self.storage.load_value("rng_state", guild_id) if self.storage is not None else None
+            count = int(stored or 0)
+        self._counters[guild_id] = count + 1
+        if self.storage is not None:
+            self.storage.put("rng_state", (guild_id,), count + 1)
+        return random.Random(f"{self.root_seed}:{guild_id}:{count}").getrandbits(32)
+
+    def draw(self, guild_id: int, command: str, seed: Optional[int] = None) -> Draw:
+        # seed를 주면 그 시드로 재현 (감사 기록에는 그대로 남고 추첨 번호는 늘지 않는다)
+        if seed is None:
+            seed = self._next_seed(guild_id)
+        record = DrawRecord(self._next_id, guild_id, command, seed, time.time())
+        self._next_id += 1
+        audit = self._audit.get(guild_id)
+        if audit is None:
+            audit = deque(maxlen=self.keep)
+            self._audit[guild_id] = audit
+        audit.append(record)
+        return Draw(record)
+
+    def history(self, guild_id: int, limit: int = 10) -> List[DrawRecord]:
+        audit = self._audit.get(guild_id)
+        if not audit:
+            return []
+        return list(audit)[-limit:][::-1]
@@ -0,0 +1,166 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+# 이벤트 하나당 태스크 하나씩 1초마다 깨우던 방식 대신,
+# next_run 기준 인덱스 힙 하나로 모든 예약을 관리한다.
+# add / cancel / reschedule 모두 O(log n), 루프는 가장 빠른 마감 시각까지만 잔다.
+# 실행 중인 전송 태스크는 참조를 들고 있다가 (GC로 사라지지 않게) stop()에서 함께 취소한다.
+
+FireCallback = Callable[[Hashable], Awaitable[Optional[float]]]
+
+
+class EventScheduler:
+    def __init__(self, on_fire: FireCallback, clock: Callable[[], float] = time.time):
+        self._on_fire = on_fire
+        self._clock = clock
+        self._heap: List[Tuple[float, Hashable]] = []
+        self._pos: Dict[Hashable, int] = {}
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._inflight: Dict[Hashable, bool] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pos
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        idx = self._pos.get(key)
+        return None if idx is None else self._heap[idx][0]
+
+    # ---- 힙 조작 ----
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][1]] = i
+        self._pos[heap[j][1]] = j
+
+    def _sift_up(self, i: int):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[i][0] >= heap[parent][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        heap = self._heap
+        n = len(heap)
+        while True:
+            left = 2 * i + 1
+            if left >= n:
+                break
+            child = left
+            right = left + 1
+            if right < n and heap[right][0] < heap[left][0]:
+                child = right
+            if heap[child][0] >= heap[i][0]:
+                break
+            self._swap(i, child)
+            i = child
+
+    def _remove_at(self, idx: int):
+        heap = self._heap
+        last = len(heap) - 1
+        key = heap[idx][1]
+        if idx != last:
+            self._swap(idx, last)
+        heap.pop()
+        del self._pos[key]
+        if idx < len(heap):
+            self._sift_down(idx)
+            self._sift_up(idx)
+
+    def _kick(self, touched_root: bool):
+        # 가장 이른 마감이 바뀐 경우에만 잠든 루프를 깨운다
+        if touched_root:
+            self._wakeup.set()
+
+    # ---- 공개 API ----
+    def add(self, key: Hashable, when: float):
+        if key in self._pos:
+            self.reschedule(key, when)
+            return
+        self._heap.append((when, key))
+        idx = len(self._heap) - 1
+        self._pos[key] = idx
+        self._sift_up(idx)
+        self._kick(self._pos[key] == 0)
+
+    def reschedule(self, key: Hashable, when: float):
+        idx = self._pos.get(key)
+        if idx is None:
+            self.add(key, when)
+            return
+        was_root = idx == 0
+        self._heap[idx] = (when, key)
+        self._sift_down(idx)
+        self._sift_up(idx)
+        self._kick(was_root or self._pos[key] == 0)
+
+    def cancel(self, key: Hashable) -> bool:
+        if key in self._inflight:
+            # 실행 중인 항목은 끝난 뒤 다시 예약되지 않도록 표시만 한다
+            self._inflight[key] = False
+        idx = self._pos.get(key)
+        if idx is None:
+            return key in self._inflight
+        self._remove_at(idx)
+        self._kick(idx == 0)
+        return True
+
+    def start(self):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            when, key = self._heap[0]
+            delay = when - self._clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # 마감된 항목은 먼저 힙에서 빼고, 느린 전송이 다른 이벤트를 막지 않도록 따로 실행한다
+            self._remove_at(0)
+            self._inflight[key] = True
+            task = asyncio.create_task(self._fire(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fire(self, key: Hashable):
+        try:
+            next_run = await self._on_fire(key)
+        except Exception as e:
+            print("SCHEDULER ERROR:", key, e)
+            next_run = None
+        keep = self._inflight.pop(key, False)
+        if keep and next_run is not None and key not in self._pos:
+            self.add(key, next_run)
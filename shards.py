@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional
+
+
+# 샤딩 관련 헬퍼.
+# 길드는 (guild_id >> 22) % shard_count 번 샤드에 속하며,
+# 프로세스는 자신이 맡은 샤드의 길드 상태만 메모리에 올린다.
+# 저장소(DB 파일)는 샤드 구성과 무관하게 하나를 함께 쓴다.
+
+
+def shard_of(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(raw: str) -> Optional[List[int]]:
+    # "0-3" 또는 "0,2,5" 형식
+    raw = raw.strip()
+    if not raw:
+        return None
+    ids: List[int] = []
+    for part in raw.split(","):
+        part = part.strip()
+        if "-" in part:
+            first, last = part.split("-", 1)
+            ids.extend(range(int(first), int(last) + 1))
+        elif part:
+            ids.append(int(part))
+    return sorted(set(ids))
+
+
+def split_ranges(shard_count: int, processes: int) -> List[List[int]]:
+    # 연속된 샤드 구간으로 균등 분할
+    processes = max(1, min(processes, shard_count))
+    base, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for i in range(processes):
+        size = base + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class LatencyStats:
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "mean": self.mean, "max": self.max, "last": self.last}
+
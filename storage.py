@@ -0,0 +1,393 @@
+import asyncio
+import json
+import pathlib
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# SQLite(WAL) 기반 write-behind 저장소.
+# 변경 사항은 메모리 큐에 (테이블, 키) 단위로 합쳐 두었다가
+# 주기 또는 개수 임계치에 도달하면 한 트랜잭션으로 백그라운드 스레드에서 기록한다.
+# 슬래시 커맨드 경로에서는 디스크를 기다리지 않는다.
+# 읽기는 별도의 읽기 전용 연결로 하므로 (WAL) 기록 트랜잭션이 진행 중이어도 막히지 않는다.
+
+_DELETE = object()
+
+# 기록 실패 시 배치를 큐에 되돌리고 flush_interval부터 두 배씩 늘려 최대 이 시간(초)까지 기다렸다 재시도
+FLUSH_BACKOFF_MAX = 60.0
+CLOSE_RETRIES = 5
+# 길드 전체를 읽을 때 한 번에 가져오는 행 수
+READ_CHUNK = 5000
+
+# 테이블 이름 -> (키 컬럼들, 값 컬럼, JSON 직렬화 여부)
+TABLES: Dict[str, Tuple[Tuple[str, ...], str, bool]] = {
+    "points": (("guild_id", "user_id"), "value", False),
+    "vc_time": (("guild_id", "user_id"), "seconds", False),
+    "vc_join": (("guild_id", "user_id"), "started", False),
+    "vc_paid": (("guild_id", "user_id"), "points", False),
+    "vc_checkpoint": (("guild_id",), "at", False),
+    "vc_stats": (("guild_id",), "data", True),
+    "meta": (("name",), "value", False),
+    "tournaments": (("guild_id",), "data", True),
+    "scheduled_events": (("guild_id", "event_id"), "data", True),
+    "ratings": (("guild_id",), "data", True),
+    "member_names": (("guild_id", "user_id"), "data", True),
+    "rng_state": (("guild_id",), "draws", False),
+}
+
+# 추가 전용(append-only) 로그 테이블 -> 컬럼들 (seq는 자동 증가)
+LOGS: Dict[str, Tuple[str, ...]] = {
+    "points_log": ("guild_id", "user_id", "amount", "reason", "idem_key", "created"),
+    "rating_log": ("guild_id", "winner", "loser", "created"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, value INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vc_time (
+    guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, seconds REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vc_join (
+    guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, started REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vc_paid (
+    guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, points INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vc_checkpoint (
+    guild_id INTEGER PRIMARY KEY, at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vc_stats (
+    guild_id INTEGER PRIMARY KEY, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY, value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    guild_id INTEGER PRIMARY KEY, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scheduled_events (
+    guild_id INTEGER NOT NULL, event_id INTEGER NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (guild_id, event_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ratings (
+    guild_id INTEGER PRIMARY KEY, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS member_names (
+    guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rng_state (
+    guild_id INTEGER PRIMARY KEY, draws INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS points_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, amount INTEGER NOT NULL,
+    reason TEXT NOT NULL, idem_key TEXT, created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS points_log_guild ON points_log (guild_id, user_id);
+CREATE INDEX IF NOT EXISTS points_log_idem ON points_log (idem_key) WHERE idem_key IS NOT NULL;
+CREATE TABLE IF NOT EXISTS rating_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL, winner TEXT NOT NULL, loser TEXT NOT NULL, created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rating_log_guild ON rating_log (guild_id, seq);
+"""
+
+
+def _json_default(value: Any) -> Any:
+    # 메모리 객체(대진표 등)는 to_dict()로 직렬화한다
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"JSON으로 저장할 수 없는 값: {type(value).__name__}")
+    return to_dict()
+
+
+class Storage:
+    def __init__(self, path: str, flush_interval: float = 2.0, flush_threshold: int = 1000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 다른 연결이 쓰는 중이면 바로 실패하지 않고 잠시 기다린다
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self._reader = sqlite3.connect(
+            pathlib.Path(path).resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False
+        )
+        self._read_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, Tuple], Any] = {}
+        self._appends: Dict[str, List[Tuple]] = {}
+        self._append_count = 0
+        self._flush_now = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None
+        self._flush_lock = asyncio.Lock()
+
+    # ---- 쓰기 (메모리 큐) ----
+    def put(self, table: str, key: Tuple, value: Any):
+        self._pending[(table, key)] = value
+        if self.pending >= self.flush_threshold:
+            self._flush_now.set()
+
+    def put_many(self, table: str, items: Iterable[Tuple[Tuple, Any]]):
+        self._pending.update(((table, key), value) for key, value in items)
+        if self.pending >= self.flush_threshold:
+            self._flush_now.set()
+
+    def delete(self, table: str, key: Tuple):
+        self.put(table, key, _DELETE)
+
+    def append(self, table: str, rows: List[Tuple]):
+        # 로그 테이블은 합치지 않고 순서대로 모두 기록한다
+        self._appends.setdefault(table, []).extend(rows)
+        self._append_count += len(rows)
+        if self.pending >= self.flush_threshold:
+            self._flush_now.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + self._append_count
+
+    def _take_batch(self) -> Tuple[Dict, Dict[str, List[Tuple]], Dict[str, Tuple[List[Tuple], List[Tuple]]]]:
+        # 루프 스레드에서 큐를 비우고 직렬화까지 끝낸 뒤 스레드로 넘긴다.
+        # 기록이 실패하면 되돌릴 수 있도록 원본(pending / appends)도 함께 돌려준다.
+        pending, self._pending = self._pending, {}
+        appends, self._appends = self._appends, {}
+        self._append_count = 0
+        batch: Dict[str, Tuple[List[Tuple], List[Tuple]]] = {}
+        for table, rows in appends.items():
+            batch[table] = (rows, [])
+        for (table, key), value in list(pending.items()):
+            upserts, deletes = batch.setdefault(table, ([], []))
+            if value is _DELETE:
+                deletes.append(key)
+                continue
+            if TABLES[table][2]:
+                try:
+                    value = json.dumps(value, ensure_ascii=False, default=_json_default)
+                except (TypeError, ValueError) as e:
+                    # 직렬화할 수 없는 값은 재시도해도 실패하므로 버린다
+                    print(f"STORAGE SERIALIZE ERROR {table}{key}:", e)
+                    del pending[(table, key)]
+                    continue
+            upserts.append(key + (value,))
+        return pending, appends, batch
+
+    def _requeue(self, pending: Dict, appends: Dict[str, List[Tuple]]):
+        # 실패한 배치를 큐에 되돌린다. 그 사이 같은 키에 새 값이 들어왔으면 새 값을 유지하고,
+        # 로그 행은 나중에 추가된 행보다 앞에 원래 순서대로 둔다.
+        for key, value in pending.items():
+            if key not in self._pending:
+                self._pending[key] = value
+        for table, rows in appends.items():
+            self._appends[table] = rows + self._appends.get(table, [])
+            self._append_count += len(rows)
+
+    def _write_batch(self, batch: Dict[str, Tuple[List[Tuple], List[Tuple]]]):
+        with self._db_lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                for table, (upserts, deletes) in batch.items():
+                    if table in LOGS:
+                        cols = LOGS[table]
+                        cur.executemany(
+                            f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                            upserts
+                        )
+                        continue
+                    keys, value_col, _ = TABLES[table]
+                    cols = ", ".join(keys + (value_col,))
+                    marks = ", ".join("?" * (len(keys) + 1))
+                    where = " AND ".join(f"{k} = ?" for k in keys)
+                    if upserts:
+                        cur.executemany(
+                            f"INSERT OR REPLACE INTO {table} ({cols}) VALUES ({marks})",
+                            upserts
+                        )
+                    if deletes:
+                        cur.executemany(f"DELETE FROM {table} WHERE {where}", deletes)
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    async def flush(self):
+        # 배치 순서가 뒤바뀌지 않도록 한 번에 하나씩만 기록한다.
+        # 호출자가 취소돼도 이미 넘긴 배치는 shield로 끝까지 기록된다.
+        async with self._flush_lock:
+            if self._writing is not None and not self._writing.done():
+                await asyncio.shield(self._writing)
+            if not self._pending and not self._appends:
+                return
+            pending, appends, batch = self._take_batch()
+            writing = asyncio.ensure_future(asyncio.to_thread(self._write_batch, batch))
+
+            def written(future: asyncio.Future):
+                # 호출자가 취소됐어도 실패한 배치는 되돌린다
+                if future.cancelled() or future.exception() is not None:
+                    self._requeue(pending, appends)
+
+            writing.add_done_callback(written)
+            self._writing = writing
+            await asyncio.shield(writing)
+
+    def start(self):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    def _backoff(self, failures: int) -> float:
+        return min(FLUSH_BACKOFF_MAX, self.flush_interval * 2 ** (failures - 1))
+
+    async def _run(self):
+        failures = 0
+        while True:
+            if failures:
+                # 실패 중에는 임계치 신호와 무관하게 백오프만큼 기다린다
+                await asyncio.sleep(self._backoff(failures))
+            else:
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                print(f"STORAGE FLUSH ERROR (연속 {failures}회, 대기 {self.pending}건):", e)
+
+    async def close(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        for attempt in range(1, CLOSE_RETRIES + 1):
+            try:
+                await self.flush()
+                break
+            except Exception as e:
+                print(f"STORAGE FLUSH ERROR (종료 중 {attempt}/{CLOSE_RETRIES}회, 대기 {self.pending}건):", e)
+                if attempt < CLOSE_RETRIES:
+                    await asyncio.sleep(self._backoff(attempt))
+        with self._db_lock:
+            self._conn.close()
+        with self._read_lock:
+            self._reader.close()
+
+    # ---- 읽기 (길드 단위, 최초 접근 시) ----
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def load_members(self, table: str, guild_id: int) -> Dict[int, Any]:
+        # 큰 길드는 나눠 읽어서 GIL을 오래 잡지 않게 한다 (루프 스레드가 중간중간 돌 수 있도록)
+        keys, value_col, _ = TABLES[table]
+        members: Dict[int, Any] = {}
+        with self._read_lock:
+            cur = self._reader.execute(
+                f"SELECT {keys[1]}, {value_col} FROM {table} WHERE guild_id = ?",
+                (guild_id,)
+            )
+            while True:
+                rows = cur.fetchmany(READ_CHUNK)
+                if not rows:
+                    break
+                members.update(rows)
+        return members
+
+    def load_value(self, table: str, key: Any) -> Any:
+        keys, value_col, _ = TABLES[table]
+        rows = self._query(f"SELECT {value_col} FROM {table} WHERE {keys[0]} = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def load_json(self, table: str, guild_id: int) -> Any:
+        keys, value_col, _ = TABLES[table]
+        if len(keys) == 1:
+            rows = self._query(f"SELECT {value_col} FROM {table} WHERE guild_id = ?", (guild_id,))
+            return json.loads(rows[0][0]) if rows else None
+        rows = self._query(
+            f"SELECT {keys[1]}, {value_col} FROM {table} WHERE guild_id = ?",
+            (guild_id,)
+        )
+        return {k: json.loads(v) for k, v in rows}
+
+    def log_members(self, table: str, idem_key: str) -> List[Tuple[int, int]]:
+        # 멱등 키로 이미 기록된 (길드, 유저) 행들 (재시작 뒤 재시도 확인용, 인덱스 조회)
+        return self._query(f"SELECT guild_id, user_id FROM {table} WHERE idem_key = ?", (idem_key,))
+
+    def log_rows(self, table: str, guild_id: int, columns: Tuple[str, ...]) -> List[Tuple]:
+        # 길드의 로그 행들 (기록 순서대로)
+        return self._query(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE guild_id = ? ORDER BY seq",
+            (guild_id,)
+        )
+
+    def load_grouped(self, table: str) -> Dict[int, Dict[int, Any]]:
+        # 테이블 전체를 길드 -> (유저 -> 값)으로 (vc_join처럼 행이 적은 테이블을 길드 상태 없이 훑을 때)
+        keys, value_col, _ = TABLES[table]
+        grouped: Dict[int, Dict[int, Any]] = {}
+        for gid, uid, value in self._query(f"SELECT {keys[0]}, {keys[1]}, {value_col} FROM {table}"):
+            grouped.setdefault(gid, {})[uid] = value
+        return grouped
+
+    def guilds_with(self, table: str) -> List[int]:
+        return [r[0] for r in self._query(f"SELECT DISTINCT guild_id FROM {table}")]
+
+    def max_key(self, table: str, column: str) -> int:
+        row = self._query(f"SELECT MAX({column}) FROM {table}")
+        return row[0][0] or 0
+
+
+class LazyGuildMap(dict):
+    # 길드 ID별 상태를 저장소에서 읽어 둔다.
+    # 큰 길드는 읽는 데 오래 걸리므로 preload()로 스레드에서 미리 읽고,
+    # 미리 읽지 않은 길드를 []로 접근할 때만 그 자리에서 읽는다.
+    # get / in은 디스크를 읽지 않고 이미 불러온 값만 본다.
+    # loader가 None을 돌려주면 "없음"으로 취급한다.
+    def __init__(self, loader: Callable[[int], Any]):
+        super().__init__()
+        self._loader = loader
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+
+    def __missing__(self, guild_id: Hashable):
+        value = self._loader(guild_id)
+        dict.__setitem__(self, guild_id, value)
+        return value
+
+    def loaded(self, guild_id: Hashable) -> bool:
+        return dict.__contains__(self, guild_id)
+
+    async def preload(self, guild_id: Hashable):
+        # 같은 길드를 동시에 요청하면 한 번만 읽는다
+        if dict.__contains__(self, guild_id):
+            return
+        loading = self._loading.get(guild_id)
+        if loading is None:
+            loading = asyncio.ensure_future(asyncio.to_thread(self._loader, guild_id))
+            self._loading[guild_id] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+        value = await asyncio.shield(loading)
+        # 읽는 동안 []로 먼저 불러왔으면 그 값을 유지한다
+        if not dict.__contains__(self, guild_id):
+            dict.__setitem__(self, guild_id, value)
+
+    def get(self, guild_id: Hashable, default: Any = None) -> Any:
+        value = dict.get(self, guild_id)
+        return default if value is None else value
+
+    def __contains__(self, guild_id: object) -> bool:
+        return dict.get(self, guild_id) is not None
@@ -0,0 +1,173 @@
+import asyncio
+import heapq
+import itertools
+
+from animator import AnimationRenderer
+
+
+class FakeClock:
+    # 가상 시간: 모든 태스크가 sleep에서 멈추면 가장 이른 깨어날 시각으로 건너뛴다
+    def __init__(self):
+        self.now = 0.0
+        self._timers = []
+        self._seq = itertools.count()
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self.now + seconds, next(self._seq), future))
+        await future
+
+    def run(self, *coros):
+        async def drive():
+            tasks = [asyncio.ensure_future(c) for c in coros]
+            while not all(t.done() for t in tasks):
+                for _ in range(10):
+                    await asyncio.sleep(0)
+                if self._timers:
+                    at, _, future = heapq.heappop(self._timers)
+                    self.now = max(self.now, at)
+                    future.set_result(None)
+            return [t.result() for t in tasks]
+
+        return asyncio.run(drive())
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+
+
+class FakeMessage:
+    # message.edit 대신 (요청 시각, 프레임)을 기록하는 가짜 HTTP
+    def __init__(self, clock: FakeClock, message_id: int, channel_id: int, latency: float = 0.05):
+        self.clock = clock
+        self.id = message_id
+        self.channel = FakeChannel(channel_id)
+        self.latency = latency
+        self.edits = []
+
+    async def edit(self, **fields):
+        self.edits.append((self.clock.now, fields["frame"]))
+        await self.clock.sleep(self.latency)
+
+
+def _renderer(clock):
+    return AnimationRenderer(clock=clock, sleep=clock.sleep)
+
+
+async def _animate(renderer, clock, message, frames, interval):
+    for i in range(frames):
+        renderer.push(message, frame=i)
+        await clock.sleep(interval)
+    return await renderer.finish(message, frame="final")
+
+
+def _max_in_window(times, per):
+    times = sorted(times)
+    return max(sum(1 for t in times[i:] if t - start < per) for i, start in enumerate(times))
+
+
+def test_frames_are_coalesced_and_last_frame_is_sent():
+    clock = FakeClock()
+    renderer = _renderer(clock)
+    message = FakeMessage(clock, 1, 10)
+    stats, = clock.run(_animate(renderer, clock, message, 60, 0.05))
+
+    sent = [frame for _, frame in message.edits]
+    assert sent[-1] == "final"
+    assert stats["edits"] == len(sent) < 60
+    assert stats["edits"] + stats["dropped"] == 61
+    # 보낸 프레임은 항상 push 순서대로
+    numbers = [f for f in sent if f != "final"]
+    assert numbers == sorted(numbers)
+
+
+def test_five_edits_per_five_seconds_per_channel():
+    clock = FakeClock()
+    renderer = _renderer(clock)
+    a = FakeMessage(clock, 1, 10)
+    b = FakeMessage(clock, 2, 10)
+    other = FakeMessage(clock, 3, 20)
+    clock.run(
+        _animate(renderer, clock, a, 100, 0.1),
+        _animate(renderer, clock, b, 100, 0.1),
+        _animate(renderer, clock, other, 100, 0.1),
+    )
+    assert _max_in_window([t for t, _ in a.edits + b.edits], 5.0) <= 5
+    assert _max_in_window([t for t, _ in other.edits], 5.0) <= 5
+    # 다른 채널은 예산을 따로 쓰므로 같은 채널 두 메시지보다 혼자 더 많이 보낸다
+    assert len(other.edits) > len(a.edits)
+    assert len(other.edits) > len(b.edits)
+
+
+def _gaps(times):
+    return [round(b - a, 6) for a, b in zip(times, times[1:])]
+
+
+def test_edits_are_spaced_evenly():
+    clock = FakeClock()
+    renderer = _renderer(clock)
+    message = FakeMessage(clock, 1, 10)
+    clock.run(_animate(renderer, clock, message, 200, 0.05))
+    # 프레임이 계속 들어오는 동안 1초(per / rate)마다 한 번, 몰아 보내고 멈추지 않는다
+    gaps = _gaps([t for t, _ in message.edits])
+    assert len(gaps) >= 9
+    assert all(gap == 1.0 for gap in gaps)
+
+
+def test_messages_in_one_channel_share_the_spacing():
+    clock = FakeClock()
+    renderer = _renderer(clock)
+    a = FakeMessage(clock, 1, 10)
+    b = FakeMessage(clock, 2, 10)
+    clock.run(
+        _animate(renderer, clock, a, 200, 0.05),
+        _animate(renderer, clock, b, 200, 0.05),
+    )
+    # 채널 전체로는 1초 간격, 메시지마다는 2초 간격
+    assert all(gap == 1.0 for gap in _gaps(sorted(t for t, _ in a.edits + b.edits)))
+    assert all(gap == 2.0 for gap in _gaps([t for t, _ in a.edits]))
+
+
+def test_slow_edit_empties_budget():
+    clock = FakeClock()
+    renderer = _renderer(clock)
+    message = FakeMessage(clock, 1, 10, latency=2.0)
+    clock.run(_animate(renderer, clock, message, 5, 0.0))
+    times = [t for t, _ in message.edits]
+    # 첫 편집이 느렸으므로 (429 대기) 다음 편집은 per초를 기다린다
+    assert times[1] - times[0] >= 2.0 + 5.0
+
+
+def test_idle_budgets_are_dropped():
+    clock = FakeClock()
+    renderer = _renderer(clock)
+
+    async def run():
+        for channel in range(50):
+            await _animate(renderer, clock, FakeMessage(clock, channel, channel), 3, 0.0)
+        await clock.sleep(10.0)
+        await _animate(renderer, clock, FakeMessage(clock, 999, 999), 1, 0.0)
+        await clock.sleep(10.0)
+        await _animate(renderer, clock, FakeMessage(clock, 1000, 1000), 1, 0.0)
+
+    clock.run(run())
+    assert set(renderer._budgets) == {1000}
+
+
+def test_budget_in_use_is_kept():
+    clock = FakeClock()
+    renderer = _renderer(clock)
+    slow = FakeMessage(clock, 1, 10, latency=20.0)
+
+    async def run():
+        renderer.push(slow, frame=0)
+        await clock.sleep(10.0)
+        await _animate(renderer, clock, FakeMessage(clock, 2, 20), 1, 0.0)
+        assert 10 in renderer._budgets
+        await renderer.finish(slow, frame="final")
+
+    clock.run(run())
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from balance import balance_teams, spread, team_sizes
+
+
+def _check_partition(teams, n, team_count):
+    members = sorted(i for team in teams for i in team)
+    assert members == list(range(n))
+    sizes = sorted(len(team) for team in teams)
+    assert sizes[-1] - sizes[0] <= 1 and len(teams) == team_count
+
+
+def test_team_sizes():
+    assert team_sizes(10, 3) == [4, 3, 3]
+    assert sum(team_sizes(101, 10)) == 101
+
+
+def test_balanced_better_than_random_split():
+    rng = random.Random(2)
+    for _ in range(20):
+        ratings = [rng.randrange(0, 5000) for _ in range(40)]
+        teams = balance_teams(ratings, 4, rng=random.Random(1))
+        _check_partition(teams, 40, 4)
+        shuffled = list(range(40))
+        rng.shuffle(shuffled)
+        naive = [shuffled[t::4] for t in range(4)]
+        assert spread(ratings, teams) <= spread(ratings, naive)
+        assert spread(ratings, teams) <= max(ratings) / 10
+
+
+def test_fixed_members_stay_on_their_team():
+    ratings = [100, 90, 50, 40, 30, 20, 10, 5]
+    fixed = [0, 1] + [None] * 6
+    teams = balance_teams(ratings, 2, fixed, random.Random(0))
+    _check_partition(teams, 8, 2)
+    assert 0 in teams[0] and 1 in teams[1]
+
+
+def test_too_many_fixed_members():
+    with pytest.raises(ValueError):
+        balance_teams([1, 2, 3, 4], 2, [0, 0, 0, None])
+
+
+def test_uneven_counts_keep_sizes_within_one():
+    ratings = list(range(1, 24))
+    teams = balance_teams(ratings, 5, rng=random.Random(3))
+    _check_partition(teams, 23, 5)
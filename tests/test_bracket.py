@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+from bracket import BYE, DOUBLE, EMPTY, MAX_ENTRANTS, SINGLE, SWISS, Bracket, BracketError
+
+
+def _playable(b):
+    return [m for m in range(b.match_count) if b.winner[m] == EMPTY and b.filled[m] == 2]
+
+
+def _lower(a, c, m):
+    return min(a, c)
+
+
+def _play_one(b, losses=None, pick=_lower):
+    ready = _playable(b)
+    assert ready, "진행할 경기가 없는데 우승자가 없음"
+    m = ready[0]
+    a, c = b.team1[m], b.team2[m]
+    win = pick(a, c, m)
+    touched = b.record(m + 1, b.names[win])
+    if b.format != SWISS:
+        assert len(touched) <= 4  # 결과 하나는 대진 크기와 상관없이 몇 경기만 바꾼다
+    if losses is not None:
+        lose = c if win == a else a
+        losses[lose] = losses.get(lose, 0) + 1
+
+
+def _play(b, losses=None, pick=_lower):
+    # 기본은 번호가 낮은 참가자가 항상 이긴다. pick(a, b, 경기 번호)로 바꿀 수 있다.
+    played = 0
+    while b.champion is None:
+        _play_one(b, losses, pick)
+        played += 1
+    return played
+
+
+def _names(n):
+    return [f"p{i}" for i in range(n)]
+
+
+def test_single_elimination_with_byes():
+    b = Bracket(_names(5), SINGLE)
+    assert _play(b) == 4
+    assert b.champion == 0
+    # 부전승끼리 만나는 경기는 없다
+    first = b.round_matches(0)
+    assert all(not (b.team1[m] == BYE and b.team2[m] == BYE) for m in first)
+
+
+def test_double_elimination_everyone_but_champion_loses_twice():
+    losses = {}
+    b = Bracket(_names(8), DOUBLE)
+    assert _play(b, losses) == 14
+    assert b.champion == 0
+    assert 0 not in losses
+    assert sorted(losses.values()) == [2] * 7
+
+
+def test_double_elimination_two_players_meet_again_in_final():
+    b = Bracket(_names(2), DOUBLE)
+    assert _play(b) == 2
+    assert b.champion == 0
+
+
+def test_double_elimination_winners_champion_wins_final_without_reset():
+    b = Bracket(_names(4), DOUBLE)
+    losses = {}
+    assert _play(b, losses) == 6
+    assert b.champion == 0 and 0 not in losses
+    # 리셋 경기는 열리지 않는다
+    assert b.filled[b.reset_match] == 0 and b.winner[b.reset_match] == EMPTY
+
+
+def test_double_elimination_final_loss_forces_reset():
+    b = Bracket(_names(4), DOUBLE)
+    losses = {}
+
+    def pick(a, c, m):
+        # p0은 승자조를 무패로 올라가 결승에서 패자조 우승자에게 진다
+        if m == b.grand_final:
+            return c
+        return min(a, c)
+
+    while b.winner[b.grand_final] == EMPTY:
+        _play_one(b, losses, pick)
+    lb_champ = b.team2[b.grand_final]
+    assert b.winner[b.grand_final] == lb_champ and losses[0] == 1
+    # 1패뿐이므로 탈락하지 않고 리셋 경기로 간다
+    assert b.champion is None
+    assert (b.team1[b.reset_match], b.team2[b.reset_match]) == (0, lb_champ)
+    assert b.reset_match in _playable(b)
+
+
+@pytest.mark.parametrize("reset_winner", ["winners", "losers"])
+def test_double_elimination_reset_outcomes(reset_winner):
+    b = Bracket(_names(8), DOUBLE)
+    losses = {}
+
+    def pick(a, c, m):
+        if m == b.grand_final:
+            return c
+        if m == b.reset_match:
+            return a if reset_winner == "winners" else c
+        return min(a, c)
+
+    assert _play(b, losses, pick) == 15
+    lb_champ = b.team2[b.reset_match]
+    assert b.champion == (0 if reset_winner == "winners" else lb_champ)
+    # 우승자는 1패, 나머지는 모두 정확히 2패로 탈락
+    assert losses[b.champion] == 1
+    assert sorted(v for p, v in losses.items() if p != b.champion) == [2] * 7
+
+
+def test_double_elimination_reset_survives_roundtrip():
+    b = Bracket(_names(4), DOUBLE)
+
+    def pick(a, c, m):
+        return c if m == b.grand_final else min(a, c)
+
+    while b.winner[b.grand_final] == EMPTY:
+        _play_one(b, None, pick)
+    restored = Bracket.from_dict(json.loads(json.dumps(b.to_dict())))
+    touched = restored.record(restored.reset_match + 1, "p0")
+    assert restored.champion == 0 and restored.reset_match in touched
+
+
+def test_swiss_pairs_without_rematches():
+    b = Bracket(_names(8), SWISS, swiss_rounds=3)
+    _play(b)
+    assert len(b.round_labels) == 3
+    for i in range(8):
+        assert len(set(b.opponents[i])) == len(b.opponents[i]) == 3
+    assert b.champion == 0 and b.scores[0] == 3
+
+
+def test_swiss_odd_count_gives_each_bye_once():
+    b = Bracket(_names(5), SWISS, swiss_rounds=3)
+    _play(b)
+    assert sum(b.had_bye) == 3
+
+
+def test_record_errors():
+    b = Bracket(_names(4), SINGLE)
+    with pytest.raises(BracketError):
+        b.record(99, "p0")
+    with pytest.raises(BracketError):
+        b.record(3, "p0")  # 결승은 아직 대진 미정
+    with pytest.raises(BracketError):
+        b.record(1, "p3")  # 1경기는 p0 대 p2
+    b.record(1, "p0")
+    with pytest.raises(BracketError):
+        b.record(1, "p0")
+
+
+def test_limits():
+    with pytest.raises(BracketError):
+        Bracket(["a"], SINGLE)
+    with pytest.raises(BracketError):
+        Bracket(["a", "a"], SINGLE)
+    with pytest.raises(BracketError):
+        Bracket(_names(MAX_ENTRANTS + 1), SINGLE)
+    b = Bracket(_names(MAX_ENTRANTS), SINGLE)
+    assert _play(b) == MAX_ENTRANTS - 1 and b.champion == 0
+
+
+def test_roundtrip_midway():
+    b = Bracket(_names(6), DOUBLE)
+    for _ in range(3):
+        m = _playable(b)[0]
+        b.record(m + 1, b.names[min(b.team1[m], b.team2[m])])
+    restored = Bracket.from_dict(json.loads(json.dumps(b.to_dict())))
+    assert restored.to_dict() == b.to_dict()
+    _play(restored)
+    assert restored.champion == 0
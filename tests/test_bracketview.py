@@ -0,0 +1,81 @@
+from bracket import DOUBLE, SINGLE, Bracket
+from bracketview import PAGE_FIELDS, PAGE_RESERVE, BracketView
+from paging import EMBED_TOTAL_LIMIT, FIELD_LIMIT
+
+
+def _names(n, width=4):
+    return [f"p{i:0{width}d}" for i in range(n)]
+
+
+def _prefix(m):
+    return f"#{m + 1}:"
+
+
+def _page_lines(page):
+    return [line for _, chunk in page for line in chunk.split("\n")]
+
+
+def _shown(view):
+    # 페이지에 실린 경기 번호들 (순서대로)
+    return [int(line.split(":")[0][1:]) - 1 for page in view.pages() for line in _page_lines(page)]
+
+
+def _check_pages(view):
+    pages = view.pages()
+    for page in pages:
+        assert 0 < len(page) <= PAGE_FIELDS
+        assert sum(len(name) + len(chunk) for name, chunk in page) <= EMBED_TOTAL_LIMIT - PAGE_RESERVE
+        assert all(len(chunk) <= FIELD_LIMIT for _, chunk in page)
+    return pages
+
+
+def test_small_bracket_fits_one_page():
+    b = Bracket(_names(8), SINGLE)
+    view = BracketView(b)
+    pages = _check_pages(view)
+    assert len(pages) == 1
+    assert [name for name, _ in pages[0]] == b.round_labels
+    assert _shown(view) == list(range(b.match_count))
+    assert all(view.page_of_match(m) == 0 for m in range(b.match_count))
+
+
+def test_round_spanning_pages_maps_each_match_to_its_own_page():
+    b = Bracket(_names(512, width=40), SINGLE)
+    view = BracketView(b)
+    pages = _check_pages(view)
+    first = b.round_matches(0)
+    first_pages = {view.page_of_match(m) for m in first}
+    # 첫 라운드(256경기)만으로 여러 페이지
+    assert len(first_pages) > 2
+    assert view.page_of_match(first[0]) == 0
+    assert view.page_of_match(first[-1]) == max(first_pages)
+    # 모든 경기가 한 번씩, 순서대로 실리고, page_of_match가 가리키는 페이지에 그 경기 줄이 있다
+    assert _shown(view) == list(range(b.match_count))
+    for m in range(b.match_count):
+        lines = _page_lines(pages[view.page_of_match(m)])
+        assert sum(1 for line in lines if line.startswith(_prefix(m))) == 1
+
+
+def test_pages_follow_recorded_results():
+    b = Bracket(_names(512, width=40), SINGLE)
+    view = BracketView(b)
+    last = b.round_matches(0)[-1]
+    before = view.page_of_match(last)
+    view.invalidate(b.record(last + 1, b.names[b.team1[last]]))
+    pages = _check_pages(view)
+    line = next(line for line in _page_lines(pages[view.page_of_match(last)]) if line.startswith(_prefix(last)))
+    assert "✅" in line
+    assert view.page_of_match(last) == before
+    # 다음 라운드로 올라간 경기도 자기 페이지에서 보인다
+    nxt = next(m for m in range(b.match_count) if b.filled[m] == 1)
+    assert any(line.startswith(_prefix(nxt)) for line in _page_lines(pages[view.page_of_match(nxt)]))
+
+
+def test_hidden_matches_map_to_their_round():
+    b = Bracket(_names(5), DOUBLE)
+    view = BracketView(b)
+    shown = set(_shown(view))
+    hidden = [m for m in range(b.match_count) if m not in shown]
+    assert b.reset_match not in hidden  # 결승 전에는 리셋 경기도 (대기)로 보인다
+    for m in hidden:
+        assert view.page_of_match(m) == view._round_page[b.round_of[m]]
@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+discord = pytest.importorskip("discord")
+pytest.importorskip("aiohttp")
+
+from bulk import BulkExecutor, is_transient  # noqa: E402
+
+
+class Tracker:
+    # 동시에 실행 중인 호출 수(전체 / 라우트별)의 최댓값을 기록한다
+    def __init__(self):
+        self.active = {}
+        self.peak = 0
+        self.route_peak = {}
+        self.started = []
+
+    def call(self, route, result=None, delay=0.01):
+        async def factory():
+            self.started.append(route)
+            self.active[route] = self.active.get(route, 0) + 1
+            self.peak = max(self.peak, sum(self.active.values()))
+            self.route_peak[route] = max(self.route_peak.get(route, 0), self.active[route])
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.active[route] -= 1
+            return result if result is not None else route
+        return route, factory
+
+
+def _http_error(status):
+    return discord.HTTPException(SimpleNamespace(status=status, reason="error"), "error")
+
+
+def test_concurrency_bounds():
+    tracker = Tracker()
+    executor = BulkExecutor(concurrency=4, per_route=2)
+    calls = [tracker.call(f"r{i % 3}") for i in range(40)]
+    result = asyncio.run(executor.run(calls))
+    assert result.ok == [f"r{i % 3}" for i in range(40)]
+    assert tracker.peak == 4
+    assert max(tracker.route_peak.values()) == 2
+
+
+def test_hot_route_does_not_hold_global_slots():
+    # 한 라우트에 몰린 호출이 앞에 있어도 다른 라우트 호출은 바로 시작한다
+    tracker = Tracker()
+    executor = BulkExecutor(concurrency=4, per_route=1)
+    calls = [tracker.call("hot") for _ in range(10)] + [tracker.call(r) for r in ("a", "b", "c")]
+    asyncio.run(executor.run(calls))
+    assert set(tracker.started[:4]) == {"hot", "a", "b", "c"}
+    assert tracker.route_peak["hot"] == 1
+    assert tracker.peak == 4
+
+
+def test_transient_errors_are_retried():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _http_error(503)
+        return "ok"
+
+    executor = BulkExecutor(retries=3, base_delay=0.001)
+    result = asyncio.run(executor.run([("r", flaky)]))
+    assert result.ok == ["ok"] and result.failed == []
+    assert len(attempts) == 3
+
+
+def test_partial_failures_are_reported_in_order():
+    counts = {}
+
+    def failing(name, error):
+        async def factory():
+            counts[name] = counts.get(name, 0) + 1
+            raise error
+        return name, factory
+
+    async def fine():
+        return "done"
+
+    permanent = _http_error(403)
+    calls = [("ok1", fine), failing("forbidden", permanent), failing("down", asyncio.TimeoutError()), ("ok2", fine)]
+    executor = BulkExecutor(retries=2, base_delay=0.001)
+    result = asyncio.run(executor.run(calls))
+
+    assert result.results[0] == result.results[3] == "done"
+    assert result.results[1] is permanent
+    assert isinstance(result.results[2], asyncio.TimeoutError)
+    assert result.ok == ["done", "done"]
+    assert len(result.failed) == 2
+    # 영구 실패는 재시도하지 않고, 일시적 실패는 retries번까지 다시 시도한다
+    assert counts == {"forbidden": 1, "down": 3}
+
+
+def test_progress_is_reported():
+    tracker = Tracker()
+    reports = []
+
+    async def progress(done, total):
+        reports.append((done, total))
+
+    executor = BulkExecutor(concurrency=1, per_route=1)
+    calls = [tracker.call(i, delay=0.02) for i in range(5)]
+    asyncio.run(executor.run(calls, progress=progress, progress_interval=0.03))
+    assert reports and all(total == 5 for _, total in reports)
+    assert [done for done, _ in reports] == sorted(done for done, _ in reports)
+    assert 0 < reports[0][0] < 5
+
+
+def test_is_transient():
+    assert is_transient(_http_error(429))
+    assert is_transient(_http_error(502))
+    assert not is_transient(_http_error(404))
+    assert is_transient(asyncio.TimeoutError())
+    assert not is_transient(ValueError())
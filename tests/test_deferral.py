@@ -0,0 +1,158 @@
+import asyncio
+import datetime
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from deferral import DeferWatchdog  # noqa: E402
+
+
+class FakeMessage:
+    def __init__(self, log):
+        self.log = log
+
+    async def delete(self, delay=None):
+        self.log.append(("delete", delay))
+
+
+class FakeFollowup:
+    def __init__(self, log):
+        self.log = log
+
+    async def send(self, wait=False, **kwargs):
+        self.log.append(("followup", kwargs.get("content"), bool(kwargs.get("ephemeral"))))
+        return FakeMessage(self.log)
+
+
+class FakeCommand:
+    def __init__(self, mode):
+        self.qualified_name = "cmd"
+        self.extras = {"defer": mode} if mode else {}
+
+
+class FakeInteraction:
+    # 디스코드 API 대신 응답 호출을 log에 기록한다
+    __slots__ = ("id", "created_at", "_cs_response", "followup", "command", "log")
+
+    def __init__(self, id, mode="public", age=0.0):
+        self.id = id
+        self.created_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=age)
+        self.log = []
+        self.followup = FakeFollowup(self.log)
+        self.command = FakeCommand(mode)
+        self._cs_response = None
+
+    @property
+    def response(self):
+        return self._cs_response
+
+    async def edit_original_response(self, content=None, **kwargs):
+        self.log.append(("edit_original", content))
+
+
+@pytest.fixture(autouse=True)
+def fake_http(monkeypatch):
+    async def defer(self, *, ephemeral=False, thinking=False):
+        await asyncio.sleep(0.02)  # 디스코드 왕복
+        self._response_type = discord.InteractionResponseType.deferred_channel_message
+        self._parent.log.append(("defer", ephemeral))
+
+    async def send_message(self, content=None, **kwargs):
+        await asyncio.sleep(0.02)
+        self._response_type = discord.InteractionResponseType.channel_message
+        self._parent.log.append(("send", content, bool(kwargs.get("ephemeral"))))
+
+    monkeypatch.setattr(discord.InteractionResponse, "defer", defer)
+    monkeypatch.setattr(discord.InteractionResponse, "send_message", send_message)
+
+
+async def _handle(watchdog, interaction, work, **kwargs):
+    watchdog.watch(interaction)
+    await asyncio.sleep(work)
+    await interaction.response.send_message("result", **kwargs)
+    watchdog.done(interaction)
+
+
+def test_fast_handler_is_not_deferred():
+    async def main():
+        watchdog = DeferWatchdog(0.1)
+        it = FakeInteraction(1)
+        await _handle(watchdog, it, 0.0)
+        await asyncio.sleep(0.15)
+        assert it.log == [("send", "result", False)]
+        assert watchdog.deferred == 0 and len(watchdog) == 0
+
+    asyncio.run(main())
+
+
+def test_slow_handler_is_deferred_and_followed_up():
+    async def main():
+        deferred = []
+        watchdog = DeferWatchdog(0.05, on_defer=lambda it: deferred.append(it.id))
+        it = FakeInteraction(1)
+        await _handle(watchdog, it, 0.2)
+        assert it.log == [("defer", False), ("followup", "result", False)]
+        assert deferred == [1] and watchdog.deferred == 1
+
+    asyncio.run(main())
+
+
+def test_budget_counts_gateway_delay():
+    async def main():
+        watchdog = DeferWatchdog(0.1)
+        # 이미 budget보다 오래된 인터랙션은 바로 defer된다
+        it = FakeInteraction(1, age=5.0)
+        await _handle(watchdog, it, 0.05)
+        assert it.log[0] == ("defer", False)
+
+    asyncio.run(main())
+
+
+def test_reply_racing_the_defer_answers_once():
+    async def main():
+        for work in (0.04, 0.05, 0.06, 0.07):
+            watchdog = DeferWatchdog(0.05)
+            it = FakeInteraction(1)
+            await _handle(watchdog, it, work)
+            await asyncio.sleep(0.05)
+            first = [e[0] for e in it.log if e[0] in ("send", "defer")]
+            # 응답(send / defer)은 정확히 한 번, defer됐다면 결과는 followup으로
+            assert len(first) == 1, it.log
+            if first == ["defer"]:
+                assert it.log[-1] == ("followup", "result", False)
+
+    asyncio.run(main())
+
+
+def test_ephemeral_command_defers_ephemerally():
+    async def main():
+        watchdog = DeferWatchdog(0.05)
+        it = FakeInteraction(1, mode="ephemeral")
+        await _handle(watchdog, it, 0.2, ephemeral=True)
+        assert it.log == [("defer", True), ("followup", "result", True)]
+
+    asyncio.run(main())
+
+
+def test_ephemeral_reply_after_public_defer_is_not_public():
+    async def main():
+        watchdog = DeferWatchdog(0.05)
+        it = FakeInteraction(1, mode="public")
+        await _handle(watchdog, it, 0.2, ephemeral=True, delete_after=3)
+        # "생각 중" 메시지는 안내로 바뀌고 결과는 별도의 비공개 followup
+        assert it.log == [
+            ("defer", False), ("edit_original", "✅ 처리 완료"), ("followup", "result", True), ("delete", 3)
+        ]
+
+    asyncio.run(main())
+
+
+def test_undeclared_command_is_not_watched():
+    async def main():
+        watchdog = DeferWatchdog(0.01)
+        it = FakeInteraction(1, mode=None)
+        assert watchdog.watch(it) is None
+        assert len(watchdog) == 0
+
+    asyncio.run(main())
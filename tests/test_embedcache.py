@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from embedcache import EmbedCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _builder(calls, value="embed", delay=0.0):
+    async def build():
+        calls.append(value)
+        if delay:
+            await asyncio.sleep(delay)
+        return f"{value}#{len(calls)}"
+    return build
+
+
+def test_hit_until_invalidated_or_expired():
+    clock = Clock()
+    cache = EmbedCache(ttl=30, clock=clock)
+    calls = []
+
+    async def run():
+        first = await cache.get(1, "leaderboard", "points", _builder(calls))
+        assert await cache.get(1, "leaderboard", "points", _builder(calls)) == first
+        # 다른 주제가 바뀌어도 그대로
+        cache.invalidate(1, "vc")
+        assert await cache.get(1, "leaderboard", "points", _builder(calls)) == first
+        cache.invalidate(1, "points")
+        second = await cache.get(1, "leaderboard", "points", _builder(calls))
+        assert second != first
+        clock.now += 31
+        assert await cache.get(1, "leaderboard", "points", _builder(calls)) != second
+
+    asyncio.run(run())
+    assert len(calls) == 3
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_concurrent_requests_build_once():
+    cache = EmbedCache()
+    calls = []
+
+    async def run():
+        return await asyncio.gather(*(cache.get(1, "vc_rank", "vc", _builder(calls, delay=0.01)) for _ in range(20)))
+
+    results = asyncio.run(run())
+    assert calls == ["embed"]
+    assert len(set(results)) == 1 and cache.coalesced == 19
+
+
+def test_write_during_build_is_not_cached():
+    cache = EmbedCache()
+    calls = []
+
+    async def run():
+        async def build():
+            calls.append(1)
+            cache.invalidate(1, "points")
+            return len(calls)
+
+        assert await cache.get(1, "leaderboard", "points", build) == 1
+        assert await cache.get(1, "leaderboard", "points", build) == 2
+
+    asyncio.run(run())
+
+
+def test_lru_bound():
+    cache = EmbedCache(max_entries=3)
+    calls = []
+
+    async def run():
+        for gid in range(5):
+            await cache.get(gid, "leaderboard", "points", _builder(calls))
+        await cache.get(4, "leaderboard", "points", _builder(calls))
+
+    asyncio.run(run())
+    assert len(cache) == 3 and len(calls) == 5
+
+
+def test_build_error_reaches_every_waiter_and_is_not_cached():
+    cache = EmbedCache()
+
+    async def run():
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *(cache.get(1, "leaderboard", "points", broken) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(cache) == 0
+        with pytest.raises(RuntimeError):
+            await cache.get(1, "leaderboard", "points", broken)
+
+    asyncio.run(run())
@@ -0,0 +1,37 @@
+from guildstate import GuildState
+
+
+def test_columns_behave_like_dicts():
+    state = GuildState(1)
+    state.points[10] = 5
+    state.vc_time[11] = 2.5
+    assert state.points.get(10) == 5
+    assert state.points.get(11) is None and 11 not in state.points
+    assert 11 in state.vc_time and len(state) == 2
+    assert state.points.pop(10) == 5 and state.points.pop(10, -1) == -1
+    assert len(state.points) == 0
+    state.points[10] = 7
+    assert dict(state.points.items()) == {10: 7}
+
+
+def test_bulk_update_on_empty_state():
+    state = GuildState(1)
+    points = {uid: uid * 2 for uid in range(1000, 2000)}
+    state.points.update(points)
+    state.vc_time.update({1500: 1.5, 9999: 3.0})
+    assert dict(state.points.items()) == points
+    assert len(state.points) == 1000
+    assert dict(state.vc_time.items()) == {1500: 1.5, 9999: 3.0}
+    assert state.vc_join.get(1500) is None
+    assert len(state) == 1001
+    # 모든 컬럼의 길이가 행 수와 같아야 한다
+    for column in (state.points, state.vc_time, state.vc_join, state.vc_paid):
+        assert len(column._values) == len(column._present) == len(state)
+
+
+def test_update_mixes_existing_and_new_members():
+    state = GuildState(1)
+    state.points[1] = 1
+    state.points.update({1: 10, 2: 20})
+    assert dict(state.points.items()) == {1: 10, 2: 20}
+    assert len(state.points) == 2 and len(state) == 2
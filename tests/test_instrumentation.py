@@ -0,0 +1,55 @@
+import asyncio
+import random
+import types
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from instrumentation import HdrHistogram, Instrumentation, _current  # noqa: E402
+from metrics import Registry  # noqa: E402
+
+
+def test_hdr_percentiles_within_relative_error():
+    rng = random.Random(1)
+    values = sorted(rng.randrange(1, 10_000_000) for _ in range(20000))
+    hist = HdrHistogram()
+    for v in values:
+        hist.record(v)
+    for p in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * p / 100) - 1]
+        assert abs(hist.percentile(p) - exact) / exact < 0.04
+    assert hist.percentile(100) == values[-1]
+    # 여러 분위수를 한 번에 구해도 하나씩 구한 것과 같다
+    ps = [50, 90, 99, 99.9, 100]
+    assert hist.percentiles(ps) == [hist.percentile(p) for p in ps]
+    assert HdrHistogram().percentiles(ps) == [0] * 5
+
+
+def test_finish_records_first_response_and_api_calls_only():
+    instr = Instrumentation()
+    registry = Registry()
+    instr.register(registry)
+    interaction = types.SimpleNamespace(extras={})
+
+    async def handler():
+        instr.begin(interaction)
+        for _ in range(3):
+            await instr._on_request_start(None, None, None)
+        callback = types.SimpleNamespace(url=types.SimpleNamespace(path="/interactions/1/abc/callback"))
+        await instr._on_request_end(None, None, callback)
+        return instr.finish(interaction, "ping")
+
+    duration = asyncio.run(handler())
+    assert duration is not None and duration >= 0
+    stats = instr.commands["ping"]
+    assert stats.api_calls.count == 1 and stats.api_calls.max == 3
+    assert stats.first_response.count == 1
+    assert instr.finish(interaction, "ping") is None
+    assert _current.get() is None
+
+    text = registry.render()
+    assert "gamerbot_command_first_response_seconds" in text
+    assert "gamerbot_command_api_calls" in text
+    # 전체 처리 시간은 봇의 gamerbot_command_duration_seconds가 맡는다
+    assert "gamerbot_command_handler_seconds" not in text
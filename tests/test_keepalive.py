@@ -0,0 +1,83 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from keepalive import HealthServer  # noqa: E402
+from metrics import Registry  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_routes():
+    status = {"ok": False, "latency": None, "guilds": 0}
+    reg = Registry()
+    reg.counter("gamerbot_test_total", "테스트").inc()
+
+    async def run():
+        port = _free_port()
+        server = HealthServer(lambda: status, reg.render_async, port=port)
+        await server.start()
+        base = f"http://127.0.0.1:{port}"
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(base + "/") as resp:
+                    assert resp.status == 200
+                    assert await resp.text() == "GamerToolBot is alive!"
+
+                # 준비 전에는 503, 준비되면 200
+                async with session.get(base + "/healthz") as resp:
+                    assert resp.status == 503
+                    assert resp.content_type == "application/json"
+                    assert json.loads(await resp.text()) == status
+                status["ok"] = True
+                async with session.get(base + "/healthz") as resp:
+                    assert resp.status == 200
+
+                async with session.get(base + "/metrics") as resp:
+                    assert resp.status == 200
+                    assert resp.content_type == "text/plain"
+                    body = await resp.text()
+                    assert "# TYPE gamerbot_test_total counter" in body
+                    assert "gamerbot_test_total 1" in body.splitlines()
+        finally:
+            await server.stop()
+
+        # 멈춘 뒤에는 포트가 닫힌다
+        with pytest.raises(OSError):
+            await asyncio.open_connection("127.0.0.1", port)
+
+    asyncio.run(run())
+
+
+def test_bot_opens_port_before_login(tmp_path, monkeypatch):
+    pytest.importorskip("discord")
+    port = _free_port()
+    monkeypatch.setenv("DISCORD_TOKEN", "test")
+    monkeypatch.setenv("GUILD_ID", "1")
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "bot.db"))
+    monkeypatch.setenv("PORT", str(port))
+    for name in ("SHARD_COUNT", "SHARD_IDS"):
+        monkeypatch.delenv(name, raising=False)
+    import bot
+
+    order = []
+
+    async def start(token):
+        # 로그인 시점에는 이미 포트가 열려 있어야 한다
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/healthz") as resp:
+                order.append(("login", token, resp.status))
+
+    monkeypatch.setattr(bot.bot, "start", start)
+    asyncio.run(bot.run_bot("token"))
+    assert order == [("login", "token", 503)]
+    # 종료하면 헬스 서버도 닫힌다
+    assert bot.bot.health is None or bot.bot.health._runner is None
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import launcher  # noqa: E402
+
+
+class FakeProc:
+    def __init__(self, shard_ids):
+        self.shard_ids = shard_ids
+        self.code = None
+        self.terminated = False
+
+    def poll(self):
+        return self.code
+
+    def terminate(self):
+        self.terminated = True
+
+    def wait(self):
+        return self.code
+
+
+def test_restart_waits_per_child_without_blocking_others():
+    now = [0.0]
+    started = []
+
+    def start(r):
+        proc = FakeProc(r)
+        started.append(proc)
+        return proc
+
+    sup = launcher.Supervisor([[0], [1]], start, delay=5.0, clock=lambda: now[0])
+    first, second = sup.procs
+    first.code = 1
+    sup.tick()
+    assert sup.procs[0] is None and sup.restart_at == {0: 5.0}
+
+    # 기다리는 동안에도 다른 프로세스 종료를 바로 처리한다
+    now[0] = 2.0
+    second.code = 1
+    sup.tick()
+    assert sup.restart_at == {0: 5.0, 1: 7.0}
+
+    now[0] = 5.0
+    sup.tick()
+    assert sup.procs[0] is started[2] and sup.procs[0].shard_ids == [0]
+    assert sup.procs[1] is None
+
+    now[0] = 7.0
+    sup.tick()
+    assert sup.procs[1].shard_ids == [1] and not sup.restart_at
+
+    sup.stop()
+    assert all(p.terminated for p in sup.procs)
+
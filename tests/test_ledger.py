@@ -0,0 +1,61 @@
+import asyncio
+
+from guildstate import GuildState
+from ledger import PointsLedger
+from storage import LazyGuildMap, Storage
+
+
+def _ledger(storage, calls=None):
+    states = LazyGuildMap(GuildState)
+    on_totals = (lambda gid, applied: calls.append((gid, applied))) if calls is not None else None
+    return PointsLedger(storage, states, on_totals=on_totals, clock=lambda: 100.0), states
+
+
+def test_apply_updates_totals_and_log(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    calls = []
+    ledger, states = _ledger(storage, calls)
+    applied = ledger.apply(1, [(10, 5), (11, 3)], "grant")
+    assert applied == [(10, 5), (11, 3)]
+    assert ledger.grant(1, 10, -2) == 3
+    assert states[1].points.get(10) == 3
+    assert calls[0] == (1, [(10, 5), (11, 3)])
+    asyncio.run(storage.flush())
+    rows = storage._query("SELECT user_id, amount, reason, created FROM points_log ORDER BY seq")
+    assert rows == [(10, 5, "grant", 100.0), (11, 3, "grant", 100.0), (10, -2, "", 100.0)]
+    assert storage.load_members("points", 1) == {10: 3, 11: 3}
+    asyncio.run(storage.close())
+
+
+def test_idempotency_key_in_memory(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    ledger, states = _ledger(storage)
+    first = ledger.apply(1, [(10, 5)], "grant", "k1")
+    again = ledger.apply(1, [(10, 5)], "grant", "k1")
+    assert first == again == [(10, 5)]
+    assert states[1].points.get(10) == 5
+    asyncio.run(storage.close())
+
+
+def test_idempotency_key_survives_restart(tmp_path):
+    path = str(tmp_path / "t.db")
+    storage = Storage(path)
+    ledger, _ = _ledger(storage)
+    ledger.apply(1, [(10, 5), (11, 5)], "grant", "k1")
+    asyncio.run(storage.close())
+
+    # 재시작: 메모리의 키 기록은 없고 합계는 저장소에서 다시 읽는다
+    storage = Storage(path)
+    states = LazyGuildMap(lambda gid: _load(storage, gid))
+    ledger = PointsLedger(storage, states)
+    again = ledger.apply(1, [(10, 5), (11, 5)], "grant", "k1")
+    assert again == [(10, 5), (11, 5)]
+    assert states[1].points.get(10) == 5
+    assert ledger.apply(1, [(10, 1)], "grant", "k2") == [(10, 6)]
+    asyncio.run(storage.close())
+
+
+def _load(storage, guild_id):
+    state = GuildState(guild_id)
+    state.points.update(storage.load_members("points", guild_id))
+    return state
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from metrics import Histogram, LoopLagMonitor, Registry
+
+
+def test_counter_and_gauge_exposition():
+    reg = Registry()
+    c = reg.counter("cmds_total", "커맨드 수", ("command",))
+    c.inc(("ping",))
+    c.inc(("ping",), 2)
+    c.inc(('say "hi"\n',))
+    sizes = {("points",): 3, ("vc_join",): 0}
+    reg.gauge("state_entries", "상태 크기", ("map",), fn=lambda: sizes)
+    lag = reg.gauge("loop_lag_seconds", "루프 지연")
+    lag.set(0.25)
+
+    text = reg.render()
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert lines[:2] == ["# HELP cmds_total 커맨드 수", "# TYPE cmds_total counter"]
+    assert 'cmds_total{command="ping"} 3' in lines
+    # 라벨 값의 따옴표 / 줄바꿈은 이스케이프
+    assert 'cmds_total{command="say \\"hi\\"\\n"} 1' in lines
+    assert "# TYPE state_entries gauge" in lines
+    assert 'state_entries{map="points"} 3' in lines
+    assert "loop_lag_seconds 0.25" in lines
+
+    # fn 게이지는 스크레이프할 때마다 다시 계산한다
+    sizes[("points",)] = 7
+    assert 'state_entries{map="points"} 7' in reg.render().splitlines()
+
+
+def test_histogram_buckets_are_cumulative():
+    reg = Registry()
+    h = reg.histogram("dur_seconds", "처리 시간", ("command",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        h.observe(value, ("roll",))
+    lines = reg.render().splitlines()
+    assert "# TYPE dur_seconds histogram" in lines
+    assert 'dur_seconds_bucket{command="roll",le="0.1"} 1' in lines
+    assert 'dur_seconds_bucket{command="roll",le="1.0"} 3' in lines
+    assert 'dur_seconds_bucket{command="roll",le="+Inf"} 4' in lines
+    assert sum(1 for line in lines if "+Inf" in line) == 1
+    assert 'dur_seconds_sum{command="roll"} 4.25' in lines
+    assert 'dur_seconds_count{command="roll"} 4' in lines
+
+
+def test_registering_same_name_replaces_metric():
+    reg = Registry()
+    reg.counter("x_total", "a")
+    reg.counter("x_total", "b")
+    assert reg.render().count("# TYPE x_total") == 1
+
+
+def test_loop_lag_monitor_records_blocking():
+    reg = Registry()
+    gauge = reg.gauge("lag", "lag")
+    hist = Histogram("lag_hist", "lag", buckets=(0.01, 0.1))
+
+    async def run():
+        monitor = LoopLagMonitor(gauge, hist, interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.005)
+        time.sleep(0.05)  # 루프를 막는다
+        await asyncio.sleep(0.03)
+        monitor.stop()
+
+    asyncio.run(run())
+    assert hist.series[()][-1] >= 1
+    # 막힌 50 ms 중 대부분이 지연으로 잡힌다
+    assert hist.series[()][-2] >= 0.03
+
+
+def test_render_async_yields_and_matches_render():
+    reg = Registry()
+    h = reg.histogram("h_seconds", "h", ("command",))
+    for i in range(300):
+        h.observe(i / 100, (f"c{i % 50}",))
+    expected = reg.render()
+    ticks = []
+
+    async def run():
+        async def writer():
+            # 렌더 중에 새 시리즈가 생겨도 (dict 크기 변경) 실패하지 않는다
+            while True:
+                ticks.append(1)
+                h.observe(0.5, (f"new{len(ticks)}",))
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(writer())
+        await asyncio.sleep(0)
+        text = await reg.render_async(slice_seconds=0)
+        task.cancel()
+        return text
+
+    text = asyncio.run(run())
+    assert len(ticks) > 10  # 렌더하는 동안 다른 코루틴이 돌았다
+    # 원래 있던 시리즈는 모두 그대로 나온다
+    lines = set(text.splitlines())
+    assert all(line in lines for line in expected.splitlines())
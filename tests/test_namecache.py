@@ -0,0 +1,109 @@
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("discord")
+
+from namecache import NameCache  # noqa: E402
+from storage import Storage  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeGuild:
+    # get_member는 cached만, query_members는 known 전체를 본다
+    def __init__(self, known, cached=()):
+        self.id = 1
+        self.known = known
+        self.cached = set(cached)
+        self.queries = []
+        self.fail = False
+
+    def get_member(self, uid):
+        if uid in self.cached:
+            return types.SimpleNamespace(id=uid, display_name=self.known[uid])
+        return None
+
+    async def query_members(self, user_ids, limit, cache):
+        assert limit == len(user_ids) <= 100 and cache is False
+        self.queries.append(list(user_ids))
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("gateway timeout")
+        return [types.SimpleNamespace(id=u, display_name=self.known[u]) for u in user_ids if u in self.known]
+
+
+def _names(ids):
+    return {uid: f"name{uid}" for uid in ids}
+
+
+def test_misses_are_batched_and_persisted(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    guild = FakeGuild(_names(range(300)), cached=[0])
+    cache = NameCache(storage, clock=Clock())
+    names = asyncio.run(cache.resolve(guild, list(range(251))))
+    assert names == _names(range(251))
+    assert [len(q) for q in guild.queries] == [100, 100, 50]
+    asyncio.run(storage.flush())
+
+    # 재시작 뒤에도 저장된 이름으로 바로 답한다
+    restarted = NameCache(storage, clock=Clock())
+    guild.queries.clear()
+    assert asyncio.run(restarted.resolve(guild, [5, 250])) == {5: "name5", 250: "name250"}
+    assert guild.queries == [] and restarted.hits == 2
+    asyncio.run(storage.close())
+
+
+def test_unknown_users_are_remembered_briefly(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    clock = Clock()
+    guild = FakeGuild(_names([1]))
+    cache = NameCache(storage, miss_ttl=600, clock=clock)
+    assert asyncio.run(cache.resolve(guild, [1, 2])) == {1: "name1", 2: "User 2"}
+    asyncio.run(cache.resolve(guild, [2]))
+    assert len(guild.queries) == 1
+    clock.now += 601
+    asyncio.run(cache.resolve(guild, [2]))
+    assert len(guild.queries) == 2
+    asyncio.run(storage.close())
+
+
+def test_concurrent_lookups_share_one_query(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    guild = FakeGuild(_names(range(10)))
+    cache = NameCache(storage, clock=Clock())
+
+    async def run():
+        return await asyncio.gather(*(cache.resolve(guild, [1, 2, 3]) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert all(r == {1: "name1", 2: "name2", 3: "name3"} for r in results)
+    assert guild.queries == [[1, 2, 3]]
+    asyncio.run(storage.close())
+
+
+def test_query_failure_falls_back_without_caching(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    guild = FakeGuild(_names([1]))
+    guild.fail = True
+    cache = NameCache(storage, clock=Clock())
+    assert asyncio.run(cache.resolve(guild, [1])) == {1: "User 1"}
+    guild.fail = False
+    assert asyncio.run(cache.resolve(guild, [1])) == {1: "name1"}
+    asyncio.run(storage.close())
+
+
+def test_lru_bound(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    guild = FakeGuild(_names(range(50)))
+    cache = NameCache(storage, max_entries=10, clock=Clock())
+    asyncio.run(cache.resolve(guild, list(range(50))))
+    assert len(cache) == 10
+    asyncio.run(storage.close())
@@ -0,0 +1,28 @@
+import random
+
+from paging import FIELD_LIMIT, chunk_lines
+
+
+def test_chunks_respect_limit_and_keep_lines_whole():
+    rng = random.Random(1)
+    lines = [f"#{i}: " + "x" * rng.randint(0, 120) for i in range(500)]
+    for limit in (130, 300, FIELD_LIMIT):
+        chunks = chunk_lines(lines, limit)
+        assert all(len(chunk) <= limit for chunk in chunks)
+        # 줄은 나뉘지 않고 순서대로 모두 들어 있다
+        assert [line for chunk in chunks for line in chunk.split("\n")] == lines
+        # 다음 덩어리의 첫 줄이 들어갈 자리가 없을 때만 넘어간다
+        for chunk, nxt in zip(chunks, chunks[1:]):
+            assert len(chunk) + 1 + len(nxt.split("\n")[0]) > limit
+
+
+def test_exact_fit_and_empty():
+    assert chunk_lines([]) == []
+    assert chunk_lines(["aaaa", "bbbbb"], 10) == ["aaaa\nbbbbb"]
+    assert chunk_lines(["aaaa", "bbbbbb"], 10) == ["aaaa", "bbbbbb"]
+
+
+def test_overlong_line_is_truncated_alone():
+    chunks = chunk_lines(["short", "y" * 30, "tail"], 10)
+    assert chunks == ["short", "y" * 9 + "…", "tail"]
+    assert all(len(chunk) <= 10 for chunk in chunks)
@@ -0,0 +1,45 @@
+from pinball import EMPTY_CELL, PAGE_SIZE, PinballRun
+
+
+def _board(run, page):
+    # 캐시 없이 높이만으로 다시 그린 보드
+    start, end = page * PAGE_SIZE, min(run.n, (page + 1) * PAGE_SIZE)
+    lines = []
+    for row in range(run.max_height):
+        cells = []
+        for i in range(start, end):
+            h = run.heights[i]
+            cells.append(f"{run.symbols[i]} " if h > 0 and run.max_height - h == row else EMPTY_CELL)
+        lines.append("".join(cells))
+    lines.append("🟦 " * (end - start))
+    return "\n".join(lines)
+
+
+def test_same_seed_same_finish_order():
+    first = PinballRun(30, 7)
+    again = PinballRun(30, 7)
+    assert first.finish_order == again.finish_order
+    assert [list(m) for m in first.moves] == [list(m) for m in again.moves]
+    assert sorted(first.finish_order) == list(range(30))
+    # 재시작 / 버전이 바뀌어도 같은 시드는 같은 결과 (random.Random의 getrandbits만 사용)
+    assert PinballRun(8, 42).finish_order == [2, 3, 0, 4, 5, 1, 7, 6]
+    assert any(PinballRun(30, seed).finish_order != first.finish_order for seed in range(8, 12))
+
+
+def test_unfinished_balls_follow_in_number_order():
+    run = PinballRun(6, 3, max_frames=16)
+    assert len(run.moves) == 16
+    falls = [sum(i in m for m in run.moves) for i in range(6)]
+    arrived = sum(1 for f in falls if f == run.max_height)
+    assert 0 < arrived < 6
+    rest = run.finish_order[arrived:]
+    assert rest == sorted(rest) and all(falls[i] < run.max_height for i in rest)
+
+
+def test_replay_matches_simulation_and_renders_changed_rows():
+    run = PinballRun(25, 11)
+    for _ in run.frames():
+        for page in range(run.pages):
+            assert run.render(page) == _board(run, page)
+    assert run.arrived == run.finish_order[:len(run.arrived)]
+    assert all(h == 0 for i, h in enumerate(run.heights) if i in run.arrived)
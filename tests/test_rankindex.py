@@ -0,0 +1,58 @@
+import random
+
+from rankindex import RankIndex
+
+
+def _expected(scores):
+    return sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def _check(index, scores):
+    order = _expected(scores)
+    assert index.top(len(order) + 5) == order
+    assert len(index) == len(scores)
+    for rank, (uid, _) in enumerate(order, start=1):
+        assert index.rank(uid) == rank
+
+
+def test_matches_sorted_reference_under_random_updates():
+    rng = random.Random(7)
+    scores = {uid: rng.randint(0, 50) for uid in range(3000)}
+    index = RankIndex(scores.items(), load=16)
+    for _ in range(5000):
+        uid = rng.randrange(3500)
+        if rng.random() < 0.1:
+            index.remove(uid)
+            scores.pop(uid, None)
+        else:
+            score = rng.randint(0, 50)
+            index.update(uid, score)
+            scores[uid] = score
+    _check(index, scores)
+    assert index.rank(10**9) is None
+
+
+def test_ties_break_by_id():
+    index = RankIndex([(3, 10), (1, 10), (2, 20)])
+    assert index.top(3) == [(2, 20), (1, 10), (3, 10)]
+    assert index.rank(3) == 3
+
+
+def test_from_chunks_equals_rebuild():
+    rng = random.Random(3)
+    scores = {rng.randrange(10**18): rng.randint(-100, 100) for _ in range(20000)}
+    chunked = RankIndex.from_chunks(scores.items(), chunk=777, load=64)
+    _check(chunked, scores)
+    assert chunked.top(50) == RankIndex(scores.items(), load=64).top(50)
+    # 만든 뒤 증분 갱신도 그대로 동작
+    uid = next(iter(scores))
+    chunked.update(uid, 1000)
+    scores[uid] = 1000
+    _check(chunked, scores)
+
+
+def test_from_chunks_empty():
+    index = RankIndex.from_chunks(())
+    assert len(index) == 0 and index.top(10) == []
+    index.update(1, 5)
+    assert index.top(1) == [(1, 5)]
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from rating import RatingBook
+from storage import Storage
+
+
+def _save(storage, guild_id, book, winner, loser):
+    # bot.record_rating과 같은 저장 방식
+    book.record(winner, loser)
+    storage.append("rating_log", [(guild_id, winner, loser, 0.0)])
+    storage.put("ratings", (guild_id,), book)
+
+
+def _load(storage, guild_id):
+    data = storage.load_json("ratings", guild_id)
+    log = storage.log_rows("rating_log", guild_id, ("winner", "loser"))
+    return RatingBook.from_dict(data, log) if data is not None else RatingBook.from_log(log)
+
+
+def test_record_is_zero_sum():
+    book = RatingBook()
+    rw, rl, delta = book.record("a", "b")
+    assert delta == 16.0
+    assert rw + rl == 3000.0
+    assert book.top(2) == [("a", 1516.0, 1), ("b", 1484.0, 1)]
+
+
+def test_snapshot_does_not_contain_history():
+    book = RatingBook()
+    for i in range(200):
+        book.record(f"p{i % 7}", f"p{(i + 3) % 7}")
+    data = book.to_dict()
+    assert data["matches"] == 200
+    assert "winners" not in data
+    # 스냅샷 크기는 경기 수가 아니라 참가자 수에 비례
+    assert len(json.dumps(data)) < 400
+
+
+def test_log_and_snapshot_roundtrip(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    book = RatingBook()
+    for i in range(50):
+        _save(storage, 1, book, f"p{i % 5}", f"p{(i + 2) % 5}")
+    asyncio.run(storage.flush())
+    assert len(storage.log_rows("rating_log", 1, ("winner",))) == 50
+
+    loaded = _load(storage, 1)
+    assert len(loaded) == 50
+    assert list(loaded.ratings) == list(book.ratings)
+    assert loaded.top(5) == book.top(5)
+    asyncio.run(storage.close())
+
+
+def test_snapshot_behind_log_replays(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    book = RatingBook()
+    _save(storage, 1, book, "a", "b")
+    stale = book.to_dict()
+    _save(storage, 1, book, "c", "a")
+    asyncio.run(storage.flush())
+    storage.put("ratings", (1,), stale)
+    asyncio.run(storage.flush())
+
+    loaded = _load(storage, 1)
+    assert len(loaded) == 2
+    assert [round(r, 6) for r in loaded.ratings] == [round(r, 6) for r in book.ratings]
+    asyncio.run(storage.close())
+
@@ -0,0 +1,83 @@
+import asyncio
+import random
+from collections import Counter
+
+from rng import Draw, RngService
+from storage import Storage
+
+# 자유도별 카이제곱 임계값 (유의수준 0.001)
+CHI2_CRITICAL = {4: 18.47, 9: 27.88, 19: 43.82}
+
+
+def chi2(counts, expected):
+    return sum((c - expected) ** 2 / expected for c in counts)
+
+
+def test_same_root_seed_reproduces_draws():
+    a = RngService(1234)
+    b = RngService(1234)
+    for _ in range(20):
+        assert a.draw(1, "t").record.seed == b.draw(1, "t").record.seed
+    # 길드가 다르면 시드 순서도 다르다
+    assert RngService(1234).draw(2, "t").record.seed != RngService(1234).draw(1, "t").record.seed
+
+
+def test_recorded_seed_replays_result():
+    service = RngService(99)
+    draw = service.draw(1, "roulette")
+    items = list(range(50))
+    draw.shuffle(items)
+    draw.done(",".join(map(str, items)))
+    replay = service.draw(1, "roulette", draw.record.seed)
+    again = list(range(50))
+    replay.shuffle(again)
+    assert again == items
+    assert [r.command for r in service.history(1)] == ["roulette", "roulette"]
+
+
+def test_restart_continues_instead_of_replaying(tmp_path):
+    path = str(tmp_path / "t.db")
+    storage = Storage(path)
+    service = RngService(7, storage=storage)
+    before = [service.draw(1, "t").record.seed for _ in range(4)]
+    asyncio.run(storage.close())
+
+    # 같은 루트 시드로 재시작해도 저장된 추첨 번호부터 이어서 뽑는다
+    storage = Storage(path)
+    service = RngService(7, storage=storage)
+    after = [service.draw(1, "t").record.seed for _ in range(4)]
+    asyncio.run(storage.close())
+    assert len(set(before + after)) == 8
+    # 저장소 없이 처음부터 세면 재시작 전과 같은 순서
+    assert [RngService(7).draw(1, "t").record.seed] == before[:1]
+
+
+def test_draw_seeds_are_uniform():
+    # 추첨마다 새로 뽑는 32비트 시드의 상위 비트 분포
+    service = RngService(2024)
+    buckets = Counter(service.draw(1, "t").record.seed >> 28 for _ in range(64_000))
+    assert chi2([buckets[i] for i in range(16)], 4_000) < 37.70  # 자유도 15
+
+
+def test_choice_is_uniform_over_million_draws():
+    rng = Draw.__new__(Draw)
+    random.Random.__init__(rng, 42)
+    counts = Counter(rng.choice(range(10)) for _ in range(1_000_000))
+    assert chi2([counts[i] for i in range(10)], 100_000) < CHI2_CRITICAL[9]
+
+
+def test_first_choice_across_fresh_draws_is_uniform():
+    # 실제 커맨드처럼 추첨마다 새 Draw에서 한 번만 고른다
+    service = RngService(5)
+    counts = Counter(service.draw(1, "roulette").choice(range(20)) for _ in range(60_000))
+    assert chi2([counts[i] for i in range(20)], 3_000) < CHI2_CRITICAL[19]
+
+
+def test_shuffle_positions_are_uniform():
+    service = RngService(11)
+    positions = Counter()
+    for _ in range(50_000):
+        items = list(range(5))
+        service.draw(1, "team_split").shuffle(items)
+        positions[items.index(0)] += 1
+    assert chi2([positions[i] for i in range(5)], 10_000) < CHI2_CRITICAL[4]
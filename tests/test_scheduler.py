@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from scheduler import EventScheduler
+
+
+def test_heap_order_and_reschedule():
+    async def never(key):
+        return None
+
+    async def run():
+        s = EventScheduler(never)
+        for key, when in (("a", 30.0), ("b", 10.0), ("c", 20.0)):
+            s.add(key, when)
+        assert s._heap[0] == (10.0, "b")
+        s.reschedule("a", 5.0)
+        assert s.deadline("a") == 5.0 and s._heap[0][1] == "a"
+        assert s.cancel("a") and "a" not in s
+        assert not s.cancel("missing")
+        assert len(s) == 2 and s._heap[0][1] == "b"
+
+    asyncio.run(run())
+
+
+def test_fires_in_deadline_order_and_repeats():
+    fired = []
+
+    async def on_fire(key):
+        fired.append(key)
+        # "r"은 한 번 더 실행되도록 다시 예약
+        return time.time() + 0.01 if key == "r" and fired.count("r") < 2 else None
+
+    async def run():
+        s = EventScheduler(on_fire)
+        now = time.time()
+        s.add("late", now + 0.06)
+        s.add("r", now + 0.01)
+        s.add("early", now + 0.02)
+        s.start()
+        await asyncio.sleep(0.15)
+        await s.stop()
+
+    asyncio.run(run())
+    assert fired[0] == "r"
+    assert fired.count("r") == 2
+    assert fired.index("early") < fired.index("late")
+
+
+def test_cancel_while_firing_does_not_reschedule():
+    async def run():
+        entered = asyncio.Event()
+
+        async def on_fire(key):
+            entered.set()
+            await asyncio.sleep(0.02)
+            return time.time() + 0.01
+
+        s = EventScheduler(on_fire)
+        s.add("k", time.time())
+        s.start()
+        await entered.wait()
+        assert s.cancel("k")
+        await asyncio.sleep(0.05)
+        assert "k" not in s
+        await s.stop()
+
+    asyncio.run(run())
+
+
+def test_stop_cancels_inflight_fires():
+    async def run():
+        cancelled = []
+
+        async def on_fire(key):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(key)
+                raise
+
+        s = EventScheduler(on_fire)
+        now = time.time()
+        for i in range(5):
+            s.add(i, now)
+        s.start()
+        await asyncio.sleep(0.02)
+        assert len(s._tasks) == 5
+        await s.stop()
+        assert sorted(cancelled) == [0, 1, 2, 3, 4]
+        assert not s._tasks
+
+    asyncio.run(run())
+
+
+def test_slow_fire_does_not_block_others():
+    fired = []
+
+    async def on_fire(key):
+        if key == "slow":
+            await asyncio.sleep(0.2)
+        fired.append((key, time.time()))
+
+    async def run():
+        s = EventScheduler(on_fire)
+        now = time.time()
+        s.add("slow", now)
+        s.add("fast", now + 0.01)
+        s.start()
+        await asyncio.sleep(0.05)
+        await s.stop()
+        return now
+
+    now = asyncio.run(run())
+    assert [k for k, _ in fired] == ["fast"]
+    assert fired[0][1] - now < 0.04
@@ -0,0 +1,18 @@
+from shards import parse_shard_ids, shard_of, split_ranges
+
+
+def test_split_ranges_covers_every_shard_once():
+    ranges = split_ranges(10, 3)
+    assert ranges == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert split_ranges(2, 8) == [[0], [1]]
+
+
+def test_parse_shard_ids():
+    assert parse_shard_ids("0-3") == [0, 1, 2, 3]
+    assert parse_shard_ids("5, 2,2") == [2, 5]
+    assert parse_shard_ids("") is None
+
+
+def test_shard_of_uses_timestamp_bits():
+    assert shard_of(7 << 22, 4) == 3
+
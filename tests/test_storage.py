@@ -0,0 +1,158 @@
+import asyncio
+import sqlite3
+
+from storage import Storage
+
+
+def _rows(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_failed_flush_is_requeued_without_losing_newer_values(tmp_path):
+    path = str(tmp_path / "t.db")
+
+    async def main():
+        storage = Storage(path)
+        storage.put("points", (1, 10), 5)
+        storage.put("points", (1, 11), 7)
+        storage.append("points_log", [(1, 10, 5, "a", None, 1.0)])
+
+        real_write = storage._write_batch
+        calls = []
+
+        def failing(batch):
+            calls.append(batch)
+            raise sqlite3.OperationalError("database is locked")
+
+        storage._write_batch = failing
+        try:
+            await storage.flush()
+        except sqlite3.OperationalError:
+            pass
+        assert storage.pending == 3
+
+        # 실패 이후 들어온 새 값 / 로그 행
+        storage.put("points", (1, 10), 9)
+        storage.append("points_log", [(1, 10, 4, "b", None, 2.0)])
+
+        storage._write_batch = real_write
+        await storage.flush()
+        assert storage.pending == 0
+        await storage.close()
+
+    asyncio.run(main())
+    assert sorted(_rows(path, "SELECT user_id, value FROM points")) == [(10, 9), (11, 7)]
+    assert _rows(path, "SELECT reason FROM points_log ORDER BY seq") == [("a",), ("b",)]
+
+
+def test_unserializable_value_is_dropped(tmp_path):
+    path = str(tmp_path / "t.db")
+
+    async def main():
+        storage = Storage(path)
+        storage.put("tournaments", (1,), {"bad": object()})
+        storage.put("tournaments", (2,), {"ok": True})
+        await storage.flush()
+        assert storage.pending == 0
+        await storage.close()
+
+    asyncio.run(main())
+    assert _rows(path, "SELECT guild_id FROM tournaments") == [(2,)]
+
+
+def test_run_loop_retries_with_backoff(tmp_path):
+    path = str(tmp_path / "t.db")
+
+    async def main():
+        storage = Storage(path, flush_interval=0.01)
+        storage.put("points", (1, 10), 1)
+        real_write = storage._write_batch
+        failures = [2]
+
+        def flaky(batch):
+            if failures[0]:
+                failures[0] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            real_write(batch)
+
+        storage._write_batch = flaky
+        storage.start()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not storage.pending and not failures[0]:
+                break
+        await storage.close()
+
+    asyncio.run(main())
+    assert _rows(path, "SELECT value FROM points") == [(1,)]
+
+
+def test_lazy_guild_map_preload_and_membership(tmp_path):
+    from storage import LazyGuildMap
+
+    calls = []
+
+    def loader(guild_id):
+        calls.append(guild_id)
+        return None if guild_id == 2 else {"gid": guild_id}
+
+    async def main():
+        m = LazyGuildMap(loader)
+        # in / get은 디스크를 읽지 않는다
+        assert 1 not in m and m.get(1) is None and calls == []
+        await asyncio.gather(m.preload(1), m.preload(1), m.preload(2))
+        assert sorted(calls) == [1, 2]
+        assert 1 in m and m.get(1) == {"gid": 1}
+        assert 2 not in m and m.loaded(2) and m.get(2, "none") == "none"
+        # 미리 읽지 않은 길드는 []에서 읽는다
+        assert m[3] == {"gid": 3} and calls[-1] == 3
+
+    asyncio.run(main())
+
+
+def test_reads_do_not_wait_for_writer_lock(tmp_path):
+    storage = Storage(str(tmp_path / "t.db"))
+    storage.put("points", (1, 10), 3)
+    asyncio.run(storage.flush())
+    # 기록 스레드가 트랜잭션을 잡고 있어도 읽기 연결은 바로 읽는다
+    with storage._db_lock:
+        storage._conn.execute("BEGIN IMMEDIATE")
+        storage._conn.execute("INSERT OR REPLACE INTO points VALUES (1, 10, 99)")
+        assert storage.load_members("points", 1) == {10: 3}
+        storage._conn.execute("ROLLBACK")
+    asyncio.run(storage.close())
+
+
+def test_shard_processes_share_one_db_without_losing_writes(tmp_path):
+    # 샤드 프로세스마다 Storage를 따로 열어 같은 파일에 쓴다 (각자 자기 길드만)
+    path = str(tmp_path / "t.db")
+
+    async def main():
+        first, second = Storage(path), Storage(path)
+        first.put_many("points", (((1, uid), uid) for uid in range(500)))
+        second.put_many("points", (((2, uid), uid * 2) for uid in range(500)))
+        first.append("points_log", [(1, 0, 1, "a", None, 1.0)])
+        second.append("points_log", [(2, 0, 1, "b", None, 1.0)])
+
+        # 다른 연결이 쓰기 잠금을 잡고 있는 동안 두 프로세스가 동시에 flush
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        flushing = asyncio.gather(first.flush(), second.flush())
+        await asyncio.sleep(0.2)
+        blocker.execute("ROLLBACK")
+        blocker.close()
+        await flushing
+
+        assert first.pending == second.pending == 0
+        # 샤드 구성이 바뀐 뒤 새로 연 프로세스도 같은 데이터를 본다
+        third = Storage(path)
+        assert third.load_members("points", 2)[499] == 998
+        await asyncio.gather(first.close(), second.close(), third.close())
+
+    asyncio.run(main())
+    assert _rows(path, "SELECT COUNT(*) FROM points") == [(1000,)]
+    assert sorted(_rows(path, "SELECT reason FROM points_log")) == [("a",), ("b",)]
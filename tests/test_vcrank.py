@@ -0,0 +1,42 @@
+import random
+
+from vcrank import VcRanking
+
+
+def _reference(totals, joins, now, n):
+    live = {uid: totals.get(uid, 0) + now - start for uid, start in joins.items()}
+    merged = {uid: sec for uid, sec in totals.items() if uid not in joins}
+    merged.update(live)
+    return sorted(merged.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+def test_top_merges_closed_and_open_sessions():
+    totals = {1: 100.0, 2: 50.0, 3: 10.0}
+    joins = {3: 1000.0, 4: 1020.0}
+    ranking = VcRanking(totals, joins)
+    assert len(ranking) == 4
+    # now=1100: 3 -> 110, 4 -> 80
+    assert ranking.top(10, 1100.0) == [(3, 110.0), (1, 100.0), (4, 80.0), (2, 50.0)]
+    assert ranking.top(2, 1100.0) == [(3, 110.0), (1, 100.0)]
+
+
+def test_join_and_leave_follow_reference():
+    rng = random.Random(5)
+    totals = {uid: float(rng.randrange(5000)) for uid in range(300)}
+    joins = {}
+    ranking = VcRanking(totals, joins)
+    now = 10_000.0
+    for _ in range(2000):
+        now += rng.random() * 10
+        uid = rng.randrange(350)
+        if uid in joins:
+            totals[uid] = totals.get(uid, 0) + now - joins.pop(uid)
+            ranking.leave(uid, totals[uid])
+        else:
+            joins[uid] = now
+            ranking.join(uid, totals.get(uid, 0), now)
+        if rng.random() < 0.05:
+            expected = _reference(totals, joins, now, 20)
+            got = ranking.top(20, now)
+            assert [round(s, 6) for _, s in got] == [round(s, 6) for _, s in expected]
+    assert len(ranking) == len(set(totals) | set(joins))
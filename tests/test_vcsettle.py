@@ -0,0 +1,160 @@
+import asyncio
+
+from guildstate import GuildState
+from ledger import PointsLedger
+from storage import LazyGuildMap, Storage
+from vcsettle import VcSettlement
+
+G = 1
+UNIT = 60.0
+INTERVAL = 15.0
+
+
+def _load(storage, gid):
+    # bot._load_guild_state와 같은 컬럼을 저장소에서 읽는다
+    state = GuildState(gid)
+    for column in ("points", "vc_time", "vc_join", "vc_paid"):
+        getattr(state, column).update(storage.load_members(column, gid))
+    return state
+
+
+class Harness:
+    def __init__(self, path, now=0.0):
+        self.now = [now]
+        self.storage = Storage(path)
+        self.states = LazyGuildMap(lambda gid: _load(self.storage, gid))
+        self.ledger = PointsLedger(self.storage, self.states, clock=lambda: self.now[0])
+        self.settle = VcSettlement(
+            self.storage, self.ledger, self.states, UNIT, INTERVAL, clock=lambda: self.now[0]
+        )
+
+    def at(self, now):
+        self.now[0] = now
+        return self.settle.settle()
+
+    # bot._open_vc / _close_vc와 같은 순서
+    def join(self, uid, at):
+        self.states[G].vc_join[uid] = at
+        self.storage.put("vc_join", (G, uid), at)
+        self.settle.track(G, uid)
+
+    def leave(self, uid, at):
+        state = self.states[G]
+        start = state.vc_join.pop(uid)
+        total = state.vc_time.get(uid, 0) + at - start
+        state.vc_time[uid] = total
+        self.storage.delete("vc_join", (G, uid))
+        self.storage.put("vc_time", (G, uid), total)
+        self.settle.untrack(G, uid)
+
+    def points(self, uid):
+        return self.states[G].points.get(uid, 0)
+
+    def close(self):
+        asyncio.run(self.storage.close())
+
+
+def _log(path):
+    storage = Storage(path)
+    rows = storage._query("SELECT user_id, amount FROM points_log WHERE reason = 'vc_time' ORDER BY seq")
+    asyncio.run(storage.close())
+    return rows
+
+
+def test_restart_does_not_pay_twice(tmp_path):
+    path = str(tmp_path / "t.db")
+    h = Harness(path)
+    h.join(10, 0.0)
+    h.join(11, 30.0)
+    assert h.at(150.0) == 2
+    assert (h.points(10), h.points(11)) == (2, 2)
+    h.close()
+
+    # 재시작: 같은 시각에 다시 정산해도 추가 지급 없음
+    h = Harness(path, now=150.0)
+    for uid in h.states[G].vc_join.keys():
+        h.settle.track(G, uid)
+    assert h.at(150.0) == 0
+    assert (h.points(10), h.points(11)) == (2, 2)
+    # 이후에는 늘어난 만큼만: 10은 200초에 3분째, 11은 210초에 3분째
+    assert h.at(200.0) == 1
+    assert h.at(210.0) == 1
+    assert (h.points(10), h.points(11)) == (3, 3)
+    h.close()
+
+    assert _log(path) == [(10, 2), (11, 2), (10, 1), (11, 1)]
+    storage = Storage(path)
+    assert storage.load_members("vc_paid", G) == {10: 3, 11: 3}
+    asyncio.run(storage.close())
+
+
+def test_repeated_ticks_pay_each_point_once(tmp_path):
+    h = Harness(str(tmp_path / "t.db"))
+    h.join(10, 0.0)
+    t = 0.0
+    while t <= 600.0:
+        h.at(t)
+        t += INTERVAL
+    assert h.points(10) == 10
+    assert h.states[G].vc_paid.get(10) == 10
+    h.close()
+    assert _log(h.storage.path) == [(10, 1)] * 10
+
+
+def test_leave_and_rejoin(tmp_path):
+    h = Harness(str(tmp_path / "t.db"))
+    h.join(10, 0.0)
+    assert h.at(130.0) == 1 and h.points(10) == 2
+    # 185초에 나감: 나간 뒤 첫 정산에서 남은 1포인트 (185 // 60 = 3)
+    h.leave(10, 185.0)
+    assert h.at(190.0) == 1 and h.points(10) == 3
+    # 나간 동안에는 지급 없음
+    assert h.at(1000.0) == 0 and h.points(10) == 3
+    assert 10 not in h.settle._slots[G]
+
+    # 다시 들어오면 이전 누적 시간(185초)에 이어서
+    # 240초째(1055초)가 속한 칸은 1065초에 처리된다
+    h.join(10, 1000.0)
+    assert h.settle._slots[G][10] == 71
+    assert h.at(1050.0) == 0
+    assert h.at(1065.0) == 1 and h.points(10) == 4
+    h.close()
+
+
+def test_wheel_rolls_to_next_slot_and_catches_up(tmp_path):
+    h = Harness(str(tmp_path / "t.db"))
+    h.join(10, 0.0)
+    # 첫 포인트는 60초 → 칸 4 (60 / 15)
+    assert h.settle._slots[G][10] == 4
+    assert h.at(59.0) == 0
+    assert h.at(60.0) == 1
+    # 다음 포인트(120초) 칸으로 옮겨진다
+    assert h.settle._slots[G][10] == 8 and 8 in h.settle._wheels[G]
+    assert 4 not in h.settle._wheels[G]
+
+    # 정산이 한참 밀려도(여러 칸이 한꺼번에 만기) 한 번에 정확히 따라잡는다
+    assert h.at(1000.0) == 1
+    assert h.points(10) == 16
+    assert h.settle._slots[G][10] == 68  # 1020초 / 15
+
+    # 나갔다 들어와 다시 track되면 옛 칸(68)의 항목은 무시된다
+    h.leave(10, 1005.0)
+    h.join(10, 1100.0)
+    assert h.settle._slots[G][10] == 75  # 1005 + 15초 남음 → 1115초
+    assert h.at(1020.0) == 0
+    assert 68 not in h.settle._wheels[G]
+    assert h.at(1125.0) == 1 and h.points(10) == 17
+    h.close()
+
+
+def test_rejoin_into_same_slot_pays_once(tmp_path):
+    h = Harness(str(tmp_path / "t.db"))
+    h.join(10, 0.0)
+    assert h.at(1000.0) == 1 and h.settle._slots[G][10] == 68
+    # 바로 다시 들어오면 옛 항목과 새 항목이 같은 칸에 두 번 들어 있다
+    h.leave(10, 1005.0)
+    h.join(10, 1005.0)
+    assert h.settle._wheels[G][68] == [10, 10]
+    assert h.at(1020.0) == 1 and h.points(10) == 17
+    assert h.settle._slots[G][10] == 72
+    h.close()
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from vcstats import DAY, DAYS, HOUR, HOURS, VcStats
+
+T = 20000 * DAY  # 자정 (시각 계산을 쉽게 하려고 칸 경계에서 시작)
+
+
+def _hours(stats, cid):
+    # 채널 링의 (head 기준 몇 시간 전, 초) 목록
+    ring = stats.channels[cid]
+    return {stats.head_hour - h: ring[h % HOURS] for h in range(stats.head_hour - HOURS + 1, stats.head_hour + 1)
+            if ring[h % HOURS]}
+
+
+def test_session_is_split_into_hour_and_day_slots():
+    stats = VcStats(T)
+    stats.join(1, 100, T + 23 * HOUR)
+    stats.leave(1, T + DAY + 30 * 60)  # 23:00 ~ 다음날 00:30
+    assert _hours(stats, 100) == {1: 3600.0, 0: 1800.0}
+    assert stats.users[1][(T // DAY) % DAYS] == 3600.0
+    assert stats.users[1][(T // DAY + 1) % DAYS] == 1800.0
+    assert stats.top_users(5, T + DAY + HOUR) == [(1, 5400.0)]
+    hod = stats.by_hour_of_day(T + DAY + HOUR)
+    assert hod[23] == (100, 3600.0) and hod[0] == (100, 1800.0)
+    # 시간대 보정 (UTC+9)
+    assert stats.by_hour_of_day(T + DAY + HOUR, offset_hours=9)[8] == (100, 3600.0)
+
+
+def test_hour_ring_wraps_and_expires_old_slots():
+    stats = VcStats(T)
+    stats.join(1, 100, T)
+    stats.leave(1, T + 600)
+    # HOURS시간 뒤 같은 칸을 다시 쓰면 옛 값에 더하지 않고 새로 시작한다
+    stats.roll(T + (HOURS - 1) * HOUR)
+    assert _hours(stats, 100) == {HOURS - 1: 600.0}
+    stats.join(1, 100, T + HOURS * HOUR)
+    stats.leave(1, T + HOURS * HOUR + 60)
+    assert _hours(stats, 100) == {0: 60.0}
+    assert stats.busiest_channels(5, T + HOURS * HOUR + 60) == [(100, 60.0)]
+    # 활동이 모두 창을 벗어나면 채널도 지운다
+    stats.roll(T + 2 * HOURS * HOUR)
+    assert stats.channels == {}
+
+
+def test_day_ring_wraps_and_week_total_follows():
+    stats = VcStats(T)
+    stats.join(1, 100, T)
+    stats.leave(1, T + 1000)
+    stats.join(2, 100, T + 3 * DAY)
+    stats.leave(2, T + 3 * DAY + 500)
+    assert stats.top_users(5, T + (DAYS - 1) * DAY) == [(1, 1000.0), (2, 500.0)]
+    # 첫날이 창을 벗어나면 주간 합계에서 빠지고 유저도 지운다
+    assert stats.top_users(5, T + DAYS * DAY) == [(2, 500.0)]
+    assert 1 not in stats.users and 1 not in stats.week
+    # 같은 칸(DAYS일 뒤)에 다시 쌓으면 새 값만
+    stats.join(1, 100, T + DAYS * DAY)
+    stats.leave(1, T + DAYS * DAY + 50)
+    assert stats.users[1][(T // DAY) % DAYS] == 50.0
+    assert stats.week[1] == 50.0
+    # 한참 쉬면 (링 길이보다 오래) 모두 비워진다
+    stats.roll(T + 100 * DAY)
+    assert stats.users == {} and stats.week == {} and stats.channels == {}
+
+
+def test_long_session_counts_only_the_window():
+    stats = VcStats(T)
+    stats.join(1, 100, T)
+    stats.leave(1, T + 10 * DAY)
+    assert stats.week[1] == pytest.approx((DAYS - 1) * DAY)
+    assert sum(stats.users[1]) == pytest.approx(stats.week[1])
+    assert sum(stats.channels[100]) == pytest.approx((HOURS - 1) * HOUR)
+
+
+def test_moves_split_time_between_channels():
+    stats = VcStats(T)
+    stats.join(1, 100, T)
+    stats.move(1, 200, T + 600)
+    assert stats.channel_of(1) == 200
+    stats.roll(T + 700)
+    stats.move(1, 100, T + 1000)
+    stats.leave(1, T + 1200)
+    assert stats.channel_of(1) is None
+    # 열린 구간을 roll로 잘라도 두 번 세지 않는다
+    assert dict(stats.busiest_channels(5, T + 1200)) == {100: 800.0, 200: 400.0}
+    assert stats.top_users(5, T + 1200) == [(1, 1200.0)]
+    # 다시 들어오지 않은 채로 나가도 아무 일 없음
+    stats.leave(1, T + 1300)
+    assert stats.week[1] == 1200.0
+
+
+def test_to_dict_roundtrip():
+    stats = VcStats(T)
+    for uid in range(5):
+        stats.join(uid, 100 + uid % 2, T + uid * 3000)
+        stats.leave(uid, T + uid * 3000 + 1000 * (uid + 1))
+    stats.join(9, 100, T + 2 * DAY)
+    stats.roll(T + 2 * DAY + 700)
+    data = json.loads(json.dumps(stats.to_dict()))
+    restored = VcStats.from_dict(data)
+    assert restored.to_dict() == stats.to_dict()
+    # 열린 세션은 저장하지 않는다 (재시작 후 reconcile이 다시 연다)
+    assert restored.open == {}
+    stats.leave(9, T + 2 * DAY + 700)
+    later = T + 5 * DAY
+    assert restored.top_users(10, later) == stats.top_users(10, later)
+    assert restored.busiest_channels(10, later) == stats.busiest_channels(10, later)
+    assert restored.by_hour_of_day(later) == stats.by_hour_of_day(later)
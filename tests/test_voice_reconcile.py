@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("discord")
+
+
+@pytest.fixture
+def gamer_bot(tmp_path, monkeypatch):
+    monkeypatch.setenv("DISCORD_TOKEN", "test")
+    monkeypatch.setenv("GUILD_ID", "1")
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "import.db"))
+    for name in ("SHARD_COUNT", "SHARD_IDS"):
+        monkeypatch.delenv(name, raising=False)
+    import bot
+
+    monkeypatch.setattr(bot, "DB_PATH", str(tmp_path / "bot.db"))
+    b = bot.GamerToolBot()
+    guilds = []
+    monkeypatch.setattr(bot.GamerToolBot, "guilds", property(lambda self: guilds))
+    b.test_guilds = guilds
+    yield b
+    asyncio.run(b.storage.close())
+
+
+def _guild(gid, channels, bots=()):
+    # 게이트웨이 캐시의 길드: 채널 ID -> 음성에 있는 유저들
+    voice = [SimpleNamespace(id=cid, voice_states={uid: None for uid in uids}) for cid, uids in channels.items()]
+    return SimpleNamespace(
+        id=gid,
+        voice_channels=voice,
+        stage_channels=[],
+        get_member=lambda uid: SimpleNamespace(id=uid, bot=uid in bots),
+    )
+
+
+def _store_sessions(b, gid, joins, checkpoint):
+    # 재시작 전 프로세스가 남긴 세션 / 체크포인트
+    for uid, start in joins.items():
+        b.storage.put("vc_join", (gid, uid), start)
+    b.storage.put("vc_checkpoint", (gid,), checkpoint)
+    asyncio.run(b.storage.flush())
+
+
+def test_reconcile_closes_missing_and_opens_present(gamer_bot):
+    b = gamer_bot
+    t0 = b.booted_at
+    _store_sessions(b, 1, {10: t0 - 100, 11: t0 - 100}, t0 - 20)
+    # 10은 아직 음성에 있고, 11은 나갔고, 12는 꺼져 있는 동안 들어왔다. 99는 봇.
+    guild = _guild(1, {500: [10, 12, 99]}, bots={99})
+
+    opened, closed = b.reconcile_voice(guild)
+
+    state = b.guild_states[1]
+    assert (opened, closed) == (2, 2)
+    # 재시작 전 세션은 마지막 체크포인트까지만 인정
+    assert state.vc_time[10] == state.vc_time[11] == pytest.approx(80.0)
+    assert set(state.vc_join.keys()) == {10, 12}
+    assert all(start >= t0 for _, start in state.vc_join.items())
+    assert b.vc_stats[1].channel_of(10) == b.vc_stats[1].channel_of(12) == 500
+    assert b.vc_stats[1].channel_of(11) is None
+    assert set(b.vc_settle._slots[1]) == {10, 12}
+
+    asyncio.run(b.storage.flush())
+    assert set(b.storage.load_members("vc_join", 1)) == {10, 12}
+    assert b.storage.load_members("vc_time", 1) == {10: pytest.approx(80.0), 11: pytest.approx(80.0)}
+
+
+def test_reconcile_keeps_sessions_opened_after_boot(gamer_bot):
+    b = gamer_bot
+    guild = _guild(1, {500: [10], 600: [11]})
+    b.record_vc_join(SimpleNamespace(guild=guild, id=10), SimpleNamespace(id=500))
+    b.record_vc_join(SimpleNamespace(guild=guild, id=11), SimpleNamespace(id=500))
+    joins = dict(b.guild_states[1].vc_join.items())
+
+    # 재연결: 세션은 그대로, 채널이 바뀐 유저는 통계만 옮긴다
+    assert b.reconcile_voice(guild) == (0, 0)
+    assert dict(b.guild_states[1].vc_join.items()) == joins
+    assert b.vc_stats[1].channel_of(11) == 600
+
+    # 끊긴 동안 나간 유저는 종료
+    assert b.reconcile_voice(_guild(1, {600: [11]})) == (0, 1)
+    assert set(b.guild_states[1].vc_join.keys()) == {11}
+
+
+def test_reconcile_all_loads_only_guilds_with_voice(gamer_bot):
+    b = gamer_bot
+    t0 = b.booted_at
+    _store_sessions(b, 2, {20: t0 - 50}, t0 - 10)
+    b.test_guilds.extend([
+        _guild(1, {}),              # 세션도 접속자도 없음
+        _guild(2, {}),              # 저장된 세션만 있음 → 종료
+        _guild(3, {700: [30]}),     # 접속자만 있음 → 시작
+    ])
+
+    assert asyncio.run(b.reconcile_all_voice()) == (1, 1)
+    assert not b.guild_states.loaded(1) and not b.vc_stats.loaded(1)
+    assert set(b.guild_states[2].vc_join.keys()) == set()
+    assert b.guild_states[2].vc_time[20] == pytest.approx(40.0)
+    assert set(b.guild_states[3].vc_join.keys()) == {30}
+
+
+def test_reconcile_all_uses_loaded_sessions_over_storage(gamer_bot):
+    b = gamer_bot
+    guild = _guild(1, {})
+    b.test_guilds.append(guild)
+    # 메모리에는 열렸지만 아직 기록되지 않은 세션
+    b.record_vc_join(SimpleNamespace(guild=guild, id=10), SimpleNamespace(id=500))
+    assert b.storage.load_grouped("vc_join") == {}
+
+    assert asyncio.run(b.reconcile_all_voice()) == (0, 1)
+    assert set(b.guild_states[1].vc_join.keys()) == set()
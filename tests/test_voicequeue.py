@@ -0,0 +1,112 @@
+import asyncio
+import types
+
+from voicequeue import VoiceEventQueue
+
+
+def _member(uid, gid=1):
+    return types.SimpleNamespace(id=uid, guild=types.SimpleNamespace(id=gid))
+
+
+def _queue(batches, clock=None, **kwargs):
+    ticks = iter(range(100, 10000))
+    return VoiceEventQueue(batches.append, clock=clock or (lambda: float(next(ticks))), **kwargs)
+
+
+def test_round_trips_collapse_to_one_transition():
+    batches = []
+    q = _queue(batches)
+    a, b, c = _member(1), _member(2), _member(3)
+    q.push(a, None, "ch1")
+    q.push(a, "ch1", None)
+    q.push(a, None, "ch2")      # 입장→퇴장→입장 = 입장(ch2)
+    q.push(b, "ch1", None)
+    q.push(b, None, "ch1")      # 퇴장→재입장 = 변화 없음
+    q.push(c, "ch1", "ch2")
+    assert len(q) == 6 and q.max_depth == 6
+    q.drain()
+    # 시각은 적용 시각이 아니라 합쳐진 마지막 이벤트가 들어온 시각
+    assert batches == [[(a, None, "ch2", 102.0), (c, "ch1", "ch2", 105.0)]]
+    assert (q.received, q.applied, q.batches) == (6, 2, 1)
+
+
+def test_same_user_in_different_guilds_is_not_merged():
+    batches = []
+    q = _queue(batches)
+    q.push(_member(1, gid=1), None, "x")
+    q.push(_member(1, gid=2), "y", None)
+    q.drain()
+    assert len(batches[0]) == 2
+
+
+def test_max_batch_splits_bursts_and_keeps_order():
+    batches = []
+    q = _queue(batches, max_batch=3)
+    for uid in range(7):
+        q.push(_member(uid), None, "ch")
+    q.drain()
+    q.drain()
+    q.drain()
+    assert [len(t) for t in batches] == [3, 3, 1]
+    assert [m.id for t in batches for m, _, _, _ in t] == list(range(7))
+
+
+def test_runner_applies_after_delay_and_stop_flushes():
+    batches = []
+
+    async def run():
+        q = _queue(batches, max_delay=0.01)
+        q.start()
+        q.push(_member(1), None, "ch")
+        await asyncio.sleep(0.05)
+        assert len(batches) == 1
+        q.push(_member(2), None, "ch")
+        await q.stop()
+        assert len(q) == 0
+
+    asyncio.run(run())
+    assert [t[0][0].id for t in batches] == [1, 2]
+
+
+def test_runner_applies_large_batch_in_chunks():
+    batches = []
+
+    async def run():
+        q = _queue(batches, max_delay=0.01, apply_chunk=8)
+        q.start()
+        for uid in range(20):
+            q.push(_member(uid), None, "ch")
+        await asyncio.sleep(0.05)
+        await q.stop()
+
+    asyncio.run(run())
+    assert [len(t) for t in batches] == [8, 8, 4]
+    # 각 이벤트는 자기 시각을 유지한다
+    assert [at for t in batches for _, _, _, at in t] == [float(100 + i) for i in range(20)]
+
+
+def test_prepare_runs_before_apply_and_stop_finishes_a_started_batch():
+    batches = []
+    prepared = []
+    gate = None
+
+    async def prepare(guild_ids):
+        prepared.append(sorted(guild_ids))
+        await gate.wait()
+
+    async def run():
+        nonlocal gate
+        gate = asyncio.Event()
+        q = _queue(batches, max_delay=0.01, apply_chunk=2, prepare=prepare)
+        q.start()
+        for uid in range(3):
+            q.push(_member(uid, gid=uid % 2 + 1), None, "ch")
+        await asyncio.sleep(0.05)
+        # 길드를 불러오는 중에는 적용하지 않는다
+        assert prepared == [[1, 2]] and batches == [] and len(q) == 3
+        # 불러오는 도중에 멈춰도 이미 꺼낸 배치는 버리지 않는다
+        await q.stop()
+        assert len(q) == 0
+
+    asyncio.run(run())
+    assert [m.id for t in batches for m, _, _, _ in t] == [0, 1, 2]
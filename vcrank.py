@@ -0,0 +1,40 @@
+from typing import Dict, List, Tuple
+
+from rankindex import RankIndex
+
+
+# VC 누적 시간 순위.
+# 접속 중인 유저의 현재 시간은 base + (now - join) = (base - join) + now 이므로
+# (base - join) 값으로 정렬해 두면 시간이 흘러도 접속 중인 유저끼리의 순서는 바뀌지 않는다.
+# 종료된 세션(closed)과 접속 중 세션(open)을 따로 인덱싱하고 TOP N만 병합한다.
+
+
+class VcRanking:
+    def __init__(self, totals: Dict[int, float], joins: Dict[int, float]):
+        self.closed = RankIndex((uid, sec) for uid, sec in totals.items() if uid not in joins)
+        self.open = RankIndex((uid, totals.get(uid, 0) - start) for uid, start in joins.items())
+
+    def __len__(self) -> int:
+        return len(self.closed) + len(self.open)
+
+    def join(self, user_id: int, total: float, started: float):
+        self.closed.remove(user_id)
+        self.open.update(user_id, total - started)
+
+    def leave(self, user_id: int, total: float):
+        self.open.remove(user_id)
+        self.closed.update(user_id, total)
+
+    def top(self, n: int, now: float) -> List[Tuple[int, float]]:
+        closed = self.closed.top(n)
+        live = [(uid, offset + now) for uid, offset in self.open.top(n)]
+        result: List[Tuple[int, float]] = []
+        i = j = 0
+        while len(result) < n and (i < len(closed) or j < len(live)):
+            if j >= len(live) or (i < len(closed) and closed[i][1] >= live[j][1]):
+                result.append(closed[i])
+                i += 1
+            else:
+                result.append(live[j])
+                j += 1
+        return result
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from guildstate import GuildState
+from ledger import PointsLedger
+from storage import Storage
+
+
+# 음성 활동 시간 → 포인트 정산.
+# 유저별로 "지금까지 지급한 VC 포인트(vc_paid)"를 저장해 두고
+# 받아야 할 포인트 = floor(누적 VC 시간 / unit) - 지급한 포인트 만 지급하므로
+# 재시작이나 정산 주기와 무관하게 두 번 지급되지 않는다. (points / vc_paid / 로그가 같은 flush에 기록됨)
+# 접속 중인 유저는 "다음 1포인트가 생기는 시각"이 속한 정산 칸(타이밍 휠)에 넣어 두고
+# 틱마다 만기된 칸의 유저만 본다. 나간 유저는 다음 틱에 한 번 더 정산한다.
+
+
+class VcSettlement:
+    def __init__(
+        self,
+        storage: Storage,
+        ledger: PointsLedger,
+        states: Dict[int, GuildState],
+        unit: float,
+        interval: float = 15.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.storage = storage
+        self.ledger = ledger
+        self.states = states
+        self.unit = unit
+        self.interval = interval
+        self.clock = clock
+        # 길드 -> 칸 번호 -> 유저들, 길드 -> 유저 -> 현재 칸 번호
+        self._wheels: Dict[int, Dict[int, List[int]]] = {}
+        self._slots: Dict[int, Dict[int, int]] = {}
+        self._left: Dict[int, Set[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _slot(self, due: float) -> int:
+        # 칸 s는 s * interval 시각 이후에 처리되므로 올림
+        return -int(-due // self.interval)
+
+    def track(self, guild_id: int, user_id: int):
+        # 입장 직후 / 복원 시 호출
+        state = self.states[guild_id]
+        start = state.vc_join.get(user_id)
+        if start is None:
+            return
+        paid = state.vc_paid.get(user_id, 0)
+        slot = self._slot(start + (paid + 1) * self.unit - state.vc_time.get(user_id, 0))
+        self._slots.setdefault(guild_id, {})[user_id] = slot
+        self._wheels.setdefault(guild_id, {}).setdefault(slot, []).append(user_id)
+
+    def untrack(self, guild_id: int, user_id: int):
+        # 퇴장 시 호출. 휠 항목은 지우지 않고 _slots와 비교해 무시한다.
+        slots = self._slots.get(guild_id)
+        if slots is not None:
+            slots.pop(user_id, None)
+        self._left.setdefault(guild_id, set()).add(user_id)
+
+    def settle(self) -> int:
+        now = self.clock()
+        unit = self.unit
+        interval = self.interval
+        current = int(now // interval)
+        granted = 0
+        for guild_id, wheel in self._wheels.items():
+            left = self._left.pop(guild_id, None)
+            due_slots = [s for s in wheel if s <= current]
+            if not due_slots and not left:
+                continue
+            slots = self._slots[guild_id]
+            state = self.states[guild_id]
+            totals = state.vc_time
+            joins = state.vc_join
+            paid = state.vc_paid
+            grants: List[Tuple[int, int]] = []
+            for slot in due_slots:
+                for uid in wheel.pop(slot):
+                    if slots.get(uid) != slot:
+                        continue  # 이미 나갔거나 다른 칸으로 옮겨진 항목
+                    start = joins.get(uid)
+                    if start is None:
+                        del slots[uid]
+                        continue
+                    base = totals.get(uid, 0)
+                    earned = int((base + now - start) // unit)
+                    owed = earned - paid.get(uid, 0)
+                    if owed > 0:
+                        grants.append((uid, owed))
+                        paid[uid] = earned
+                    nxt = -int(-(start + (earned + 1) * unit - base) // interval)
+                    slots[uid] = nxt
+                    bucket = wheel.get(nxt)
+                    if bucket is None:
+                        wheel[nxt] = [uid]
+                    else:
+                        bucket.append(uid)
+            if left:
+                for uid in left:
+                    if uid in joins:
+                        continue  # 다시 들어온 유저는 휠에서 처리
+                    earned = int(totals.get(uid, 0) // unit)
+                    owed = earned - paid.get(uid, 0)
+                    if owed > 0:
+                        grants.append((uid, owed))
+                        paid[uid] = earned
+            if grants:
+                self.ledger.apply(guild_id, grants, "vc_time")
+                self.storage.put_many("vc_paid", (((guild_id, uid), paid[uid]) for uid, _ in grants))
+                granted += len(grants)
+        return granted
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.settle()
+            except Exception as e:
+                print("VC SETTLE ERROR:", e)
@@ -0,0 +1,168 @@
+import base64
+import heapq
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+# 음성 채널 활동 통계 (길드 단위).
+# - 채널별 최근 HOURS시간을 1시간 칸 링 버퍼(array('d'))에 초 단위로 누적
+# - 유저별 최근 DAYS일을 1일 칸 링 버퍼에 누적하고, 주간 합계는 따로 유지
+# 시간이 지나면 오래된 칸을 0으로 비우고 빈 채널 / 유저는 지우므로 메모리는
+# (채널 수 × HOURS + 최근 활동 유저 수 × DAYS)로 제한된다.
+# 열린 구간은 roll()이 호출될 때(체크포인트 / 조회) 잘라서 반영한다.
+
+HOURS = 24 * 7
+DAYS = 7
+HOUR = 3600
+DAY = 86400
+
+
+def _pack(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _unpack(data: str) -> array:
+    values = array("d")
+    values.frombytes(base64.b64decode(data))
+    return values
+
+
+class VcStats:
+    def __init__(self, now: float = 0.0):
+        self.head_hour = int(now // HOUR)
+        self.head_day = int(now // DAY)
+        self.channels: Dict[int, array] = {}
+        self.users: Dict[int, array] = {}
+        self.week: Dict[int, float] = {}
+        # 유저 -> (채널, 아직 반영하지 않은 구간 시작 시각)
+        self.open: Dict[int, Tuple[int, float]] = {}
+
+    # ---- 시간 진행 ----
+    def _advance(self, now: float):
+        hour = int(now // HOUR)
+        if hour > self.head_hour:
+            steps = min(hour - self.head_hour, HOURS)
+            for cid in list(self.channels):
+                ring = self.channels[cid]
+                for h in range(hour - steps + 1, hour + 1):
+                    ring[h % HOURS] = 0.0
+                if not any(ring):
+                    del self.channels[cid]
+            self.head_hour = hour
+
+        day = int(now // DAY)
+        if day > self.head_day:
+            steps = min(day - self.head_day, DAYS)
+            for uid in list(self.users):
+                ring = self.users[uid]
+                expired = 0.0
+                for d in range(day - steps + 1, day + 1):
+                    expired += ring[d % DAYS]
+                    ring[d % DAYS] = 0.0
+                week = self.week[uid] - expired
+                if week <= 1e-6 and not any(ring):
+                    del self.users[uid]
+                    del self.week[uid]
+                else:
+                    self.week[uid] = week
+            self.head_day = day
+
+    def _add(self, user_id: int, channel_id: int, start: float, end: float):
+        self._advance(end)
+        ring = self.channels.get(channel_id)
+        if ring is None:
+            ring = array("d", bytes(8 * HOURS))
+            self.channels[channel_id] = ring
+        t = max(start, (self.head_hour - HOURS + 1) * HOUR)
+        while t < end:
+            h = int(t // HOUR)
+            nxt = min(end, (h + 1) * HOUR)
+            ring[h % HOURS] += nxt - t
+            t = nxt
+
+        ring = self.users.get(user_id)
+        if ring is None:
+            ring = array("d", bytes(8 * DAYS))
+            self.users[user_id] = ring
+            self.week[user_id] = 0.0
+        t = max(start, (self.head_day - DAYS + 1) * DAY)
+        self.week[user_id] += max(0.0, end - t)
+        while t < end:
+            d = int(t // DAY)
+            nxt = min(end, (d + 1) * DAY)
+            ring[d % DAYS] += nxt - t
+            t = nxt
+
+    # ---- 이벤트 ----
+    def join(self, user_id: int, channel_id: int, now: float):
+        self.leave(user_id, now)
+        self.open[user_id] = (channel_id, now)
+
+    def leave(self, user_id: int, now: float):
+        entry = self.open.pop(user_id, None)
+        if entry is not None:
+            self._add(user_id, entry[0], entry[1], now)
+
+    def move(self, user_id: int, channel_id: int, now: float):
+        self.join(user_id, channel_id, now)
+
+    def channel_of(self, user_id: int) -> Optional[int]:
+        entry = self.open.get(user_id)
+        return entry[0] if entry is not None else None
+
+    def roll(self, now: float):
+        for uid, (cid, start) in self.open.items():
+            if now > start:
+                self._add(uid, cid, start, now)
+                self.open[uid] = (cid, now)
+        self._advance(now)
+
+    # ---- 조회 ----
+    def top_users(self, n: int, now: float) -> List[Tuple[int, float]]:
+        # 최근 DAYS일 (오늘 포함) 합계
+        self.roll(now)
+        return heapq.nlargest(n, self.week.items(), key=lambda x: x[1])
+
+    def busiest_channels(self, n: int, now: float) -> List[Tuple[int, float]]:
+        self.roll(now)
+        totals = ((cid, sum(ring)) for cid, ring in self.channels.items())
+        return heapq.nlargest(n, totals, key=lambda x: x[1])
+
+    def by_hour_of_day(self, now: float, offset_hours: int = 0) -> List[Tuple[Optional[int], float]]:
+        # 시각(0~23시)별로 가장 붐빈 채널과 그 시간대의 전체 합계
+        self.roll(now)
+        totals = [0.0] * 24
+        best: List[Tuple[Optional[int], float]] = [(None, 0.0)] * 24
+        per_channel: Dict[Tuple[int, int], float] = {}
+        for cid, ring in self.channels.items():
+            for h in range(self.head_hour - HOURS + 1, self.head_hour + 1):
+                value = ring[h % HOURS]
+                if value:
+                    hod = (h + offset_hours) % 24
+                    totals[hod] += value
+                    key = (cid, hod)
+                    per_channel[key] = per_channel.get(key, 0.0) + value
+        for (cid, hod), value in per_channel.items():
+            if value > best[hod][1]:
+                best[hod] = (cid, value)
+        return [(best[h][0], totals[h]) for h in range(24)]
+
+    # ---- 저장 ----
+    def to_dict(self) -> Dict:
+        return {
+            "head_hour": self.head_hour,
+            "head_day": self.head_day,
+            "channels": {str(cid): _pack(ring) for cid, ring in self.channels.items()},
+            "users": {str(uid): _pack(ring) for uid, ring in self.users.items()},
+            "week": {str(uid): total for uid, total in self.week.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "VcStats":
+        stats = cls()
+        stats.head_hour = data["head_hour"]
+        stats.head_day = data["head_day"]
+        stats.channels = {int(cid): _unpack(v) for cid, v in data["channels"].items()}
+        stats.users = {int(uid): _unpack(v) for uid, v in data["users"].items()}
+        stats.week = {int(uid): total for uid, total in data["week"].items()}
+        return stats
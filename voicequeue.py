@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+
+# on_voice_state_update 묶음 처리.
+# 게이트웨이 디스패치에서 (유저, 이전 채널, 이후 채널, 시각)을 큐에 넣기만 하고 (이벤트마다 핸들러 태스크를 만들지 않음),
+# 드레인 태스크가 짧은 지연(max_delay) 동안 모인 이벤트를 한 번에 적용한다.
+# 버스트 때 루프를 가장 많이 쓰는 건 상태 변경(수 µs)이 아니라 이벤트마다 만드는 태스크이므로
+# 태스크 없이 받는 것이 핸들러 지연과 다른 코루틴 지연을 줄이는 핵심이다.
+# 같은 유저의 연속 이벤트는 (첫 이전 채널 → 마지막 이후 채널) 하나로 합치므로
+# 입장→퇴장→입장 같은 왕복은 한 번의 상태 변화만 남는다. 시각은 마지막 이벤트가 들어온 시각.
+# 적용 전에 prepare(길드 ID들)로 길드 상태를 불러 두고,
+# 합친 배치는 apply_chunk개씩 나눠 적용하면서 그 사이에 루프를 양보한다.
+
+Transition = Tuple[Any, Any, Any, float]  # (member, before_channel, after_channel, at)
+
+
+class VoiceEventQueue:
+    def __init__(
+        self,
+        apply_batch: Callable[[List[Transition]], None],
+        prepare: Optional[Callable[[Set[int]], Awaitable[None]]] = None,
+        max_delay: float = 0.05,
+        max_batch: int = 1000,
+        apply_chunk: int = 8,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.apply_batch = apply_batch
+        self.prepare = prepare
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.apply_chunk = apply_chunk
+        self.clock = clock
+        self._queue: Deque[Transition] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # 적용 중인 배치와 다음에 적용할 위치 (중간에 stop되면 나머지를 마저 적용)
+        self._applying: List[Transition] = []
+        self._pos = 0
+        # 메트릭
+        self.received = 0
+        self.applied = 0
+        self.batches = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._queue) + len(self._applying) - self._pos
+
+    def push(self, member, before, after):
+        self._queue.append((member, before, after, self.clock()))
+        self.received += 1
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+        if not self._ready.is_set():
+            self._ready.set()
+
+    def drain(self):
+        # 적용 중이던 배치의 나머지, 그다음 큐에 쌓인 것을 합쳐서 한 번에 적용
+        self._apply_next(len(self._applying))
+        transitions = self._collect()
+        if transitions:
+            self.apply_batch(transitions)
+
+    def _apply_next(self, limit: int):
+        start = self._pos
+        chunk = self._applying[start:start + limit]
+        self._pos = start + len(chunk)
+        if self._pos >= len(self._applying):
+            self._applying = []
+            self._pos = 0
+        if chunk:
+            self.apply_batch(chunk)
+
+    def _collect(self) -> List[Transition]:
+        # 최대 max_batch개를 꺼내 유저별로 합친다
+        queue = self._queue
+        if not queue:
+            return []
+        merged: Dict[Tuple[int, int], List] = {}
+        count = 0
+        while queue and count < self.max_batch:
+            member, before, after, at = queue.popleft()
+            count += 1
+            key = (member.guild.id, member.id)
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = [member, before, after, at]
+            else:
+                entry[0] = member
+                entry[2] = after
+                entry[3] = at
+        transitions = [
+            (member, before, after, at)
+            for member, before, after, at in merged.values()
+            if before != after
+        ]
+        self.batches += 1
+        self.applied += len(transitions)
+        return transitions
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue or self._applying:
+            self.drain()
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            # 버스트가 다 들어올 때까지 잠깐 모은다
+            await asyncio.sleep(self.max_delay)
+            self._ready.clear()
+            try:
+                while self._queue or self._applying:
+                    if not self._applying:
+                        self._applying = self._collect()
+                        if not self._applying:
+                            continue
+                    if self.prepare is not None:
+                        await self.prepare({t[0].guild.id for t in self._applying[self._pos:]})
+                    while self._applying:
+                        self._apply_next(self.apply_chunk)
+                        await asyncio.sleep(0)
+            except Exception as e:
+                print("VOICE QUEUE ERROR:", e)